@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+"""
+Demo-app latency at realistic data volumes.
+
+  python -m benchmarks.bench_app [--sizes 1000 10000 100000] [--repeat 5]
+                                 [--json out.json] [--baseline base.json]
+
+• for each size, scripts/seed_bulk.py replaces the user's generated rows
+  (one sqlite transaction, labels mapped to the form's option values), then every endpoint is fetched --repeat times
+• endpoints: /transactions, /, the chart data routes and the CSV download
+  (its URL is read from the download icon's link on /transactions)
+• plain HTTP through Playwright's APIRequestContext: server time + transfer,
+  no browser rendering; needs FT_USER / FT_PASS. app.py is started on a
+  free port (tests/app_server.py) unless --base-url / FT_BASE_URL is given
+• generated rows are removed again at the end (--keep to leave them)
+• --baseline fails (exit 1) when an endpoint's p50 grows past --tolerance
+"""
+
+import argparse, json, os, sqlite3, statistics, sys, time
+from pathlib import Path
+from bs4 import BeautifulSoup
+from dotenv import load_dotenv, find_dotenv
+from rich.console import Console
+from rich.table import Table
+from playwright.sync_api import sync_playwright
+
+from scripts.test_data import DB
+from scripts.seed_bulk import clear, seed
+from tests.app_server import EXTERNAL_URL, serve
+
+console = Console()
+
+ENDPOINTS  = ["/transactions", "/", "/daily_spending_data", "/monthly_spending_data"]
+LOGIN      = "/login"
+CSV_ICON   = ".fa-file-arrow-down"     # same icon test_csv.py clicks
+
+
+def _pct(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+
+def login(http, user: str, password: str) -> None:
+    """POST the login form found on /login (structural: the form with a password field)."""
+    soup = BeautifulSoup(http.get(LOGIN).text(), "html.parser")
+    pwd  = soup.select_one("form input[type=password]")
+    if pwd is None:
+        raise RuntimeError("no login form on " + LOGIN)
+    form = pwd.find_parent("form")
+    user_el = form.select_one("input:not([type]), input[type=text], input[type=email]")
+    fields = {el["name"]: el.get("value", "") for el in form.select("input[name]")}
+    fields.update({user_el["name"]: user, pwd["name"]: password})
+    http.post(form.get("action") or LOGIN, form=fields)
+    if "/login" in http.get("/transactions").url:
+        raise RuntimeError(f"login as {user!r} failed")
+
+
+def csv_url(http) -> str:
+    soup = BeautifulSoup(http.get("/transactions").text(), "html.parser")
+    icon = soup.select_one(CSV_ICON)
+    link = icon.find_parent("a") if icon else None
+    if not (link and link.get("href")):
+        raise RuntimeError(f"no download link around {CSV_ICON} on /transactions")
+    return link["href"]
+
+
+def bench_endpoint(http, path: str, repeat: int) -> dict:
+    times, size = [], 0
+    http.get(path)                        # warm-up (template cache, sqlite page cache)
+    for _ in range(repeat):
+        start = time.perf_counter()
+        resp = http.get(path)
+        body = resp.body()
+        times.append((time.perf_counter() - start) * 1000)
+        if not resp.ok:
+            raise RuntimeError(f"GET {path} → {resp.status}")
+        size = len(body)
+    return {"p50_ms": round(_pct(times, 0.50), 2), "p95_ms": round(_pct(times, 0.95), 2),
+            "mean_ms": round(statistics.fmean(times), 2), "bytes": size}
+
+
+def run(sizes, repeat, user, password, base_url: str, db=DB, keep=False) -> dict:
+    results = {}
+    with sync_playwright() as pw:
+        http = pw.request.new_context(base_url=base_url)
+        try:
+            login(http, user, password)
+            endpoints = ENDPOINTS + [csv_url(http)]
+            for size in sizes:
+                start = time.perf_counter()
+                seed(user, size, db, http=http, base_url="")   # http carries base_url
+                console.print(f"[cyan]seeded {size} rows in {time.perf_counter() - start:.2f}s")
+                results[str(size)] = {path: bench_endpoint(http, path, repeat) for path in endpoints}
+        finally:
+            if not keep:
+                with sqlite3.connect(db) as conn:
+                    clear(conn, user)
+            http.dispose()
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float):
+    problems = []
+    for size, base in baseline.items():
+        for path, b in base.items():
+            cur = results.get(size, {}).get(path)
+            if cur and cur["p50_ms"] > b["p50_ms"] * (1 + tolerance):
+                problems.append(f"{size} rows {path}: p50 {cur['p50_ms']} ms vs baseline {b['p50_ms']} ms")
+    return problems
+
+
+def _table(results: dict) -> Table:
+    t = Table(title="demo app endpoints by data volume")
+    for col in ("rows", "endpoint", "p50 ms", "p95 ms", "mean ms", "KiB"):
+        t.add_column(col)
+    for size, per_path in results.items():
+        for path, r in per_path.items():
+            t.add_row(size, path, f"{r['p50_ms']:.1f}", f"{r['p95_ms']:.1f}",
+                      f"{r['mean_ms']:.1f}", f"{r['bytes'] / 1024:.0f}")
+    return t
+
+
+def main(argv=None) -> int:
+    load_dotenv(find_dotenv())
+    ap = argparse.ArgumentParser(description="demo app scale benchmark")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--base-url", default=EXTERNAL_URL, help="running app (default: start app.py on a free port)")
+    ap.add_argument("--db", type=Path, default=DB)
+    ap.add_argument("--keep", action="store_true", help="leave the generated rows in the db")
+    ap.add_argument("--json", type=Path, help="write results here")
+    ap.add_argument("--baseline", type=Path, help="results JSON to compare against")
+    ap.add_argument("--tolerance", type=float, default=0.5, help="allowed p50 growth (0.5 = +50 %%)")
+    args = ap.parse_args(argv)
+    user, password = os.getenv("FT_USER"), os.getenv("FT_PASS")
+    if not (user and password):
+        ap.error("FT_USER / FT_PASS are not set")
+
+    base_url, server = serve(args.base_url)
+    try:
+        results = run(args.sizes, args.repeat, user, password, base_url, args.db, args.keep)
+    finally:
+        if server:
+            server.stop()
+    console.print(_table(results))
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+    if args.baseline:
+        problems = compare(results, json.loads(args.baseline.read_text()), args.tolerance)
+        for p in problems:
+            console.print(f"[red]✘ regression {p}")
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+"""
+fuzzy_find scaling benchmark on synthetic pages.
+
+  python -m benchmarks.bench_heal [--sizes 100 500 1000 2000] [--rate 0.05]
+                                  [--mode browser|html] [--offline]
+                                  [--json out.json] [--baseline base.json]
+
+• each page is written to a temp dir and loaded from file:// in headless Chromium
+  (--offline: a static stand-in page instead, HTML mode only, no browser needed)
+• every broken selector is healed with an empty cache; fetch / parse / score /
+  total time come from the same telemetry fields the suite records
+• accuracy = healed selector resolves to the element the broken one meant
+• --baseline fails (exit 1) when p50 latency grows past --tolerance or
+  accuracy drops by more than --accuracy-drop
+"""
+
+import argparse, json, statistics, sys, tempfile, time
+from collections import Counter
+from pathlib import Path
+from bs4 import BeautifulSoup
+from rich.console import Console
+from rich.table import Table
+from playwright.sync_api import Error as PWError
+
+import tests.smart_locator as sl
+from tests.locator_cache import LocatorCache
+from benchmarks.synthetic import build_page, resolves_to
+
+console = Console()
+
+
+class _Collector:
+    """Stands in for TELEMETRY: keeps the per-heal timing records in memory."""
+    def __init__(self):
+        self.rows = []
+
+    def record(self, **fields):
+        self.rows.append(fields)
+
+    def flush(self):
+        pass
+
+
+class _StaticPage:
+    """Minimal Page stand-in for --offline runs (evaluate fails → HTML path)."""
+    def __init__(self, html: str, url: str):
+        self._html, self.url = html, url
+
+    def content(self) -> str:
+        return self._html
+
+    def evaluate(self, *a, **kw):
+        raise PWError("offline page")
+
+    def locator(self, selector: str):
+        return selector
+
+
+def _pct(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+
+def bench_page(page, synth, tmp: Path) -> dict:
+    soup = BeautifulSoup(synth.html, "html.parser")
+    collector = _Collector()
+    sl.TELEMETRY, sl.console = collector, Console(quiet=True)
+    totals, correct, healed, phases = [], 0, 0, Counter()
+    for case in synth.cases:
+        sl.CACHE = LocatorCache(tmp / "cache.json")          # cold cache for every heal
+        start = time.perf_counter()
+        try:
+            sl.fuzzy_find(page, case.broken)
+        except ValueError:
+            pass
+        totals.append((time.perf_counter() - start) * 1000)
+        rec = collector.rows[-1]
+        phases[rec["phase"] or "failed"] += 1
+        if rec["healed"]:
+            healed += 1
+            correct += resolves_to(soup, rec["healed"]) == case.index
+    rows, n = collector.rows, max(1, len(synth.cases))
+    return {
+        "cases":    len(synth.cases),
+        "p50_ms":   round(_pct(totals, 0.50), 2),
+        "p95_ms":   round(_pct(totals, 0.95), 2),
+        "fetch_ms": round(statistics.fmean(r["fetch_ms"] for r in rows), 2) if rows else 0,
+        "parse_ms": round(statistics.fmean(r["parse_ms"] for r in rows), 2) if rows else 0,
+        "score_ms": round(statistics.fmean(r["score_ms"] for r in rows), 2) if rows else 0,
+        "healed":   round(healed / n, 3),
+        "accuracy": round(correct / n, 3),
+        "phases":   dict(phases),
+    }
+
+
+def run(sizes, rate, mode, offline, seed=0) -> dict:
+    sl.EXTRACT_MODE = mode
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_s:
+        tmp = Path(tmp_s)
+        pw = browser = None
+        if not offline:
+            from playwright.sync_api import sync_playwright
+            pw = sync_playwright().start()
+            browser = pw.chromium.launch()
+        try:
+            for size in sizes:
+                synth = build_page(size, rate, seed)
+                html_file = tmp / f"synthetic_{size}.html"
+                html_file.write_text(synth.html)
+                if offline:
+                    page = _StaticPage(synth.html, html_file.as_uri())
+                else:
+                    page = browser.new_page()
+                    page.goto(html_file.as_uri())
+                results[str(size)] = bench_page(page, synth, tmp)
+                if not offline:
+                    page.close()
+        finally:
+            if browser:
+                browser.close()
+                pw.stop()
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float, accuracy_drop: float):
+    problems = []
+    for size, base in baseline.items():
+        cur = results.get(size)
+        if not cur:
+            continue
+        if cur["p50_ms"] > base["p50_ms"] * (1 + tolerance):
+            problems.append(f"{size}: p50 {cur['p50_ms']} ms vs baseline {base['p50_ms']} ms")
+        if cur["accuracy"] < base["accuracy"] - accuracy_drop:
+            problems.append(f"{size}: accuracy {cur['accuracy']} vs baseline {base['accuracy']}")
+    return problems
+
+
+def _table(results: dict) -> Table:
+    t = Table(title="fuzzy_find on synthetic pages")
+    for col in ("controls", "cases", "p50 ms", "p95 ms", "fetch", "parse", "score", "healed", "accuracy", "phases"):
+        t.add_column(col)
+    for size, r in results.items():
+        t.add_row(size, str(r["cases"]), f"{r['p50_ms']:.1f}", f"{r['p95_ms']:.1f}",
+                  f"{r['fetch_ms']:.1f}", f"{r['parse_ms']:.1f}", f"{r['score_ms']:.1f}",
+                  f"{r['healed']:.0%}", f"{r['accuracy']:.0%}",
+                  " ".join(f"{k}:{v}" for k, v in r["phases"].items()))
+    return t
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="fuzzy_find scaling benchmark")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[100, 500, 1000, 2000])
+    ap.add_argument("--rate", type=float, default=0.05, help="share of controls mutated")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--mode", choices=["browser", "html"], default="browser")
+    ap.add_argument("--offline", action="store_true", help="no Chromium, HTML mode only")
+    ap.add_argument("--json", type=Path, help="write results here")
+    ap.add_argument("--baseline", type=Path, help="results JSON to compare against")
+    ap.add_argument("--tolerance", type=float, default=0.5, help="allowed p50 growth (0.5 = +50 %%)")
+    ap.add_argument("--accuracy-drop", type=float, default=0.01)
+    args = ap.parse_args(argv)
+
+    mode = "html" if args.offline else args.mode
+    results = run(args.sizes, args.rate, mode, args.offline, args.seed)
+    console.print(_table(results))
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+    if args.baseline:
+        problems = compare(results, json.loads(args.baseline.read_text()),
+                           args.tolerance, args.accuracy_drop)
+        for p in problems:
+            console.print(f"[red]✘ regression {p}")
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
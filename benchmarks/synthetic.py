@@ -0,0 +1,96 @@
+"""
+Synthetic form pages for heal benchmarks.
+• build_page(n, rate, seed) → HTML with *n* form controls where a *rate* share
+  of them were "refactored": renamed id, dropped name or swapped data-testid
+• every control carries data-bench="<index>" so a healed selector can be
+  checked against the element the broken selector originally pointed at
+"""
+
+import random
+from typing import List, NamedTuple
+from bs4 import BeautifulSoup
+
+WORDS = [
+    "amount", "category", "date", "notes", "payment_method", "username", "password",
+    "email", "phone", "description", "quantity", "price", "currency", "account",
+    "reference", "merchant", "tags", "due_date", "address", "city", "zip_code",
+]
+SECTIONS = [
+    "billing", "shipping", "profile", "txn", "filter", "search", "budget",
+    "report", "export", "import", "admin", "settings",
+]
+CONTROLS = [("input", "text"), ("input", "number"), ("input", "date"), ("input", "email"),
+            ("select", None), ("textarea", None)]
+MUTATIONS = ("rename_id", "drop_name", "swap_testid")
+
+
+class Case(NamedTuple):
+    broken: str          # selector the test still uses
+    index: int           # data-bench of the element it meant
+    mutation: str
+
+
+class SyntheticPage(NamedTuple):
+    html: str
+    cases: List[Case]
+
+
+def _typo(rng: random.Random, word: str) -> str:
+    kind = rng.choice(("swap", "drop", "suffix", "prefix"))
+    if kind == "swap" and len(word) > 3:
+        i = rng.randrange(1, len(word) - 2)
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    if kind == "drop" and len(word) > 4:
+        i = rng.randrange(1, len(word) - 1)
+        return word[:i] + word[i + 1:]
+    if kind == "prefix":
+        return f"txn_{word}"
+    return f"{word}_v2"
+
+
+def build_page(n: int, rate: float, seed: int = 0) -> SyntheticPage:
+    rng = random.Random(seed)
+    names = [f"{s}_{w}" for s in SECTIONS for w in WORDS]
+    rng.shuffle(names)
+    rows, cases = [], []
+    for i in range(n):
+        tag, type_ = rng.choice(CONTROLS)
+        # unique names; past len(names) controls, repeats get a numeric suffix (harder)
+        base = names[i % len(names)] + (f"_{i // len(names)}" if i >= len(names) else "")
+        attrs = {"id": base, "name": base, "data-testid": base.replace("_", "-"),
+                 "class": f"form-control f{i % 7}", "data-bench": str(i)}
+        if type_:
+            attrs["type"] = type_
+        if rng.random() < rate:
+            mutation = rng.choice(MUTATIONS)
+            if mutation == "rename_id":
+                attrs["id"] = _typo(rng, base)
+                cases.append(Case(f"#{base}", i, mutation))
+            elif mutation == "drop_name":
+                attrs.pop("name")
+                attrs["id"] = _typo(rng, base)
+                cases.append(Case(f"[name='{base}']", i, mutation))
+            else:
+                attrs.pop("id")
+                attrs["data-testid"] = _typo(rng, attrs["data-testid"])
+                cases.append(Case(f"#{base}", i, mutation))
+        attr_s = " ".join(f'{k}="{v}"' for k, v in attrs.items())
+        inner = "<option>A</option><option>B</option>" if tag == "select" else ""
+        html_el = f"<{tag} {attr_s}>" if tag == "input" else f"<{tag} {attr_s}>{inner}</{tag}>"
+        rows.append(f'<div class="row"><label>{base.replace("_", " ")}</label>{html_el}</div>')
+        if i % 25 == 24:
+            rows.append(f'<fieldset id="group_{i // 25}"></fieldset>')   # non-control id noise
+    html = "<!doctype html><html><body><form id='bench'>\n" + "\n".join(rows) + "\n</form></body></html>"
+    return SyntheticPage(html, cases)
+
+
+def resolves_to(html_or_soup, selector: str):
+    """data-bench index of the first element *selector* matches, or None."""
+    soup = html_or_soup if isinstance(html_or_soup, BeautifulSoup) else BeautifulSoup(html_or_soup, "html.parser")
+    try:
+        el = soup.select_one(selector)
+    except Exception:                     # selector soupsieve can't parse
+        return None
+    if el is None or not el.has_attr("data-bench"):
+        return None
+    return int(el["data-bench"])
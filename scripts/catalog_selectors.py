@@ -6,15 +6,24 @@ selectors, and write them to selector_registry.json.
 • Routes list comes from `app.app.url_map` (works because we import the Flask app)
 • Uses Playwright in headless Chromium to render each page
 • Captures only:  <input>, <textarea>, <select>, <button>
-• Saves JSON structure:
+• Saves compact JSON: controls are split into blocks by their nearest
+  form / nav / header / footer / aside / dialog / table ancestor, each
+  distinct block is stored once and routes reference their blocks
     {
-      "<route>": [
-         {"css": "input#amount", "tag": "input", "type": "number"},
-         ...
-      ],
-      ...
+      "format": 2,
+      "groups": {"<id>": [{"selector": "#amount", "class": "input.number",
+                           "block": "form#add_form"}, ...], ...},
+      "routes": {"<route>": ["<id>", ...], ...}
     }
-Run locally:  python scripts/catalog_selectors.py
+  (the shared nav / login form are stored once, each page adds its own forms)
+• Logs in with FT_USER / FT_PASS once; routes that redirect anonymous visitors
+  to /login are catalogued from the logged-in context (/logout never is)
+• Incremental: a per-route fingerprint of the control set lives in
+  selector_registry.fingerprints.json; unchanged routes are not re-parsed and
+  selector_changes.json lists added/removed/renamed selectors per route
+• Starts app.py itself on a free port (tests/app_server.py) unless
+  FT_BASE_URL points at a running server
+Run locally:  python scripts/catalog_selectors.py [--pages 4] [--full]
 """
 
 #!/usr/bin/env python
@@ -23,8 +32,11 @@ Generate selector_registry.json by visiting every GET route in the
 Finance‑Tracker Flask app, capturing form‑control selectors.
 """
 
-import json, pathlib, asyncio, sys
+import json, pathlib, asyncio, sys, time, argparse, hashlib, os
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlparse
 from bs4 import BeautifulSoup
+from dotenv import load_dotenv, find_dotenv
 from playwright.async_api import async_playwright
 
 ROOT = pathlib.Path(__file__).resolve().parents[1]
@@ -34,42 +46,161 @@ ROOT = pathlib.Path(__file__).resolve().parents[1]
 #    └── app.py   ← defines `app = Flask(__name__)`
 sys.path.append(str(ROOT / "app"))        # adds …/finance-self-heal/app to PYTHONPATH
 from app import app as FLASK_APP          # safe: we import the module app.py
+sys.path.append(str(ROOT))                # after app/, so `app` still resolves to app.py
+from tests.registry import SelectorRegistry, classify, diff_routes, encode, load_routes   # shared with smart_locator
+from tests.app_server import EXTERNAL_URL, serve
 # -------------------------------------------------------------------------
 
-OUT  = ROOT / "selector_registry.json"
-TAGS = {"input", "select", "textarea", "button", "a"}
+OUT   = ROOT / "selector_registry.json"
+TAGS  = {"input", "select", "textarea", "button", "a"}
+BLOCKS = ["form", "nav", "header", "footer", "aside", "dialog", "table"]   # registry grouping units
+PAGES = 4                                 # concurrent tabs, override with --pages
+BASE  = EXTERNAL_URL                      # set to the started server's URL in __main__
+LOGIN_ROUTE   = "/login"
+SESSION_ENDING = {"/logout"}              # never visited with the logged-in context
+PRINTS  = ROOT / "selector_registry.fingerprints.json"   # route -> control-set hash
+CHANGES = ROOT / "selector_changes.json"                  # added/removed/renamed per route
+
+# the attributes parse(), classify() and block() depend on, read in the page (no HTML transfer)
+CONTROLS_JS = """
+(tags) => Array.from(document.querySelectorAll(tags.join(',')), el => {
+  const box = el.closest('%s');
+  return [el.tagName.toLowerCase(), el.getAttribute('id'), el.getAttribute('name'), el.getAttribute('type'),
+          box && [box.tagName.toLowerCase(), box.getAttribute('id'), box.getAttribute('action'),
+                  box.getAttribute('class')]];
+})
+""" % ",".join(BLOCKS)
+
+
+def routes():
+    """GET routes in url_map order (that order is the JSON key order)."""
+    out = []
+    for rule in FLASK_APP.url_map.iter_rules():
+        # skip dynamic routes and Flask’s built‑in static helper
+        if "<" in rule.rule or rule.endpoint == "static":
+            continue
+        # we only care that the route **allows** GET
+        if "GET" in rule.methods and rule.rule not in out:
+            out.append(rule.rule)
+    return out
+
+
+async def login(context, user: str, password: str) -> None:
+    """
+    Log *context* in through the login form. Uses structural selectors only
+    (the password field and its form), so a renamed #username can't break it.
+    """
+    page = await context.new_page()
+    await page.goto(f"{BASE}{LOGIN_ROUTE}", wait_until="networkidle")
+    form = page.locator("form:has(input[type=password])")
+    await form.locator("input:not([type]), input[type=text], input[type=email]").first.fill(user)
+    await form.locator("input[type=password]").fill(password)
+    async with page.expect_navigation(wait_until="networkidle"):
+        await form.locator("input[type=password]").press("Enter")
+    await page.close()
+
+
+def fingerprint(controls) -> str:
+    """Hash of exactly what parse() looks at: tag, id, name, type and container of each control."""
+    return hashlib.sha1(json.dumps(controls).encode()).hexdigest()
+
+
+def _load(path):
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+async def crawl(pages: int = PAGES, full: bool = False):
+    """
+    Render routes on *pages* concurrent tabs; parse HTML in a process pool.
+    Unless *full*, routes whose control fingerprint is unchanged reuse their
+    previous entries without transferring or parsing the page HTML.
+    """
+    loop     = asyncio.get_running_loop()
+    previous = load_routes(OUT)          # either registry layout → {route: entries}
+    old_fp   = {} if full else _load(PRINTS)
+    results, new_fp = {}, {}
+
+    load_dotenv(find_dotenv())
+    user, password = os.getenv("FT_USER"), os.getenv("FT_PASS")
 
-
-# ---tiny helper that inspects the element and emits a class string---
-def classify(el):
-    """Coarse element class used later for fuzzy‑match scoring."""
-    if el.name == "input":
-        input_type = el.get("type", "text").lower()        # text, number, …
-        return f"input.{input_type}"
-    if el.name == "button":
-        return "button.submit" if el.get("type", "").lower() == "submit" else "button"
-    return el.name    # textarea, select, a, …
-
-async def crawl():
     async with async_playwright() as pw:
         browser = await pw.chromium.launch()
-        page    = await browser.new_page()
-        catalog = {}
-
-        for rule in FLASK_APP.url_map.iter_rules():
-            # skip dynamic routes and Flask’s built‑in static helper
-            if "<" in rule.rule or rule.endpoint == "static":
-                continue
-            # we only care that the route **allows** GET
-            if "GET" in rule.methods:
-                url = f"http://127.0.0.1:5000{rule.rule}"
-                await page.goto(url)
-                catalog[rule.rule] = parse(await page.content())
+        anon    = await browser.new_context()
+        authed  = None
+        if user and password:             # no creds → protected routes record the login form
+            authed = await browser.new_context()
+            await login(authed, user, password)
+        idle = asyncio.Queue()            # one (anonymous, logged-in) tab pair per slot
+        for _ in range(max(1, pages)):
+            idle.put_nowait((await anon.new_page(), authed and await authed.new_page()))
+        gate = asyncio.BoundedSemaphore(idle.qsize())   # never more routes in flight than tabs
+
+        with ProcessPoolExecutor() as pool:
+            async def visit(route):
+                async with gate:
+                    tabs  = await idle.get()
+                    start = time.perf_counter()
+                    html  = None
+                    try:
+                        page = await _open(tabs, route)
+                        new_fp[route] = fingerprint(await page.evaluate(CONTROLS_JS, sorted(TAGS)))
+                        unchanged = old_fp.get(route) == new_fp[route] and route in previous
+                        if not unchanged:
+                            html = await page.content()
+                    finally:
+                        idle.put_nowait(tabs)
+                    if html is None:
+                        results[route] = previous[route]
+                    else:
+                        results[route] = await loop.run_in_executor(pool, parse, html)
+                    ms = (time.perf_counter() - start) * 1000
+                    note = "unchanged" if html is None else "parsed"
+                    print(f"  {route:<28} {ms:7.0f} ms  {len(results[route]):3} selectors  {note}")
+
+            await asyncio.gather(*(visit(r) for r in routes()))
 
         await browser.close()
 
-    OUT.write_text(json.dumps(catalog, indent=2))
-    print(f"✔ wrote {OUT.name} with {sum(len(v) for v in catalog.values())} selectors")
+    catalog = {route: results[route] for route in routes()}   # deterministic order
+    changes = diff_routes(previous, catalog)
+    CHANGES.write_text(json.dumps(changes, indent=2))
+    _write_if_changed(OUT, encode(catalog))   # compact: shared forms stored once
+    _write_if_changed(PRINTS, {route: new_fp[route] for route in catalog})
+    print(f"✔ wrote {OUT.name} with {len(SelectorRegistry(catalog))} selectors"
+          f" ({len(changes)} routes changed → {CHANGES.name})")
+
+
+async def _open(tabs, route):
+    """
+    Visit *route* anonymously; if it bounces to the login page, it is
+    protected, so visit it again on the logged-in tab (unless it ends the session).
+    """
+    anon_page, auth_page = tabs
+    await anon_page.goto(f"{BASE}{route}")
+    bounced = urlparse(anon_page.url).path == LOGIN_ROUTE and route != LOGIN_ROUTE
+    if not bounced or auth_page is None or route in SESSION_ENDING:
+        return anon_page
+    await auth_page.goto(f"{BASE}{route}")
+    return auth_page
+
+
+def _write_if_changed(path, data):
+    text = json.dumps(data, indent=2)
+    if not path.exists() or path.read_text() != text:   # keep mtime/bytes on no-op runs
+        path.write_text(text)
+
+def block(tag) -> str:
+    """Name of the control's container: "nav", "form#add_form", "form[action=/login]", "page"."""
+    box = tag.find_parent(BLOCKS)
+    if box is None:
+        return "page"
+    if box.get("id"):
+        return f"{box.name}#{box['id']}"
+    if box.get("action"):
+        return f"{box.name}[action={box['action']}]"
+    if box.get("class"):
+        return f"{box.name}.{box['class'][0]}"
+    return box.name
 
 def parse(html):
     soup = BeautifulSoup(html, "html.parser")
@@ -85,6 +216,7 @@ def parse(html):
         entry = {
             "selector": f"#{id_}" if id_ else f'[name="{name_}"]',
             "class":    classify(tag),    # <─ NEW
+            "block":    block(tag),       # registry grouping (shared nav / forms stored once)
         }
         selectors.append(entry)
 
@@ -99,4 +231,13 @@ def selector(tag):
     return ""
 
 if __name__ == "__main__":
-    asyncio.run(crawl())
\ No newline at end of file
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--pages", type=int, default=PAGES, help="concurrent browser tabs")
+    ap.add_argument("--full", action="store_true", help="ignore fingerprints, re-parse every route")
+    args = ap.parse_args()
+    BASE, server = serve(EXTERNAL_URL)
+    try:
+        asyncio.run(crawl(args.pages, args.full))
+    finally:
+        if server:
+            server.stop()
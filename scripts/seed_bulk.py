@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+"""
+Bulk-load realistic transactions for the seeded user (FT_USER).
+
+• rows are generated lazily and written with executemany() in batches,
+  all inside ONE sqlite transaction (100k rows in ~2 s)
+• categories / payment methods / amounts follow a fixed weighted mix, dates
+  are spread over the last --days days, notes look like "bulk: Coffee #1234"
+• labels ("Card", "Bills") go through TxnFactory's label → <option> value
+  mapping when a logged-in request context is passed (bench_app does), so
+  the rows hold what the app's form and totals use; without one (the CLI)
+  the labels are stored as they are
+• every row's notes start with BULK_TAG, so --clear (or a re-seed) removes
+  exactly the generated rows and nothing a test or a human created
+• columns are discovered the same way as seed_user.py / test_data.py
+
+Run locally:  python scripts/seed_bulk.py --rows 10000 [--seed 0] [--days 365]
+              python scripts/seed_bulk.py --clear
+"""
+
+import argparse, datetime, os, pathlib, random, sqlite3, sys, time
+from typing import Iterator, Optional
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+from scripts.test_data import BASE, DB, TxnFactory, insert_sql, owner, schema   # shared schema discovery
+
+BULK_TAG = "bulk:"
+BATCH    = 5_000                          # rows per executemany() call
+
+# (category, weight, min amount, max amount, merchants)
+CATEGORIES = [
+    ("Food",          30,   50,   1500, ["Groceries", "Coffee", "Lunch", "Bakery", "Dinner"]),
+    ("Transport",     15,   30,    800, ["Taxi", "Bus pass", "Fuel", "Parking"]),
+    ("Bills",         10,  500,   9000, ["Electricity", "Internet", "Phone", "Water"]),
+    ("Shopping",      15,  200,   6000, ["Clothes", "Electronics", "Books", "Home"]),
+    ("Entertainment", 10,  100,   2500, ["Cinema", "Concert", "Streaming", "Games"]),
+    ("Health",         8,  150,   4000, ["Pharmacy", "Doctor", "Gym"]),
+    ("Gifts",          7,  200,   5000, ["Birthday", "Wedding", "Flowers"]),
+    ("Rent",           5, 8000,  25000, ["Rent"]),
+]
+PAYMENT_METHODS = [("UPI", 45), ("Cash", 25), ("Card", 30)]
+
+
+def generate(n: int, seed: int = 0, days: int = 365,
+             today: Optional[datetime.date] = None) -> Iterator[dict]:
+    """*n* transaction rows (dicts keyed by FIELDS), deterministic for a given seed."""
+    rng   = random.Random(seed)
+    today = today or datetime.date.today()
+    cats, cat_w = zip(*((c, c[1]) for c in CATEGORIES))
+    pays, pay_w = zip(*PAYMENT_METHODS)
+    for i in range(n):
+        name, _, lo, hi, merchants = rng.choices(cats, cat_w)[0]
+        yield {
+            "date":           (today - datetime.timedelta(days=rng.randrange(days))).isoformat(),
+            "category":       name,
+            "amount":         round(rng.uniform(lo, hi), 2),
+            "payment_method": rng.choices(pays, pay_w)[0],
+            "notes":          f"{BULK_TAG} {rng.choice(merchants)} #{i}",
+        }
+
+
+def clear(conn: sqlite3.Connection, username: str) -> int:
+    """Delete the generated rows of *username* (matched by BULK_TAG)."""
+    table, cols = schema(conn)
+    where, params = "notes LIKE ?", [BULK_TAG + "%"]
+    for col, value in owner(conn, cols, username).items():
+        where += f" AND {col} = ?"
+        params.append(value)
+    return conn.execute(f"DELETE FROM {table} WHERE {where}", params).rowcount
+
+
+def seed(username: str, rows: int, db: pathlib.Path = DB, seed: int = 0,
+         days: int = 365, batch: int = BATCH, replace: bool = True,
+         http=None, base_url: str = BASE) -> int:
+    """
+    Insert *rows* generated transactions for *username* in one transaction.
+    With *replace*, previously generated rows are removed first, so the table
+    holds exactly *rows* bulk rows afterwards. *http* (a logged-in
+    APIRequestContext) lets TxnFactory map the labels to the form's values.
+    """
+    values = TxnFactory(username, http, "sqlite", db, base_url).values
+    with sqlite3.connect(db) as conn:     # commit once, on exit
+        if replace:
+            clear(conn, username)
+        sql, names, extra = insert_sql(conn, username)
+        gen = map(values, generate(rows, seed, days))
+        while True:
+            chunk = [tuple({**r, **extra}[n] for n in names)
+                     for r in (next(gen, None) for _ in range(batch)) if r is not None]
+            if not chunk:
+                break
+            conn.executemany(sql, chunk)
+    return rows
+
+
+def main(argv=None) -> int:
+    from dotenv import load_dotenv, find_dotenv
+    load_dotenv(find_dotenv())
+
+    ap = argparse.ArgumentParser(description="bulk-load generated transactions")
+    ap.add_argument("--rows", type=int, default=10_000)
+    ap.add_argument("--user", default=os.getenv("FT_USER"), help="defaults to FT_USER")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--days", type=int, default=365, help="date range, counted back from today")
+    ap.add_argument("--db", type=pathlib.Path, default=DB)
+    ap.add_argument("--append", action="store_true", help="keep earlier generated rows")
+    ap.add_argument("--clear", action="store_true", help="only remove generated rows")
+    args = ap.parse_args(argv)
+    if not args.user:
+        ap.error("no user: pass --user or set FT_USER")
+
+    if args.clear:
+        with sqlite3.connect(args.db) as conn:
+            print(f"Removed {clear(conn, args.user)} generated rows")
+        return 0
+    start = time.perf_counter()
+    seed(args.user, args.rows, args.db, args.seed, args.days, replace=not args.append)
+    print(f"Seeded {args.rows} transactions for {args.user} in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
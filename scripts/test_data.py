@@ -0,0 +1,154 @@
+# scripts/test_data.py
+"""
+Backend test data: create, tag and clean up transactions without the UI.
+
+• sqlite backend: one executemany() in one transaction straight into
+  app/finance_tracker.db; columns are discovered with PRAGMA table_info
+  (same approach as seed_user.py), so schema variants keep working
+• http backend:   POSTs the Add Transaction form for each row through a
+  logged-in Playwright APIRequestContext (no page, no rendering); URLs are
+  relative to that context's base_url unless base_url / FT_BASE_URL is given
+• labels ("Food", "Cash") are mapped to the form's <option> values when a
+  request context is available, so rows look exactly like UI-created ones
+• every row is tagged through its notes; cleanup() deletes what was created
+"""
+
+import os, sqlite3, pathlib
+from typing import Dict, Iterable, List, Optional
+from bs4 import BeautifulSoup
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent   # go up to repo root
+DB   = ROOT / "app" / "finance_tracker.db"
+BASE = os.getenv("FT_BASE_URL", "")      # "" = paths relative to the request context's base_url
+FORM_PAGE = "/transactions"
+FIELDS = ("date", "category", "amount", "payment_method", "notes")
+
+
+# ─── schema discovery (shared with seed_bulk.py) ─────────────────────────
+def schema(conn: sqlite3.Connection):
+    """(transactions table name, its column names)."""
+    table = next((name for (name,) in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type='table'") if "transaction" in name.lower()), None)
+    if table is None:
+        raise LookupError("no transactions table in the database")
+    cols = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+    return table, cols
+
+
+def owner(conn: sqlite3.Connection, cols: List[str], username: str) -> Dict[str, object]:
+    """Column(s) that tie a transaction row to *username*: user_id or username."""
+    if "user_id" in cols:
+        found = conn.execute("SELECT id FROM users WHERE username = ?", (username,)).fetchone()
+        if not found:
+            raise LookupError(f"user {username!r} not seeded")
+        return {"user_id": found[0]}
+    if "username" in cols:
+        return {"username": username}
+    return {}
+
+
+def insert_sql(conn: sqlite3.Connection, username: str):
+    """INSERT statement for FIELDS + owner columns, its column order and the owner values."""
+    table, cols = schema(conn)
+    extra = owner(conn, cols, username)
+    names = [f for f in FIELDS if f in cols] + list(extra)
+    sql = f"INSERT INTO {table}({','.join(names)}) VALUES({','.join('?' * len(names))})"
+    return sql, names, extra
+
+
+class TxnFactory:
+    def __init__(self, username: str, http=None, backend: Optional[str] = None,
+                 db: pathlib.Path = DB, base_url: str = BASE):
+        self.username = username
+        self.http     = http                  # logged-in APIRequestContext or None
+        self.db       = pathlib.Path(db)
+        self.base_url = base_url
+        self.backend  = backend or ("sqlite" if self.db.exists() else "http")
+        self._tags: List[str] = []
+        self._form: Optional[dict] = None
+
+    # ─── public API ──────────────────────────────────────────────────────
+    def add(self, notes: str, amount, payment_method: str = "Cash",
+            category: str = "Food", date: str = "2025-05-01") -> None:
+        self.add_many([dict(notes=notes, amount=amount, payment_method=payment_method,
+                            category=category, date=date)])
+
+    def add_many(self, rows: Iterable[dict]) -> int:
+        rows = [self.values(r) for r in rows]
+        self._tags += [r["notes"] for r in rows]
+        if self.backend == "sqlite":
+            return self._insert(rows)
+        return self._post(rows)
+
+    def cleanup(self) -> int:
+        """Delete every row this factory created (by notes tag)."""
+        if not self._tags:
+            return 0
+        tags, self._tags = self._tags, []
+        if self.backend == "sqlite":
+            with sqlite3.connect(self.db) as conn:
+                table, _ = schema(conn)
+                return conn.executemany(f"DELETE FROM {table} WHERE notes = ?",
+                                        [(t,) for t in tags]).rowcount
+        return self._delete_via_links(tags)
+
+    # ─── label → option value, from the real form ────────────────────────
+    def _form_info(self) -> dict:
+        if self._form is None:
+            self._form = {"action": None, "options": {}, "names": {}}
+            if self.http is not None:
+                soup = BeautifulSoup(self.http.get(self.base_url + FORM_PAGE).text(), "html.parser")
+                popup = soup.select_one("#popup")
+                form = popup if popup and popup.name == "form" else (popup or soup).find("form")
+                if form is not None:
+                    self._form["action"] = form.get("action") or FORM_PAGE
+                    for ctl in form.find_all(["input", "select", "textarea"]):
+                        if ctl.get("name"):       # field id → the name the POST must use
+                            self._form["names"][ctl.get("id") or ctl["name"]] = ctl["name"]
+                    for sel in form.find_all("select"):
+                        key = sel.get("name") or sel.get("id")
+                        self._form["options"][key] = {
+                            o.get_text(strip=True): o.get("value", o.get_text(strip=True))
+                            for o in sel.find_all("option")
+                        }
+        return self._form
+
+    def values(self, row: dict) -> dict:
+        """*row* with its category / payment_method labels mapped to option values."""
+        options = self._form_info()["options"]
+        out = dict(row)
+        for field in ("category", "payment_method"):
+            out[field] = options.get(field, {}).get(row[field], row[field])
+        return out
+
+    # ─── sqlite backend ──────────────────────────────────────────────────
+    def _insert(self, rows: List[dict]) -> int:
+        with sqlite3.connect(self.db) as conn:       # one transaction for the whole batch
+            sql, names, extra = insert_sql(conn, self.username)
+            conn.executemany(sql, [tuple({**r, **extra}[n] for n in names) for r in rows])
+        return len(rows)
+
+    # ─── http backend ────────────────────────────────────────────────────
+    def _post(self, rows: List[dict]) -> int:
+        if self.http is None:
+            raise RuntimeError("http backend needs a logged-in APIRequestContext")
+        action = self._form_info()["action"] or FORM_PAGE
+        url = action if action.startswith("http") else self.base_url + action
+        names = self._form_info()["names"]
+        for r in rows:
+            resp = self.http.post(url, form={names.get(k, k): str(v) for k, v in r.items()})
+            if not resp.ok:
+                raise RuntimeError(f"POST {url} → {resp.status}")
+        return len(rows)
+
+    def _delete_via_links(self, tags: List[str]) -> int:
+        soup = BeautifulSoup(self.http.get(self.base_url + FORM_PAGE).text(), "html.parser")
+        deleted = 0
+        for tr in soup.select("tbody tr"):
+            if any(t in tr.get_text() for t in tags):
+                link = tr.select_one(".fa-trash-alt")
+                link = link.find_parent("a") if link else None
+                if link and link.get("href"):
+                    self.http.get(self.base_url + link["href"])
+                    deleted += 1
+        return deleted
@@ -0,0 +1,106 @@
+"""
+The Finance-Tracker app, started by the suite itself.
+• AppServer runs app/app.py as __main__ in a child process with cwd=app/,
+  exactly like `cd app && python app.py`: relative SQLite paths (also the
+  ones written inline in views) and any table setup under __main__ behave
+  as before; only Flask.run() is redirected to a free port (no reloader,
+  no debugger), so xdist workers and a dev server on :5000 never clash
+• start() polls READY_PATH until the app answers: no `sleep 3`; an app that
+  exits during startup fails fast with the tail of its log
+• FT_BASE_URL (or pytest --base-url) points the suite at a server that is
+  already running instead; nothing is started then
+"""
+
+import os, socket, subprocess, sys, tempfile, time, urllib.error, urllib.request
+from pathlib import Path
+from typing import Optional
+
+ROOT          = Path(__file__).resolve().parents[1]
+APP_DIR       = ROOT / "app"
+EXTERNAL_URL  = os.getenv("FT_BASE_URL")
+READY_PATH    = "/login"
+READY_TIMEOUT = 20.0                      # s, includes the child's imports
+
+# run app.py as __main__; whatever Flask.run() it reaches serves on argv[1]
+_BOOTSTRAP = """
+import runpy, sys, flask
+port, served, original = int(sys.argv[1]), [], flask.Flask.run
+def run(self, *a, **kw):
+    served.append(self)
+    original(self, host="127.0.0.1", port=port, debug=False, use_reloader=False)
+flask.Flask.run = run
+namespace = runpy.run_path("app.py", run_name="__main__")
+if not served:                            # app.py has no app.run(): serve its `app`
+    original(namespace["app"], host="127.0.0.1", port=port, debug=False, use_reloader=False)
+"""
+
+
+def free_port(host: str = "127.0.0.1") -> int:
+    with socket.socket() as s:
+        s.bind((host, 0))
+        return s.getsockname()[1]
+
+
+class AppServer:
+    """app.py from *app_dir* on 127.0.0.1:<free port>, in a child process."""
+
+    def __init__(self, app_dir: Path = APP_DIR, port: Optional[int] = None):
+        self.app_dir = Path(app_dir)
+        self.port    = port or free_port()
+        self.url     = f"http://127.0.0.1:{self.port}"
+        self.log     = Path(tempfile.gettempdir()) / f"app_server-{self.port}.log"
+        self._proc: Optional[subprocess.Popen] = None
+
+    def start(self, ready_path: str = READY_PATH, timeout: float = READY_TIMEOUT) -> "AppServer":
+        if not (self.app_dir / "app.py").exists():
+            raise FileNotFoundError(f"{self.app_dir / 'app.py'} missing (git submodule update --init)")
+        with open(self.log, "wb") as log:
+            self._proc = subprocess.Popen([sys.executable, "-c", _BOOTSTRAP, str(self.port)],
+                                          cwd=self.app_dir, stdout=log, stderr=subprocess.STDOUT)
+        try:
+            self.wait_ready(ready_path, timeout)
+        except RuntimeError:
+            self.stop()
+            raise
+        return self
+
+    def wait_ready(self, path: str = READY_PATH, timeout: float = READY_TIMEOUT) -> None:
+        """Poll *path* until the app answers (any HTTP status counts)."""
+        deadline, delay = time.monotonic() + timeout, 0.02
+        while True:
+            if self._proc is not None and self._proc.poll() is not None:
+                raise RuntimeError(f"app exited with {self._proc.returncode} during startup:\n{self._tail()}")
+            try:
+                urllib.request.urlopen(self.url + path, timeout=1).close()
+                return
+            except urllib.error.HTTPError:
+                return                    # an error page is still an answer
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f"app not ready at {self.url}{path} after {timeout:.0f} s:\n{self._tail()}")
+                time.sleep(delay)
+                delay = min(delay * 2, 0.25)
+
+    def _tail(self, lines: int = 20) -> str:
+        try:
+            return "\n".join(self.log.read_text(errors="replace").splitlines()[-lines:])
+        except OSError:
+            return ""
+
+    def stop(self) -> None:
+        if self._proc is None or self._proc.poll() is not None:
+            return
+        self._proc.terminate()
+        try:
+            self._proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self._proc.kill()
+            self._proc.wait()
+
+
+def serve(external: Optional[str] = EXTERNAL_URL):
+    """(base url, server or None): the external server if given, else app.py on a free port."""
+    if external:
+        return external.rstrip("/"), None
+    server = AppServer().start()
+    return server.url, server
@@ -0,0 +1,126 @@
+"""
+Third-party asset routing for browser contexts.
+• HEAL_ASSETS=replay (default): CSS / JS / fonts / images from other hosts
+  (Font Awesome, the chart library …) are served from .asset_cache/ when
+  recorded, otherwise fetched from the network as before; with nothing
+  recorded yet no route is installed (the browser's own HTTP cache stays on)
+• HEAL_ASSETS=record: fetch them once from the network and store them
+  (a failed fetch falls back to the plain network request)
+• HEAL_ASSETS=off:    no routing at all
+• trackers (BLOCK, plus HEAL_ASSETS_BLOCK="glob,glob") are aborted whenever routing is on
+• app requests are never touched; one file pair per URL (<sha1>.body/.json),
+  so xdist workers can record side by side
+• per navigation (the URL of the frame that loads the asset, so fonts and
+  images pulled in by a stylesheet count for the page, not the CSS file):
+  assets served, blocked, and the network time they took when recorded
+"""
+
+import fnmatch, hashlib, json, os, time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List
+from urllib.parse import urlparse
+from playwright.sync_api import Error as PWError
+
+ASSET_MODE = os.getenv("HEAL_ASSETS", "replay")                 # replay | record | off
+ASSET_DIR  = Path(os.getenv("HEAL_ASSETS_DIR", ".asset_cache"))
+APP_HOSTS  = {"127.0.0.1", "localhost"}                        # any port: the app runs on a free one
+STATIC     = {"stylesheet", "script", "font", "image"}          # request.resource_type
+BLOCK      = ["*google-analytics.com/*", "*googletagmanager.com/*", "*doubleclick.net/*",
+              "*hotjar.com/*"] + [p for p in os.getenv("HEAL_ASSETS_BLOCK", "").split(",") if p]
+KEEP_HEADERS = {"content-type", "cache-control", "access-control-allow-origin"}
+
+
+class AssetCache:
+    def __init__(self, root: Path, mode: str = ASSET_MODE, block: List[str] = BLOCK):
+        self.root  = Path(root)
+        self.mode  = mode
+        self.block = block
+        self.stats: Dict[str, dict] = defaultdict(lambda: {"served": 0, "recorded": 0,
+                                                           "blocked": 0, "saved_ms": 0.0})
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode in {"replay", "record"}
+
+    def _paths(self, url: str):
+        key = hashlib.sha1(url.encode()).hexdigest()
+        return self.root / f"{key}.body", self.root / f"{key}.json"
+
+    # ─── routing ─────────────────────────────────────────────────────────
+    def wants(self, url: str) -> bool:
+        """Route matcher: everything not served by the app itself."""
+        return urlparse(url).hostname not in APP_HOSTS
+
+    def recorded(self) -> bool:
+        return self.root.is_dir() and next(self.root.glob("*.json"), None) is not None
+
+    def attach(self, context) -> None:
+        # routing sends every request through Python and disables the browser cache:
+        # only worth it when recording or when there is something to replay
+        if self.mode == "record" or (self.mode == "replay" and self.recorded()):
+            context.route(self.wants, self.handle)
+
+    def handle(self, route) -> None:
+        request = route.request
+        url, nav = request.url, self._navigation(request)
+        if any(fnmatch.fnmatch(url, p) for p in self.block):
+            self.stats[nav]["blocked"] += 1
+            route.abort()
+            return
+        if request.method != "GET" or request.resource_type not in STATIC:
+            route.continue_()
+            return
+        body_path, meta_path = self._paths(url)
+        if meta_path.exists():
+            meta = json.loads(meta_path.read_text())
+            self.stats[nav]["served"] += 1
+            self.stats[nav]["saved_ms"] += meta["ms"]
+            route.fulfill(status=meta["status"], headers=meta["headers"], body=body_path.read_bytes())
+            return
+        if self.mode != "record":
+            route.continue_()             # not recorded yet: plain network, as before
+            return
+        start = time.perf_counter()
+        try:
+            response = route.fetch()
+            body = response.body()
+        except PWError:
+            route.continue_()             # offline / restricted runner: let the browser try
+            return
+        ms = (time.perf_counter() - start) * 1000
+        if response.ok:
+            self.store(url, response.status, response.headers, body, ms)
+            self.stats[nav]["recorded"] += 1
+        route.fulfill(response=response, body=body)
+
+    @staticmethod
+    def _navigation(request) -> str:
+        try:
+            return request.frame.url
+        except PWError:                   # service worker requests have no frame
+            return "?"
+
+    def store(self, url: str, status: int, headers: Dict[str, str], body: bytes, ms: float) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        body_path, meta_path = self._paths(url)
+        body_path.write_bytes(body)
+        meta = {"url": url, "status": status, "ms": round(ms, 1),
+                "headers": {k: v for k, v in headers.items() if k.lower() in KEEP_HEADERS}}
+        tmp = meta_path.with_name(f"{meta_path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(meta))
+        os.replace(tmp, meta_path)        # meta last: a half-written body is never served
+
+    # ─── reporting ───────────────────────────────────────────────────────
+    def summary(self) -> dict:
+        navs = sorted(self.stats.items(), key=lambda kv: -kv[1]["saved_ms"])
+        return {
+            "served":   sum(s["served"] for _, s in navs),
+            "recorded": sum(s["recorded"] for _, s in navs),
+            "blocked":  sum(s["blocked"] for _, s in navs),
+            "saved_ms": round(sum(s["saved_ms"] for _, s in navs), 1),
+            "per_navigation": [{"navigation": k, **s} for k, s in navs],
+        }
+
+
+ASSETS = AssetCache(ASSET_DIR)
@@ -0,0 +1,173 @@
+"""
+Self-healing locator for playwright.async_api.
+• same CACHE, REGISTRY, scoring, telemetry and snapshots as smart_locator.py;
+  only the page I/O is awaited
+• the DOM read is awaited, BeautifulSoup + rapidfuzz scoring run in a worker
+  thread (asyncio.to_thread), so heals on other pages keep making progress
+• concurrent heals of the same selector in one event loop are serialised:
+  the first one scans, the rest find its result in the cache (fast path)
+• install(): async counterpart of conftest's Page.locator / fill /
+  select_option patch, with the same probing and adaptive timeouts
+"""
+
+import asyncio, functools, time, weakref
+from collections import defaultdict
+from typing import Dict, Sequence
+from playwright.async_api import Page as AsyncPage, Error as PWError, TimeoutError as PWTimeout
+
+import tests.smart_locator as sl
+from tests.candidates import AsyncExtractor
+from tests.probing import DEFAULT_TIMEOUT, GRACE_TIMEOUT, HEALED_ACTIONS, PROBE_ENABLED, PROBES, is_settled_async
+from tests.profiling import PROFILER
+
+# one lock table per event loop (asyncio.Lock is bound to the loop that first waits on it)
+_LOCKS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Lock]]" = \
+    weakref.WeakKeyDictionary()
+
+
+def _lock(selector: str) -> asyncio.Lock:
+    table = _LOCKS.setdefault(asyncio.get_running_loop(), defaultdict(asyncio.Lock))
+    return table[selector]
+
+
+def _known_broken(selector: str, url: str) -> ValueError:
+    return ValueError(f"No fuzzy match for selector '{selector}' (known broken on {url}, scan skipped)")
+
+
+async def fuzzy_find_async(page, orig_css: str, thresh: int = sl.DEFAULT_THRESHOLD):
+    """fuzzy_find() for an async Page; returns an async Locator."""
+    cached = sl._cached(orig_css)
+    if cached:
+        return page.locator(cached)
+    async with _lock(orig_css):
+        cached = sl._cached(orig_css)   # healed by a concurrent caller while we waited
+        if cached:
+            return page.locator(cached)
+        if sl.CACHE.is_failed(orig_css, page.url):
+            raise _known_broken(orig_css, page.url)
+        results, timings = await _score_async(page, [orig_css], thresh)
+        return page.locator(sl._commit(page, results[0], timings))
+
+
+async def heal_many_async(page, selectors: Sequence[str], thresh: int = sl.DEFAULT_THRESHOLD) -> Dict[str, object]:
+    """heal_many() for an async Page: one DOM read, one scoring batch."""
+    healed, todo = {}, []
+    for sel in dict.fromkeys(selectors):
+        cached = sl._cached(sel)
+        if cached:
+            healed[sel] = page.locator(cached)
+        elif not sl.CACHE.is_failed(sel, page.url):
+            todo.append(sel)
+    if not todo:
+        return healed
+    results, timings = await _score_async(page, todo, thresh)
+    for result in results:
+        try:
+            healed[result.orig] = page.locator(sl._commit(page, result, timings))
+        except ValueError:
+            pass
+    return healed
+
+
+async def _score_async(page, selectors: Sequence[str], thresh: int):
+    timings = {"batch": len(selectors)}
+    url     = page.url                    # read before awaiting: the page may navigate meanwhile
+    reader  = AsyncExtractor(page, sl.ALLOWED_TAGS, mode=sl.EXTRACT_MODE, timings=timings)
+    found, scopes = {}, {}
+    pending = sl._scope_chains(selectors)
+    while pending:                        # innermost surviving ancestor first, one batch per scope
+        for scope, sels in sl._by_scope(pending).items():
+            records = await reader.records(scope)
+            hits = await asyncio.to_thread(sl._scoped, records, url, sels, scope, thresh, timings)
+            for sel, result in hits.items():
+                found[sel], scopes[sel] = result, scope
+        pending = sl._advance(pending, found)
+    rest = [sel for sel in selectors if sel not in found]
+    if rest:
+        records = await reader.records()
+        found.update(zip(rest, await asyncio.to_thread(sl._rank, records, url, rest, thresh, timings)))
+    timings["scoped"] = len(scopes)
+    results = [found[sel] for sel in selectors]
+    if sl.SNAPSHOTS.enabled:
+        try:
+            sl._capture(await page.content(), url, selectors, results, thresh,
+                        [scopes.get(s) for s in selectors])
+        except PWError:
+            pass
+    return results, timings
+
+
+# ─── async page patch ────────────────────────────────────────────────────
+class AsyncSmartLocator:
+    def __init__(self, raw, page, orig_css: str):
+        self._raw  = raw
+        self._page = page
+        self._orig = orig_css
+
+    def __getattr__(self, name):
+        fn = getattr(self._raw, name)
+        if name in HEALED_ACTIONS:
+            return functools.partial(self._call_with_heal, fn, name)
+        if name == "is_visible":          # a query: no probe, no heal, missing = False
+            return functools.partial(self._measured, fn, name)
+        return fn
+
+    async def _measured(self, fn, action_name, *a, **kw):
+        with PROFILER.measure(action_name, self._orig):
+            return await fn(*a, **kw)
+
+    async def _call_with_heal(self, fn, action_name, *a, **kw):
+        with PROFILER.measure(action_name, self._orig):
+            return await self._act(fn, action_name, *a, **kw)
+
+    async def _act(self, fn, action_name, *a, **kw):
+        if PROBE_ENABLED and sl.should_heal(self._orig) and await self._probe_missing():
+            healed = await fuzzy_find_async(self._page, self._orig)
+            return await getattr(healed, action_name)(*a, **kw)
+        try:
+            start = time.perf_counter()
+            timeout = PROBES.timeout_for(self._orig) if PROBE_ENABLED else DEFAULT_TIMEOUT
+            try:
+                result = await fn(*a, **{**kw, "timeout": timeout})
+            except PWTimeout:
+                if timeout >= DEFAULT_TIMEOUT or not await self._raw.count():
+                    raise
+                result = await fn(*a, **{**kw, "timeout": DEFAULT_TIMEOUT})   # slow, not broken
+            PROBES.record(self._orig, (time.perf_counter() - start) * 1000)
+            return result
+        except PWTimeout:
+            PROFILER.record("timeout-wait", self._orig, (time.perf_counter() - start) * 1000)
+            if sl.should_heal(self._orig):
+                healed = await fuzzy_find_async(self._page, self._orig)
+                return await getattr(healed, action_name)(*a, **kw)
+            raise
+
+    async def _probe_missing(self) -> bool:
+        start = time.perf_counter()
+        if await self._raw.count() or not await is_settled_async(self._page):
+            return False
+        try:
+            await self._raw.first.wait_for(state="attached", timeout=GRACE_TIMEOUT)
+            return False
+        except PWTimeout:
+            PROBES.record_skip(self._orig, (time.perf_counter() - start) * 1000)
+            return True
+
+
+def install(PageCls=AsyncPage) -> None:
+    """Patch an async Page class: locator() heals, fill/select_option go through it."""
+    if getattr(PageCls, "_smart_locator", False):
+        return
+    original = PageCls.locator
+
+    def locator(self, selector: str, *a, **kw):
+        return AsyncSmartLocator(original(self, selector, *a, **kw), self, selector)
+
+    async def fill(self, selector: str, *a, **kw):
+        return await self.locator(selector).fill(*a, **kw)
+
+    async def select_option(self, selector: str, *a, **kw):
+        return await self.locator(selector).select_option(*a, **kw)
+
+    PageCls.locator, PageCls.fill, PageCls.select_option = locator, fill, select_option
+    PageCls._smart_locator = True
@@ -0,0 +1,179 @@
+"""
+Heal candidate extraction.
+• "browser" mode: one page.evaluate() returns compact records, no HTML transfer
+• "html" mode:    page.content() + BeautifulSoup (old path, also the fallback)
+Both modes emit the same record shape, in document order:
+    {"tag", "type", "id", "name", "testid", "cls", "text"}
+"text" is the element's full text (the fallback key, as with the old
+get_text()) for the fallback tags only; id/name/testid carriers such as a
+table or form send "" instead of their whole subtree's text.
+scope="<selector>" limits the scan to the subtrees of every element it matches
+(Playwright selector in browser mode, CSS in html mode); no match → [].
+Extractor / AsyncExtractor serve several scopes of one heal: one read per
+distinct scope, at most one HTML fetch + parse. extract_async() is the same
+for playwright.async_api pages (HTML parse off-loop).
+"""
+
+import asyncio, os, time
+from typing import Dict, Iterable, List, Optional
+from bs4 import BeautifulSoup
+from playwright.sync_api import Page, Error as PWError
+
+EXTRACT_MODE = os.getenv("HEAL_EXTRACT", "browser")   # browser | html
+
+# anything with id/name/data-testid (phase 1 + 2) plus the fallback form controls
+_RECORDS_JS = """
+  const query = ['[id]', '[name]', '[data-testid]', ...tags].join(',');
+  const record = el => ({
+    tag:    el.tagName.toLowerCase(),
+    type:   el.getAttribute('type'),
+    id:     el.getAttribute('id'),
+    name:   el.getAttribute('name'),
+    testid: el.getAttribute('data-testid'),
+    cls:    (el.getAttribute('class') || '').split(/\\s+/).filter(Boolean).join(' ') || null,
+    text:   tags.includes(el.tagName.toLowerCase()) ? (el.textContent || '').trim() : '',
+  });
+"""
+EXTRACT_JS = """
+(tags) => {%s
+  return Array.from(document.querySelectorAll(query), record);
+}
+""" % _RECORDS_JS
+
+# locator.evaluate_all() hands over every element the scope matched; nested roots count once
+SCOPED_JS = """
+(roots, tags) => {%s
+  const seen = new Set();
+  for (const root of roots)
+    for (const el of root.querySelectorAll(query)) seen.add(el);
+  return Array.from(seen, record);
+}
+""" % _RECORDS_JS
+
+
+class Extractor:
+    """
+    Candidate records for one heal, per scope (None = whole page), each read once.
+    Browser mode evaluates per scope; once that fails (or in html mode) the page
+    HTML is fetched and parsed a single time and every scope is resolved on
+    that one soup. *timings* accumulates fetch_ms / parse_ms and the mode used.
+    """
+
+    def __init__(self, page, tags: Iterable[str], mode: str = EXTRACT_MODE,
+                 timings: Optional[Dict[str, float]] = None):
+        self.page    = page
+        self.tags    = list(tags)
+        self.mode    = mode
+        self.timings = {} if timings is None else timings
+        self.soup    = None
+        self._memo: Dict[Optional[str], List[dict]] = {}
+
+    def records(self, scope: Optional[str] = None) -> List[dict]:
+        if scope not in self._memo:
+            self._memo[scope] = self._read(scope)
+        return self._memo[scope]
+
+    def _read(self, scope):
+        start = time.perf_counter()
+        if self.mode == "browser":
+            try:
+                if scope:
+                    records = self.page.locator(scope).evaluate_all(SCOPED_JS, self.tags)
+                else:
+                    records = self.page.evaluate(EXTRACT_JS, self.tags)
+                self._took("browser", (time.perf_counter() - start) * 1000, 0.0)
+                return records
+            except PWError:
+                self.mode = "html"        # page mid-navigation, closed frame … → parse HTML
+        if self.soup is None:
+            html = self.page.content()
+            fetched = time.perf_counter()
+            self.soup = BeautifulSoup(html, "html.parser")
+            self._took("html", (fetched - start) * 1000, (time.perf_counter() - fetched) * 1000)
+            start = time.perf_counter()
+        records = soup_records(self.soup, self.tags, scope)
+        self._took("html", 0.0, (time.perf_counter() - start) * 1000)
+        return records
+
+    def _took(self, mode: str, fetch_ms: float, parse_ms: float) -> None:
+        self.timings["mode"] = mode
+        self.timings["fetch_ms"] = self.timings.get("fetch_ms", 0.0) + fetch_ms
+        self.timings["parse_ms"] = self.timings.get("parse_ms", 0.0) + parse_ms
+
+
+class AsyncExtractor(Extractor):
+    """Extractor for an async Page; the HTML parse runs in a worker thread."""
+
+    async def records(self, scope: Optional[str] = None) -> List[dict]:
+        if scope not in self._memo:
+            self._memo[scope] = await self._read(scope)
+        return self._memo[scope]
+
+    async def _read(self, scope):
+        start = time.perf_counter()
+        if self.mode == "browser":
+            try:
+                if scope:
+                    records = await self.page.locator(scope).evaluate_all(SCOPED_JS, self.tags)
+                else:
+                    records = await self.page.evaluate(EXTRACT_JS, self.tags)
+                self._took("browser", (time.perf_counter() - start) * 1000, 0.0)
+                return records
+            except PWError:
+                self.mode = "html"
+        if self.soup is None:
+            html = await self.page.content()
+            fetched = time.perf_counter()
+            self.soup = await asyncio.to_thread(BeautifulSoup, html, "html.parser")
+            self._took("html", (fetched - start) * 1000, (time.perf_counter() - fetched) * 1000)
+            start = time.perf_counter()
+        records = await asyncio.to_thread(soup_records, self.soup, self.tags, scope)
+        self._took("html", 0.0, (time.perf_counter() - start) * 1000)
+        return records
+
+
+def extract(page: Page, tags: Iterable[str], mode: str = EXTRACT_MODE,
+            timings: Optional[Dict[str, float]] = None, scope: Optional[str] = None) -> List[dict]:
+    """
+    Candidate records for the live page (or the subtrees matched by *scope*).
+    *timings* (if given) receives fetch_ms / parse_ms and the mode actually used.
+    """
+    return Extractor(page, tags, mode, timings).records(scope)
+
+
+async def extract_async(page, tags: Iterable[str], mode: str = EXTRACT_MODE,
+                        timings: Optional[Dict[str, float]] = None,
+                        scope: Optional[str] = None) -> List[dict]:
+    """extract() for an async Page; BeautifulSoup runs in a worker thread."""
+    return await AsyncExtractor(page, tags, mode, timings).records(scope)
+
+
+def from_html(html: str, tags: Iterable[str], scope: Optional[str] = None) -> List[dict]:
+    return soup_records(BeautifulSoup(html, "html.parser"), tags, scope)
+
+
+def soup_records(soup: BeautifulSoup, tags: Iterable[str], scope: Optional[str] = None) -> List[dict]:
+    tags = set(tags)
+    wanted = lambda t: (t.name in tags or t.has_attr("id")
+                        or t.has_attr("name") or t.has_attr("data-testid"))
+    if scope:
+        try:
+            roots = soup.select(scope)
+        except Exception:                 # Playwright-only syntax (:has-text …): not resolvable here
+            return []
+        found = {id(el): el for root in roots for el in root.find_all(wanted)}   # nested roots once
+        elements = list(found.values())
+    else:
+        elements = soup.find_all(wanted)
+    return [
+        {
+            "tag":    el.name,
+            "type":   el.get("type"),
+            "id":     el.get("id"),
+            "name":   el.get("name"),
+            "testid": el.get("data-testid"),
+            "cls":    " ".join(el.get("class") or []) or None,
+            "text":   el.get_text().strip() if el.name in tags else "",
+        }
+        for el in elements
+    ]
@@ -2,30 +2,50 @@
 # tests/conftest.py
 # ──────────────────────────────────────────────────────────────
 import sys, rich
-import os, pytest, functools, re
+import os, pytest, functools, time, tempfile, contextlib
 from dotenv import load_dotenv, find_dotenv
-from tests.smart_locator import HEAL_EVENTS, fuzzy_find
-from playwright.sync_api import Page, TimeoutError as PWTimeout
-import subprocess
-
-@pytest.fixture(scope="session", autouse=True)
-def seed_demo_user():
-    """
-    Ensure the demo user exists in SQLite before any test runs.
-    """
-    subprocess.run(
-        ["python", "scripts/seed_user.py"],
-        check=True,
-    )
+from tests.smart_locator import CACHE, HEAL_EVENTS, fuzzy_find, should_heal
+from tests.locator_cache import SharedLocatorCache
+from tests.telemetry import RUN_ID, TELEMETRY
+from tests.snapshots import SNAPSHOTS
+from uuid import uuid4
+from tests.probing import DEFAULT_TIMEOUT, GRACE_TIMEOUT, HEALED_ACTIONS, PROBE_ENABLED, PROBES, is_settled
+from tests.profiling import DEFAULT_PROFILE, PROFILER
+from tests.asset_cache import ASSETS
+from tests.context_pool import POOL_ENABLED, ContextPool
+from tests.sharding import ShardingPlugin
+from tests.app_server import EXTERNAL_URL, serve
+from scripts.test_data import TxnFactory
+from scripts.seed_user import seed_user
+from playwright.sync_api import Browser, Page, TimeoutError as PWTimeout
 
 # ---------- original fixtures --------------------------------
 @pytest.fixture(scope="session")
 def creds():
     return {"u": os.getenv("FT_USER"), "p": os.getenv("FT_PASS")}
 
+@pytest.fixture(scope="session")
+def app_server(pytestconfig, creds):
+    """
+    Seed the demo user in-process, then start app.py on a free port with
+    cwd=app (one per xdist worker). FT_BASE_URL / --base-url use a running
+    server instead. Yields the base URL.
+    """
+    seed_user(creds["u"], creds["p"],
+              os.getenv("FT_EMAIL", "example@example.com"), os.getenv("FT_PHONE", "37444444444"))
+    url, server = serve(pytestconfig.getoption("--base-url") or EXTERNAL_URL)
+    yield url
+    if server:
+        server.stop()
+
+@pytest.fixture(scope="session")
+def base_url(app_server):
+    """pytest-playwright's base_url: every context resolves page.goto("/…") against the app."""
+    return app_server
+
 def login(page, creds):
     # 1) Go to login and fill form
-    page.goto("http://127.0.0.1:5000/login", wait_until="networkidle")
+    page.goto("/login", wait_until="networkidle")
     page.fill("#username", creds["u"])
     page.fill("#password", creds["p"])
 
@@ -33,12 +53,102 @@ def login(page, creds):
     with page.expect_navigation(wait_until="networkidle"):
         page.click("button[type='submit']")
 
+@pytest.fixture(scope="session")
+def auth_state(browser, browser_context_args, creds, tmp_path_factory):
+    """
+    Log in once per session and save cookies/storage as a Playwright storage_state.
+    """
+    path = tmp_path_factory.mktemp("auth") / "storage_state.json"
+    context = browser.new_context(**browser_context_args)
+    login(context.new_page(), creds)
+    context.storage_state(path=path)
+    context.close()
+    return str(path)
+
+_POOL = None                              # this worker's context pool (for the summary)
+# pytest-playwright records these only for contexts from its own fixtures
+ARTIFACT_OPTIONS = ("--tracing", "--video", "--screenshot")
+
+def _pooled(config) -> bool:
+    """Pool on, unless trace / video / screenshot artifacts were asked for."""
+    return POOL_ENABLED and all(config.getoption(o, "off") == "off" for o in ARTIFACT_OPTIONS)
+
+@pytest.fixture(scope="session")
+def context_pool(browser, browser_context_args):
+    """HEAL_POOL_SIZE warm contexts per worker, reset between tests."""
+    global _POOL
+    _POOL = ContextPool(browser, browser_context_args, on_new=ASSETS.attach).warm()
+    yield _POOL
+    _POOL.close()
+
+@pytest.fixture
+def page(request):
+    """Drop-in for pytest-playwright's page: a pooled context, reset after the test."""
+    if not _pooled(request.config):
+        yield request.getfixturevalue("context").new_page()
+        return
+    pool = request.getfixturevalue("context_pool")
+    context, pg = pool.acquire()
+    yield pg
+    pool.release(context, pg)
+
+@pytest.fixture
+def logged_in_page(request, auth_state):
+    """Context restored from the session login: no login form, no redirects."""
+    if not _pooled(request.config):
+        yield request.getfixturevalue("new_context")(storage_state=auth_state).new_page()
+        return
+    pool = request.getfixturevalue("context_pool")
+    context, pg = pool.acquire(storage_state=auth_state)
+    yield pg
+    pool.release(context, pg)
+
+@pytest.fixture
+def txn_factory(playwright, auth_state, creds, base_url):
+    """
+    Create tagged transactions straight through SQLite (or HTTP POST), not the UI.
+    Everything it created is deleted again after the test.
+    """
+    http = playwright.request.new_context(base_url=base_url, storage_state=auth_state)
+    factory = TxnFactory(creds["u"], http=http, base_url=base_url)
+    yield factory
+    factory.cleanup()
+    http.dispose()
+
 # ---------- global smart-locator patch -----------------------
-HEAL_TAGS = {"input", "textarea", "select", "button"}
+_OWN_DB = None                            # shared heal db created by this (xdist controller) run
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--profile-actions", nargs="?", const=DEFAULT_PROFILE, default=None, metavar="PATH",
+        help=f"time every patched action/navigation, write a JSON profile (default {DEFAULT_PROFILE})",
+    )
+    parser.addoption("--num-shards", type=int, default=None, help="split the suite into N duration-balanced shards")
+    parser.addoption("--shard-id", type=int, default=None, help="0-based shard to run (with --num-shards)")
+    parser.addoption("--durations-path", default=None, help="per-test duration history (default .test_durations.json)")
+    parser.addoption("--record-durations", action="store_true",
+                     help="update the duration history without sharding (sharded runs always do)")
+
+def pytest_configure(config):
+    # xdist controller: point every worker at one SQLite heal cache for this run
+    # (set before workers spawn, they inherit the env and open_cache() picks it up)
+    global _OWN_DB
+    os.environ.setdefault("HEAL_RUN_ID", RUN_ID)   # one telemetry run id for all workers
+    if getattr(config.option, "numprocesses", None) and not hasattr(config, "workerinput") \
+            and "HEAL_CACHE_DB" not in os.environ:
+        _OWN_DB = os.path.join(tempfile.gettempdir(), f"locator_cache-{uuid4().hex}.db")
+        os.environ["HEAL_CACHE_DB"] = _OWN_DB
+    if config.getoption("--profile-actions"):
+        PROFILER.enable(config.getoption("--profile-actions"))
+    config.pluginmanager.register(ShardingPlugin(config), "heal-sharding")   # history, shards, order
 
 def pytest_sessionstart(session):
     _patch_page_locator(Page)
     _patch_page_actions(Page)
+    if PROFILER.enabled:
+        _patch_page_navigation(Page)
+    if ASSETS.enabled:
+        _patch_context_routing(Browser)
 
 def _patch_page_locator(PageCls):
     original = PageCls.locator
@@ -57,6 +167,37 @@ def _patch_page_actions(PageCls):
         return self.locator(selector).select_option(*a, **kw)
     PageCls.select_option = select_option
 
+def _patch_page_navigation(PageCls):
+    # opt-in (--profile-actions): time navigations and explicit waits
+    def timed(name):
+        original = getattr(PageCls, name)
+        def wrapper(self, target, *a, **kw):
+            label = f"{target} [{kw['wait_until']}]" if "wait_until" in kw else target
+            with PROFILER.measure(name, label):
+                return original(self, target, *a, **kw)
+        setattr(PageCls, name, wrapper)
+    timed("goto")
+    timed("wait_for_selector")
+
+    original_nav = PageCls.expect_navigation
+    @contextlib.contextmanager
+    def expect_navigation(self, *a, **kw):
+        start = time.perf_counter()
+        with original_nav(self, *a, **kw) as info:
+            yield info
+        PROFILER.record("expect_navigation", f"{self.url} [{kw.get('wait_until', 'load')}]",
+                        (time.perf_counter() - start) * 1000)
+    PageCls.expect_navigation = expect_navigation
+
+def _patch_context_routing(BrowserCls):
+    # every context (page fixture, logged_in_page, auth_state) gets the asset routes
+    original = BrowserCls.new_context
+    def new_context(self, *a, **kw):
+        context = original(self, *a, **kw)
+        ASSETS.attach(context)
+        return context
+    BrowserCls.new_context = new_context
+
 class _SmartLocator:
     def __init__(self, raw, page: Page, orig_css: str):
         self._raw  = raw
@@ -65,30 +206,119 @@ class _SmartLocator:
 
     def __getattr__(self, name):
         fn = getattr(self._raw, name)
-        if name in {"fill", "select_option", "is_visible"}:
+        if name in HEALED_ACTIONS:
             return functools.partial(self._call_with_heal, fn, name)
+        if name == "is_visible":          # a query: no probe, no heal, missing = False
+            return functools.partial(self._measured, fn, name)
         return fn
 
+    def _measured(self, fn, action_name, *a, **kw):
+        with PROFILER.measure(action_name, self._orig):
+            return fn(*a, **kw)
+
     def _call_with_heal(self, fn, action_name, *a, **kw):
+        with PROFILER.measure(action_name, self._orig):
+            return self._act(fn, action_name, *a, **kw)
+
+    def _act(self, fn, action_name, *a, **kw):
+        if PROBE_ENABLED and self._should_heal() and self._probe_missing():
+            healed = fuzzy_find(self._page, self._orig)
+            return getattr(healed, action_name)(*a, **kw)
         try:
-            return fn(*a, **{**kw, "timeout": 2_000})
+            start = time.perf_counter()
+            timeout = PROBES.timeout_for(self._orig) if PROBE_ENABLED else DEFAULT_TIMEOUT
+            try:
+                result = fn(*a, **{**kw, "timeout": timeout})
+            except PWTimeout:
+                if timeout >= DEFAULT_TIMEOUT or not self._raw.count():
+                    raise
+                # adaptive wait too short but the selector still matches: slow, not broken
+                result = fn(*a, **{**kw, "timeout": DEFAULT_TIMEOUT})
+            PROBES.record(self._orig, (time.perf_counter() - start) * 1000)
+            return result
         except PWTimeout:
+            PROFILER.record("timeout-wait", self._orig, (time.perf_counter() - start) * 1000)
             if self._should_heal():
                 healed = fuzzy_find(self._page, self._orig)
                 return getattr(healed, action_name)(*a, **kw)
             raise
 
-    def _should_heal(self) -> bool:
-        if "#" in self._orig or "name=" in self._orig:
+    def _probe_missing(self) -> bool:
+        """True when the original selector is clearly gone (settled page, 0 matches)."""
+        start = time.perf_counter()
+        if self._raw.count() or not is_settled(self._page):
+            return False
+        try:
+            self._raw.first.wait_for(state="attached", timeout=GRACE_TIMEOUT)
+            return False                  # late insert, not a broken selector
+        except PWTimeout:
+            PROBES.record_skip(self._orig, (time.perf_counter() - start) * 1000)
             return True
-        m = re.match(r"(\w+)", self._orig)
-        return bool(m and m.group(1).lower() in HEAL_TAGS)
+
+    def _should_heal(self) -> bool:
+        return should_heal(self._orig)
 
 def pytest_sessionfinish(session, exitstatus):
+    TELEMETRY.flush()                     # append this process's heal records
+    SNAPSHOTS.flush()                     # HEAL_SNAPSHOTS cases (DOMs are written on capture)
+    PROFILER.dump()                       # --profile-actions JSON (per worker under xdist)
+    if hasattr(session.config, "workerinput"):
+        return                            # xdist worker: heals already written to the shared db
+    events = HEAL_EVENTS
+    if os.getenv("HEAL_CACHE_DB"):
+        shared = SharedLocatorCache(os.environ["HEAL_CACHE_DB"], CACHE.path)
+        events = shared.events()          # merged from every worker
+        shared.export()                   # back to locator_cache.json for the next run
+        shared.close()
+        if _OWN_DB:
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(_OWN_DB + suffix):
+                    os.remove(_OWN_DB + suffix)
+    else:
+        CACHE.flush()                     # persist this run's heals in one atomic write
     console = rich.console.Console(file=sys.stdout)
-    if not HEAL_EVENTS:
+    if not events:
         console.print("[green bold]🟢 0 selectors healed (cache up-to-date)")
     else:
-        console.print(f"[yellow bold]🟡 {len(HEAL_EVENTS)} selectors healed this run:")
-        for orig, new, score in HEAL_EVENTS:
+        console.print(f"[yellow bold]🟡 {len(events)} selectors healed this run:")
+        for orig, new, score in events:
             console.print(f"   {orig:<25} → {new:<25} ({score} %)")
+    if PROBES.skipped:
+        console.print(f"[cyan]⏱ {PROBES.skipped} broken selectors probed instead of waited on "
+                      f"(~{PROBES.saved_ms / 1000:.1f} s of timeouts avoided)")
+    if _POOL and _POOL.acquired:
+        pool = _POOL.summary()
+        console.print(f"[cyan]♻ {pool['acquired']} tests on {pool['created']} pooled contexts "
+                      f"(fresh context ≈ {pool['fresh_ms']:.0f} ms, resets {pool['reset_ms'] / 1000:.1f} s "
+                      f"→ ~{pool['saved_ms'] / 1000:.1f} s saved)")
+    assets = ASSETS.summary()
+    if assets["served"] or assets["recorded"] or assets["blocked"]:
+        console.print(f"[cyan]📦 {assets['served']} third-party assets served from {ASSETS.root}, "
+                      f"{assets['recorded']} recorded, {assets['blocked']} blocked "
+                      f"(~{assets['saved_ms'] / 1000:.1f} s of asset fetches avoided)")
+        for nav in assets["per_navigation"][:5]:
+            console.print(f"   {nav['saved_ms']:7.0f} ms  {nav['served']:3} served  "
+                          f"{nav['blocked']:3} blocked  {nav['navigation']}")
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    if not PROFILER.enabled:
+        return
+    if not PROFILER.records:
+        if getattr(config.option, "numprocesses", None):
+            terminalreporter.write_line(f"action profile: see {PROFILER.path.stem}.<worker>"
+                                        f"{PROFILER.path.suffix} (one per xdist worker)")
+        return
+    s = PROFILER.summary()
+    tr = terminalreporter
+    tr.section("action profile")
+    tr.write_line(f"{s['actions']} actions, {s['total_ms'] / 1000:.1f} s total → {PROFILER.path}")
+    tr.write_line("hottest selectors:")
+    for h in s["hottest_selectors"]:
+        tr.write_line(f"  {h['total_ms']:9.0f} ms  {h['count']:4}×  max {h['max_ms']:7.0f} ms  "
+                      f"{h['target']}  ({', '.join(h['kinds'])})")
+    tr.write_line("slowest waits:")
+    for w in s["slowest_waits"]:
+        tr.write_line(f"  {w['ms']:9.0f} ms  {w['kind']:<18} {w['target']}  [{w['test']}]")
+    tr.write_line("slowest tests (time in patched actions):")
+    for t in s["slowest_tests"]:
+        tr.write_line(f"  {t['total_ms']:9.0f} ms  {t['test']}")
@@ -0,0 +1,136 @@
+"""
+Warm browser-context pool.
+• HEAL_POOL_SIZE contexts (default 2) per worker are created once, each with
+  a page that already loaded WARM_URL (app assets in its memory cache;
+  relative, resolved against the contexts' base_url)
+• acquire(storage_state) hands one out, restored to that saved state
+  (cookies; localStorage of the saved origins on first navigation)
+• release() resets it for the next test: extra pages closed, cookies,
+  permissions, routes and the current origin's storage cleared, page parked
+  on about:blank; a context that fails to reset is replaced with a fresh one
+• summary(): fresh-context cost (new_context + new_page, measured while
+  warming, without the warm-up navigation) × contexts not built − reset
+  time, i.e. the net saving over one fresh context per test; warm_ms is
+  reported on its own
+HEAL_POOL=0 turns the pool off (the page fixtures fall back to fresh contexts);
+so does --tracing / --video / --screenshot other than "off", since
+pytest-playwright only records those artifacts for its own contexts.
+"""
+
+import json, os, time
+from collections import deque
+from pathlib import Path
+from typing import Optional
+from playwright.sync_api import Error as PWError
+
+POOL_ENABLED = os.getenv("HEAL_POOL", "1") != "0"
+POOL_SIZE    = int(os.getenv("HEAL_POOL_SIZE", "2"))
+WARM_URL     = os.getenv("HEAL_POOL_WARM_URL", "/login")
+
+# localStorage from a storage_state, applied by an init script before page scripts run
+_RESTORE_STORAGE_JS = """
+(() => {
+  const saved = %s[location.origin];
+  if (!saved || sessionStorage.getItem('__pool_restored')) return;
+  for (const {name, value} of saved) localStorage.setItem(name, value);
+  sessionStorage.setItem('__pool_restored', '1');
+})();
+"""
+
+
+class ContextPool:
+    def __init__(self, browser, context_args: dict, size: int = POOL_SIZE,
+                 warm_url: Optional[str] = WARM_URL, on_new=None):
+        self.browser      = browser
+        self.context_args = dict(context_args)
+        self.size         = size
+        self.warm_url     = warm_url
+        self.on_new       = on_new            # called with every new context (re-attach routes …)
+        self._idle        = deque()
+        self.created = self.acquired = 0
+        self.create_ms = self.warm_ms = self.reset_ms = 0.0
+
+    # ─── lifecycle ───────────────────────────────────────────────────────
+    def _fresh(self):
+        start = time.perf_counter()
+        context = self.browser.new_context(**self.context_args)
+        page = context.new_page()
+        built = time.perf_counter()
+        if self.warm_url:
+            try:
+                page.goto(self.warm_url, wait_until="load")
+            except PWError:
+                pass                      # app not up yet: the context is still usable
+        self.created += 1
+        self.create_ms += (built - start) * 1000
+        self.warm_ms += (time.perf_counter() - built) * 1000   # not part of a fresh context's cost
+        return context, page
+
+    def warm(self) -> "ContextPool":
+        while len(self._idle) < self.size:
+            self._idle.append(self._fresh())
+        return self
+
+    def acquire(self, storage_state: Optional[str] = None):
+        """(context, page) restored to *storage_state* (a storage_state file path) or empty."""
+        self.acquired += 1
+        context, page = self._idle.popleft() if self._idle else self._fresh()
+        if storage_state:
+            state = json.loads(Path(storage_state).read_text())
+            context.add_cookies(state.get("cookies", []))
+            origins = {o["origin"]: o["localStorage"] for o in state.get("origins", []) if o.get("localStorage")}
+            if origins:
+                context.add_init_script(_RESTORE_STORAGE_JS % json.dumps(origins))
+                context._pool_init_scripts = True
+        return context, page
+
+    def release(self, context, page) -> None:
+        start = time.perf_counter()
+        try:
+            for p in context.pages:
+                if p is not page:
+                    p.close()
+            if page.is_closed():
+                page = context.new_page()
+            elif page.url.startswith("http"):
+                page.evaluate("() => { localStorage.clear(); sessionStorage.clear(); }")
+            page.goto("about:blank")
+            context.clear_cookies()
+            context.clear_permissions()
+            context.unroute_all(behavior="ignoreErrors")
+            if self.on_new:
+                self.on_new(context)
+            ok = True
+        except PWError:
+            ok = False
+        if ok and len(self._idle) < self.size and not self._has_init_scripts(context):
+            self._idle.append((context, page))
+            self.reset_ms += (time.perf_counter() - start) * 1000
+            return
+        context.close()                   # broken, surplus, or carries a restore init script
+        if len(self._idle) < self.size:
+            self._idle.append(self._fresh())
+
+    @staticmethod
+    def _has_init_scripts(context) -> bool:
+        # init scripts cannot be removed from a context: such contexts are not reused
+        return getattr(context, "_pool_init_scripts", False)
+
+    def close(self) -> None:
+        while self._idle:
+            context, _ = self._idle.popleft()
+            context.close()
+
+    # ─── reporting ───────────────────────────────────────────────────────
+    def summary(self) -> dict:
+        fresh_ms = self.create_ms / self.created if self.created else 0.0
+        return {
+            "size":     self.size,
+            "created":  self.created,
+            "acquired": self.acquired,
+            "fresh_ms": round(fresh_ms, 1),
+            "warm_ms":  round(self.warm_ms, 1),
+            "reset_ms": round(self.reset_ms, 1),
+            # net: contexts a fresh-per-test run would have built, minus what the pool built + resets
+            "saved_ms": round((self.acquired - self.created) * fresh_ms - self.reset_ms, 1),
+        }
@@ -0,0 +1,152 @@
+"""
+Heal-ahead: turn a registry diff into locator-cache entries before pytest runs.
+• per route, selectors that disappeared are scored against the ones that
+  appeared with the healer's own engine (score_batch + registry class boost)
+• a mapping is kept only if it is confident (≥ --min-score), lands on a
+  control of the same class and every route that lost the selector agrees
+• kept mappings are written to locator_cache.json, so the first test that
+  touches a renamed control takes fuzzy_find's fast path (no DOM scan); the
+  fast path also resolves compound test selectors ("select#payment_method",
+  "#popup [name='notes']") through their bare #id / [name] key
+• CLI:  python -m tests.heal_ahead --old <previous registry> [--new selector_registry.json]
+                                  [--cache locator_cache.json] [--min-score 80] [--dry-run]
+        without --old the registry committed at HEAD is used
+"""
+
+import argparse, json, re, subprocess, sys
+from pathlib import Path
+from typing import Dict, List
+from rich.console import Console
+from rich.table import Table
+
+from tests.locator_cache import LocatorCache
+from tests.registry import decode, load_routes
+from tests.scoring import CandidateSet, fallback_selector, score_batch
+
+REGISTRY_PATH = Path("selector_registry.json")
+CACHE_PATH    = Path("locator_cache.json")
+MIN_SCORE     = 80                        # stricter than the live 60: nobody looks at the DOM here
+THRESHOLD     = 60
+
+
+def entry_record(entry: dict) -> dict:
+    """Candidate record (candidates.extract shape) rebuilt from a registry entry."""
+    tag, _, type_ = entry["class"].partition(".")
+    sel  = entry["selector"]
+    id_  = re.match(r"#([\w\-]+)$", sel)
+    name = re.search(r"name=['\"]([^'\"]+)['\"]", sel)
+    return {
+        "tag":    tag,
+        "type":   type_ if tag == "input" else None,
+        "id":     id_.group(1) if id_ else None,
+        "name":   name.group(1) if name else None,
+        "testid": None,
+        "cls":    None,
+        "text":   "",
+    }
+
+
+def _targets(entries: List[dict]) -> Dict[str, dict]:
+    """Every selector score_batch can emit for these entries → the registry entry."""
+    out = {}
+    for e in entries:
+        rec = entry_record(e)
+        for sel in (f"#{rec['id']}" if rec["id"] else None,
+                    f'[name="{rec["name"]}"]' if rec["name"] else None,
+                    fallback_selector(rec)):
+            if sel:
+                out.setdefault(sel, e)
+    return out
+
+
+def plan(old: Dict[str, List[dict]], new: Dict[str, List[dict]],
+         min_score: int = MIN_SCORE, thresh: int = THRESHOLD) -> Dict[str, dict]:
+    """
+    {old selector: {"to", "class", "score", "phase", "routes"}} for confident renames.
+    Selectors whose routes disagree on the target are dropped (the cache is global).
+    """
+    proposals: Dict[str, List[dict]] = {}
+    for route, old_entries in old.items():
+        new_entries = new.get(route, [])
+        new_sels = {e["selector"] for e in new_entries}
+        removed  = [e for e in old_entries if e["selector"] not in new_sels]
+        old_sels = {e["selector"] for e in old_entries}
+        added    = [e for e in new_entries if e["selector"] not in old_sels]
+        if not (removed and added):
+            continue
+        targets = _targets(added)
+        records = [entry_record(e) for e in added]
+        results = score_batch(CandidateSet(records, {r["tag"] for r in records}),
+                              [e["selector"] for e in removed], thresh,
+                              [e["class"] for e in removed], workers=1)
+        for entry, result in zip(removed, results):
+            for m in result.ranked:       # best first; first same-class target wins
+                target = targets.get(m.selector)
+                if target and target["class"] == entry["class"]:
+                    proposals.setdefault(entry["selector"], []).append({
+                        "to": target["selector"], "class": entry["class"],
+                        "score": m.score, "phase": m.phase, "route": route})
+                    break
+            else:
+                proposals.setdefault(entry["selector"], []).append(None)
+
+    mappings = {}
+    for sel, props in proposals.items():
+        if None in props or len({p["to"] for p in props}) != 1:
+            continue                      # unmatched on some route, or routes disagree
+        score = min(p["score"] for p in props)
+        if score >= min_score:
+            mappings[sel] = {"to": props[0]["to"], "class": props[0]["class"], "score": score,
+                             "phase": props[0]["phase"], "routes": [p["route"] for p in props]}
+    return mappings
+
+
+def apply(mappings: Dict[str, dict], cache: LocatorCache) -> int:
+    """Write *mappings* into *cache*; returns how many entries changed."""
+    heals, _ = cache.snapshot()
+    changed = 0
+    for sel, m in mappings.items():
+        if heals.get(sel) != m["to"]:
+            cache.put(sel, m["to"])
+            changed += 1
+    cache.flush()
+    return changed
+
+
+def _committed(path: Path, rev: str = "HEAD") -> Dict[str, List[dict]]:
+    out = subprocess.run(["git", "show", f"{rev}:{path.as_posix()}"],
+                         capture_output=True, text=True)
+    return decode(json.loads(out.stdout)) if out.returncode == 0 else {}
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Pre-fill the locator cache from a registry diff")
+    ap.add_argument("--old", type=Path, help="previous registry (default: git HEAD version of --new)")
+    ap.add_argument("--new", type=Path, default=REGISTRY_PATH)
+    ap.add_argument("--cache", type=Path, default=CACHE_PATH)
+    ap.add_argument("--min-score", type=int, default=MIN_SCORE)
+    ap.add_argument("--dry-run", action="store_true", help="print the plan, leave the cache alone")
+    args = ap.parse_args(argv)
+
+    console = Console()
+    old = load_routes(args.old) if args.old else _committed(args.new)
+    new = load_routes(args.new)
+    mappings = plan(old, new, args.min_score)
+    if not mappings:
+        console.print("heal-ahead: no confident renames")
+        return 0
+
+    t = Table(title="heal-ahead mappings")
+    for col in ("selector", "→ new", "class", "score", "phase", "routes"):
+        t.add_column(col)
+    for sel, m in mappings.items():
+        t.add_row(sel, m["to"], m["class"], str(m["score"]), m["phase"], " ".join(m["routes"]))
+    console.print(t)
+    if not args.dry_run:
+        changed = apply(mappings, LocatorCache(args.cache))
+        console.print(f"heal-ahead: {changed} new cache entries → {args.cache}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""
+In-process locator cache.
+• loads locator_cache.json once per session, lookups are served from memory
+• heals are buffered and written atomically (tmp file + rename) by flush()
+• failed heals are remembered as negative entries (page URL + TTL) so a
+  known-broken selector fails fast instead of re-scanning the DOM; they live
+  for this run only (memory, or the run's shared db) and are never written
+  to locator_cache.json, so a DOM fix is picked up by the next session
+• SharedLocatorCache: same interface on SQLite (WAL) for pytest-xdist workers;
+  writes go through immediately so one worker's heal is every worker's cache hit
+"""
+
+import json, os, sqlite3, time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+NEGATIVE_KEY = "__failed__"               # legacy key in locator_cache.json, ignored on load
+NEGATIVE_TTL = 15 * 60                    # seconds a failed heal stays "known broken"
+
+
+class LocatorCache:
+    def __init__(self, path: Path, negative_ttl: float = NEGATIVE_TTL):
+        self.path         = Path(path)
+        self.negative_ttl = negative_ttl
+        self._heals: Dict[str, str]   = {}
+        self._failed: Dict[str, dict] = {}  # orig -> {"url": …, "ts": …}
+        self._loaded = False
+        self._dirty  = False
+
+    # ─── load once ───────────────────────────────────────────────────────
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return                        # corrupt/partial file → start empty
+        data.pop(NEGATIVE_KEY, None)      # negatives from older runs no longer apply
+        self._heals.update(data)
+
+    # ─── positive entries ────────────────────────────────────────────────
+    def get(self, orig: str) -> Optional[str]:
+        self._load()
+        return self._heals.get(orig)
+
+    def put(self, orig: str, new: str) -> None:
+        self._load()
+        if self._heals.get(orig) != new:
+            self._heals[orig] = new
+            self._dirty = True
+        self._failed.pop(orig, None)
+
+    # ─── negative entries ────────────────────────────────────────────────
+    def is_failed(self, orig: str, url: str) -> bool:
+        """True if *orig* already failed to heal on *url* within the TTL."""
+        self._load()
+        hit = self._failed.get(orig)
+        if not hit:
+            return False
+        if time.time() - hit["ts"] >= self.negative_ttl:
+            del self._failed[orig]
+            return False
+        return hit["url"] == url
+
+    def mark_failed(self, orig: str, url: str) -> None:
+        self._load()
+        self._failed[orig] = {"url": url, "ts": time.time()}   # session only: nothing to flush
+
+    # ─── persistence ─────────────────────────────────────────────────────
+    def flush(self) -> None:
+        """Write buffered changes in one atomic replace (no-op when clean)."""
+        if not self._dirty:
+            return
+        _write_json(self.path, self._heals)
+        self._dirty = False
+
+    def snapshot(self) -> Tuple[Dict[str, str], Dict[str, dict]]:
+        """Copies of (heals, live negative entries)."""
+        self._load()
+        return dict(self._heals), dict(self._failed)
+
+    def log_heal(self, orig: str, new: str, score: int) -> None:
+        pass                              # single process: HEAL_EVENTS is the report
+
+
+def _write_json(path: Path, heals: Dict[str, str]) -> None:
+    data = dict(heals)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(data, indent=2))
+    os.replace(tmp, path)
+
+
+# ─── shared backend for parallel workers ─────────────────────────────────
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS heals  (orig TEXT PRIMARY KEY, new TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS failed (orig TEXT PRIMARY KEY, url TEXT NOT NULL, ts REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS events (orig TEXT, new TEXT, score INTEGER, worker TEXT);
+CREATE TABLE IF NOT EXISTS meta   (key TEXT PRIMARY KEY);
+"""
+
+
+class SharedLocatorCache:
+    def __init__(self, db: Path, path: Path, negative_ttl: float = NEGATIVE_TTL):
+        self.db           = Path(db)
+        self.path         = Path(path)    # locator_cache.json: seeds the db, receives export()
+        self.negative_ttl = negative_ttl
+        self._hits: Dict[str, str] = {}   # positive entries never change within a run
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is not None:
+            return self._conn
+        conn = sqlite3.connect(self.db, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        conn.execute("BEGIN IMMEDIATE")   # first process in seeds from the JSON file
+        if conn.execute("INSERT OR IGNORE INTO meta VALUES ('seeded')").rowcount:
+            heals, _ = LocatorCache(self.path, self.negative_ttl).snapshot()
+            conn.executemany("INSERT OR IGNORE INTO heals VALUES (?, ?)", heals.items())
+        conn.execute("COMMIT")
+        self._conn = conn
+        return conn
+
+    def get(self, orig: str) -> Optional[str]:
+        if orig not in self._hits:
+            row = self._db().execute("SELECT new FROM heals WHERE orig = ?", (orig,)).fetchone()
+            if not row:
+                return None
+            self._hits[orig] = row[0]
+        return self._hits[orig]
+
+    def put(self, orig: str, new: str) -> None:
+        db = self._db()
+        db.execute("INSERT OR REPLACE INTO heals VALUES (?, ?)", (orig, new))
+        db.execute("DELETE FROM failed WHERE orig = ?", (orig,))
+        self._hits[orig] = new
+
+    def is_failed(self, orig: str, url: str) -> bool:
+        row = self._db().execute("SELECT url, ts FROM failed WHERE orig = ?", (orig,)).fetchone()
+        return bool(row) and row[0] == url and time.time() - row[1] < self.negative_ttl
+
+    def mark_failed(self, orig: str, url: str) -> None:
+        self._db().execute("INSERT OR REPLACE INTO failed VALUES (?, ?, ?)", (orig, url, time.time()))
+
+    def log_heal(self, orig: str, new: str, score: int) -> None:
+        worker = os.getenv("PYTEST_XDIST_WORKER", "main")
+        self._db().execute("INSERT INTO events VALUES (?, ?, ?, ?)", (orig, new, score, worker))
+
+    def flush(self) -> None:
+        pass                              # write-through, nothing buffered
+
+    # ─── controller side ─────────────────────────────────────────────────
+    def events(self) -> List[Tuple[str, str, int]]:
+        """Heal report merged from every worker, one row per (orig, new)."""
+        return self._db().execute(
+            "SELECT orig, new, MAX(score) FROM events GROUP BY orig, new ORDER BY MIN(rowid)"
+        ).fetchall()
+
+    def export(self) -> None:
+        """Write the shared heals back to locator_cache.json (atomic; negatives stay behind)."""
+        heals = dict(self._db().execute("SELECT orig, new FROM heals ORDER BY rowid"))
+        if heals or self.path.exists():
+            _write_json(self.path, heals)
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def open_cache(path: Path):
+    """JSON cache for a single process; SQLite when HEAL_CACHE_DB points at a shared db."""
+    db = os.getenv("HEAL_CACHE_DB")
+    return SharedLocatorCache(Path(db), path) if db else LocatorCache(path)
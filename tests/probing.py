@@ -0,0 +1,63 @@
+"""
+Fail-fast selector probing.
+• count() the original selector before acting; no match on a settled page
+  (plus a short grace for late JS inserts) ➜ heal right away, no 2 s timeout
+• per-selector action timeouts adapt to the slowest action seen this session;
+  when one expires while the selector still matches, the action is retried
+  with DEFAULT_TIMEOUT before healing (slow is not broken: a heal could pick
+  a different element and that mapping would be cached)
+• only HEALED_ACTIONS (fill, select_option) are probed, timed out and
+  healed; is_visible() asks about the original selector as written, so an
+  absent element is simply not visible (negative assertions keep working)
+• tracks how much timeout wait was skipped, for the session summary
+"""
+
+import os
+from typing import Dict
+from playwright.sync_api import Page, Error as PWError
+
+PROBE_ENABLED   = os.getenv("HEAL_PROBE", "1") != "0"
+DEFAULT_TIMEOUT = 2_000                   # ms, the old fixed wait
+MIN_TIMEOUT     = 500                     # ms, adaptive floor
+GRACE_TIMEOUT   = 150                     # ms, wait for late inserts before healing
+HEADROOM        = 3                       # adaptive timeout = 3 × slowest seen
+HEALED_ACTIONS  = frozenset({"fill", "select_option"})
+
+
+class ProbeStats:
+    def __init__(self):
+        self.slowest: Dict[str, float] = {}   # selector -> slowest successful action (ms)
+        self.skipped  = 0                     # broken selectors healed without waiting
+        self.saved_ms = 0.0
+
+    def timeout_for(self, selector: str) -> int:
+        seen = self.slowest.get(selector)
+        if seen is None:
+            return DEFAULT_TIMEOUT
+        return int(min(DEFAULT_TIMEOUT, max(MIN_TIMEOUT, HEADROOM * seen)))
+
+    def record(self, selector: str, ms: float) -> None:
+        self.slowest[selector] = max(ms, self.slowest.get(selector, 0.0))
+
+    def record_skip(self, selector: str, spent_ms: float) -> None:
+        self.skipped  += 1
+        self.saved_ms += max(0.0, self.timeout_for(selector) - spent_ms)
+
+
+PROBES = ProbeStats()
+
+
+def is_settled(page: Page) -> bool:
+    """Document finished loading (no pending parse/navigation)."""
+    try:
+        return page.evaluate("document.readyState") == "complete"
+    except PWError:
+        return False                      # navigating / context gone → not settled
+
+
+async def is_settled_async(page) -> bool:
+    """is_settled() for an async Page."""
+    try:
+        return await page.evaluate("document.readyState") == "complete"
+    except PWError:
+        return False
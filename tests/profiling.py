@@ -0,0 +1,82 @@
+"""
+Opt-in action profiler for the patched Page/Locator layer.
+• enable with  pytest --profile-actions[=action_profile.json]
+• records latency per action (fill, select_option, is_visible, goto,
+  expect_navigation, wait_for_selector), per selector/URL and per test
+• timeouts that expired before a heal are recorded as "timeout-wait"
+• summary(): hottest selectors, slowest single waits, slowest tests
+"""
+
+import json, os, time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Optional
+
+DEFAULT_PROFILE = "action_profile.json"
+
+
+class ActionProfiler:
+    def __init__(self):
+        self.enabled = False
+        self.path: Optional[Path] = None
+        self.records: List[dict] = []
+
+    def enable(self, path: str) -> None:
+        self.enabled, self.path = True, Path(path)
+
+    def record(self, kind: str, target: str, ms: float) -> None:
+        if self.enabled:
+            test = os.getenv("PYTEST_CURRENT_TEST", "").rsplit(" ", 1)[0]
+            self.records.append({"test": test, "kind": kind, "target": target, "ms": round(ms, 2)})
+
+    @contextmanager
+    def measure(self, kind: str, target: str):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(kind, target, (time.perf_counter() - start) * 1000)
+
+    # ─── reporting ───────────────────────────────────────────────────────
+    def summary(self, top: int = 10) -> dict:
+        by_target = defaultdict(lambda: {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "kinds": set()})
+        by_test = defaultdict(float)
+        for r in self.records:
+            t = by_target[r["target"]]
+            t["count"] += 1
+            t["total_ms"] += r["ms"]
+            t["max_ms"] = max(t["max_ms"], r["ms"])
+            t["kinds"].add(r["kind"])
+            by_test[r["test"]] += r["ms"]
+        hottest = sorted(by_target.items(), key=lambda kv: -kv[1]["total_ms"])[:top]
+        return {
+            "actions": len(self.records),
+            "total_ms": round(sum(r["ms"] for r in self.records), 2),
+            "hottest_selectors": [
+                {"target": k, "count": v["count"], "total_ms": round(v["total_ms"], 2),
+                 "max_ms": round(v["max_ms"], 2), "kinds": sorted(v["kinds"])}
+                for k, v in hottest
+            ],
+            "slowest_waits": sorted(self.records, key=lambda r: -r["ms"])[:top],
+            "slowest_tests": [
+                {"test": k, "total_ms": round(v, 2)}
+                for k, v in sorted(by_test.items(), key=lambda kv: -kv[1])[:top]
+            ],
+        }
+
+    def dump(self) -> Optional[Path]:
+        if not self.enabled:
+            return None
+        path = self.path
+        worker = os.getenv("PYTEST_XDIST_WORKER")
+        if worker:                        # one profile per xdist worker
+            path = path.with_name(f"{path.stem}.{worker}{path.suffix}")
+        path.write_text(json.dumps({"summary": self.summary(), "records": self.records}, indent=2))
+        return path
+
+
+PROFILER = ActionProfiler()
@@ -0,0 +1,188 @@
+"""
+Selector registry loader.
+• parses selector_registry.json once and indexes it:
+    selector → class          (first route that lists it wins, like the old scan)
+    route    → {selector → class}
+• compact layout: a route's controls are split into blocks (the crawler tags
+  each entry with its form / nav / header … ancestor), each distinct block is
+  stored (and indexed) once and routes reference their blocks by id; the old
+  {route: [entries]} layout still loads
+• LazyRegistry defers reading the file to the first lookup
+• classify() is the single element classifier shared by the crawler and healer
+• diff_routes() reports added / removed / renamed selectors between two registries
+"""
+
+import hashlib, json
+from pathlib import Path
+from typing import Dict, List, Optional
+from rapidfuzz import fuzz, process
+
+
+def classify(el) -> str:
+    """Coarse element class (input.text, button.submit, …) for a bs4 tag."""
+    return class_for(el.name, el.get("type"))
+
+
+def class_for(tag: str, type_: Optional[str]) -> str:
+    """Same as classify(), from a tag name and raw type attribute (None = absent)."""
+    if tag == "input":
+        input_type = ("text" if type_ is None else type_).lower()   # text, number, …
+        return f"input.{input_type}"
+    if tag == "button":
+        return "button.submit" if (type_ or "").lower() == "submit" else "button"
+    return tag    # textarea, select, a, …
+
+
+# ─── compact on-disk format ──────────────────────────────────────────────
+#   {"format": 2,
+#    "groups": {"<id>": [{"selector", "class", "block"}, …], …},   each distinct block once
+#    "routes": {"<route>": ["<id>", …], …}}                 a route = its blocks, in order
+# "block" (optional) names the entry's container, e.g. "nav", "form#add_form"; entries
+# without one form a single block per route.
+# The legacy layout ({"<route>": [entries…]}) is still read everywhere.
+COMPACT_FORMAT = 2
+
+
+def group_id(entries: List[dict]) -> str:
+    """Content address of an entry list: the same controls always get the same id."""
+    return hashlib.sha1(json.dumps(entries, sort_keys=True).encode()).hexdigest()[:10]
+
+
+def blocks(entries: List[dict]) -> List[List[dict]]:
+    """Consecutive runs of entries sharing a "block" (the shared nav, one form …)."""
+    out: List[List[dict]] = []
+    for e in entries:
+        if out and out[-1][-1].get("block") == e.get("block"):
+            out[-1].append(e)
+        else:
+            out.append([e])
+    return out
+
+
+def encode(routes: Dict[str, List[dict]]) -> dict:
+    """Legacy {route: entries} → compact form; identical blocks are stored once."""
+    groups, refs = {}, {}
+    for route, entries in routes.items():
+        refs[route] = []
+        for block in blocks(entries):
+            gid = group_id(block)
+            groups.setdefault(gid, block)
+            refs[route].append(gid)
+    return {"format": COMPACT_FORMAT, "groups": groups, "routes": refs}
+
+
+def decode(data: dict) -> Dict[str, List[dict]]:
+    """Either layout → legacy {route: entries}."""
+    if data.get("format") != COMPACT_FORMAT:
+        return data
+    groups = data["groups"]
+    return {route: [e for gid in gids for e in groups[gid]] for route, gids in data["routes"].items()}
+
+
+def load_routes(path: Path) -> Dict[str, List[dict]]:
+    """{route: entries} from a registry file in either layout ({} if missing)."""
+    path = Path(path)
+    return decode(json.loads(path.read_text())) if path.exists() else {}
+
+
+class SelectorRegistry:
+    def __init__(self, data: dict):
+        compact = data if data.get("format") == COMPACT_FORMAT else encode(data)
+        self._groups: Dict[str, List[dict]]       = compact["groups"]
+        self._route_groups: Dict[str, List[str]]  = compact["routes"]
+        # indexes are built per group, so a form shared by N routes is indexed once
+        self._group_index: Dict[str, Dict[str, str]] = {}
+        for gid, items in self._groups.items():
+            index = self._group_index[gid] = {}
+            for it in items:
+                index.setdefault(it["selector"], it["class"])
+        self._by_selector: Dict[str, str] = {}
+        for gids in self._route_groups.values():
+            for gid in gids:
+                for sel, cls in self._group_index[gid].items():
+                    self._by_selector.setdefault(sel, cls)
+
+    @classmethod
+    def load(cls, path: Path) -> "SelectorRegistry":
+        path = Path(path)
+        return cls(json.loads(path.read_text()) if path.exists() else {})
+
+    def class_of(self, selector: str, route: Optional[str] = None) -> Optional[str]:
+        """Class of *selector*, preferring the entry recorded for *route*."""
+        if route is not None:
+            for gid in self._route_groups.get(route, ()):
+                cls = self._group_index[gid].get(selector)
+                if cls:
+                    return cls
+        return self._by_selector.get(selector)
+
+    def entries(self, route: str) -> List[dict]:
+        gids = self._route_groups.get(route, [])
+        if len(gids) == 1:
+            return self._groups[gids[0]]
+        return [e for gid in gids for e in self._groups[gid]]
+
+    def routes(self) -> List[str]:
+        return list(self._route_groups)
+
+    def __len__(self) -> int:
+        return sum(len(self._groups[gid]) for gids in self._route_groups.values() for gid in gids)
+
+
+class LazyRegistry:
+    """SelectorRegistry that reads *path* on first use (first heal), not at import."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._registry: Optional[SelectorRegistry] = None
+
+    def _get(self) -> SelectorRegistry:
+        if self._registry is None:
+            self._registry = SelectorRegistry.load(self.path)
+        return self._registry
+
+    def class_of(self, selector: str, route: Optional[str] = None) -> Optional[str]:
+        return self._get().class_of(selector, route)
+
+    def entries(self, route: str) -> List[dict]:
+        return self._get().entries(route)
+
+    def routes(self) -> List[str]:
+        return self._get().routes()
+
+    def __len__(self) -> int:
+        return len(self._get())
+
+
+# ─── registry diff (used by the incremental crawler) ─────────────────────
+RENAME_CUTOFF = 60                        # same threshold the healer uses
+
+
+def diff_entries(old: List[dict], new: List[dict]) -> dict:
+    """
+    Added / removed / renamed selectors between two entry lists of one route.
+    A rename is a removed + added pair of the same class whose names fuzzy-match.
+    """
+    old_cls = {e["selector"]: e["class"] for e in old}
+    new_cls = {e["selector"]: e["class"] for e in new}
+    removed = [s for s in old_cls if s not in new_cls]
+    added   = [s for s in new_cls if s not in old_cls]
+    renamed = []
+    for sel in list(removed):
+        same_class = [a for a in added if new_cls[a] == old_cls[sel]]
+        match = process.extractOne(sel, same_class, scorer=fuzz.WRatio, score_cutoff=RENAME_CUTOFF)
+        if match:
+            renamed.append({"from": sel, "to": match[0], "class": old_cls[sel], "score": int(match[1])})
+            removed.remove(sel)
+            added.remove(match[0])
+    return {"added": added, "removed": removed, "renamed": renamed}
+
+
+def diff_routes(old: Dict[str, List[dict]], new: Dict[str, List[dict]]) -> Dict[str, dict]:
+    """Per-route change list; routes without changes are left out."""
+    changes = {}
+    for route in list(new) + [r for r in old if r not in new]:
+        d = diff_entries(old.get(route, []), new.get(route, []))
+        if d["added"] or d["removed"] or d["renamed"]:
+            changes[route] = d
+    return changes
@@ -0,0 +1,197 @@
+"""
+Batched heal scoring engine.
+• candidate keys are built once per DOM snapshot (CandidateSet)
+• every broken selector in a batch is scored with one rapidfuzz cdist call per
+  scorer: WRatio for the id/name/data-testid phases, partial_ratio (+ registry
+  class boost, as an array op) for the fallback phase
+• results are ranked per selector: phase priority first, then score; the first
+  entry is what the old three-pass fuzzy_find would have picked
+• compound selectors ("#popup button", "tbody tr:has-text('x') #amount") are
+  split at their top-level combinators: the last part is what gets matched,
+  the ancestor prefixes are the subtrees to search first (split_compound)
+"""
+
+import os, re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+import numpy as np
+from rapidfuzz import fuzz, process
+from tests.registry import class_for
+
+CLASS_BOOST  = 10                                   # bump when tag+type match the registry
+HEAL_WORKERS = int(os.getenv("HEAL_WORKERS", "-1"))  # cdist threads, -1 = all cores
+PHASES = ("id", "name", "data-testid", "fallback")  # priority order
+
+
+class Match(NamedTuple):
+    selector: str
+    score: int
+    phase: str
+
+
+class HealResult(NamedTuple):
+    orig: str
+    ranked: List[Match]        # top-k, ≥ threshold, best first
+    best_score: int            # best score seen in any phase (for error messages)
+    candidates: int            # records considered for this selector
+
+    @property
+    def best(self) -> Optional[Match]:
+        return self.ranked[0] if self.ranked else None
+
+
+def _key(text: str) -> str:
+    return re.sub(r"\W+", "", text)
+
+
+# ─── compound selectors ──────────────────────────────────────────────────
+_COMBINATOR = re.compile(r"\s*(>>|[>+~])\s*|\s+")
+SCOPING     = {" ", ">", ">>"}             # the left side is an ancestor of the right side
+
+
+def _combinators(selector: str) -> Optional[List[tuple]]:
+    """(start, end, combinator) at bracket/paren/quote depth 0; None for a selector list."""
+    out, depth, quote, i = [], 0, None, 0
+    while i < len(selector):
+        ch = selector[i]
+        if quote:
+            quote = None if ch == quote else quote
+        elif ch in "'\"":
+            quote = ch
+        elif ch in "[(":
+            depth += 1
+        elif ch in "])":
+            depth -= 1
+        elif depth == 0 and ch == ",":
+            return None
+        elif depth == 0 and (ch.isspace() or ch in ">+~"):
+            m = _COMBINATOR.match(selector, i)
+            out.append((m.start(), m.end(), m.group(1) or " "))
+            i = m.end()
+            continue
+        i += 1
+    return out
+
+
+def split_compound(selector: str) -> Tuple[List[str], str]:
+    """
+    (ancestor scopes, longest first; last compound part).
+    "#popup form > input#amount" → (["#popup form", "#popup"], "input#amount");
+    sibling combinators (+ ~) never start a scope, selector lists are not split.
+    """
+    selector = selector.strip()
+    bounds = _combinators(selector)
+    if not bounds:
+        return [], selector
+    scopes = [selector[:start] for start, _, comb in reversed(bounds) if comb in SCOPING]
+    return scopes, selector[bounds[-1][1]:]
+
+
+def within(result: "HealResult", scope: str) -> "HealResult":
+    """*result* with every match prefixed by *scope* (it was scored inside that subtree)."""
+    return result._replace(ranked=[m._replace(selector=f"{scope} {m.selector}") for m in result.ranked])
+
+
+def extract_attr(orig_css: str):
+    """
+    If the last compound part of orig_css has an #id or a name="…",
+    return ("id", value) or ("name", value). Otherwise (None, None).
+    """
+    _, target = split_compound(orig_css)
+    m = re.search(r"#([\w\-]+)", target)
+    if m:
+        return "id", m.group(1)
+    m = re.search(r"name=['\"]([\w\-]+)['\"]", target)
+    if m:
+        return "name", m.group(1)
+    return None, None
+
+
+def fallback_selector(rec: dict) -> str:
+    selector = rec["tag"]
+    classes  = (rec.get("cls") or "").split()     # class=" " is no class at all
+    if rec["id"]:
+        selector += f"#{rec['id']}"
+    elif classes:
+        selector += f".{classes[0]}"
+    return selector
+
+
+class CandidateSet:
+    """Keys + selectors for one DOM snapshot, built once and reused per batch."""
+
+    def __init__(self, records: Sequence[dict], fallback_tags: Iterable[str]):
+        tags = set(fallback_tags)
+        self.size = len(records)
+        # phase 1/2 choices: (value, healed selector, phase) in one flat list
+        self.attr_values: List[str] = []
+        self.attr_sels:   List[str] = []
+        self.attr_phase:  List[str] = []
+        for phase, field, fmt in (("id", "id", "#{}"),
+                                  ("name", "name", '[name="{}"]'),
+                                  ("data-testid", "testid", '[data-testid="{}"]')):
+            for r in records:
+                if r[field]:
+                    self.attr_values.append(r[field])
+                    self.attr_sels.append(fmt.format(r[field]))
+                    self.attr_phase.append(phase)
+        self.attr_phase_arr = np.array(self.attr_phase, dtype=object)
+        # fallback choices
+        fb = [r for r in records if r["tag"] in tags]
+        self.fb_keys  = [_key(r["id"] or r["name"] or r["text"] or "") for r in fb]
+        self.fb_sels  = [fallback_selector(r) for r in fb]
+        self.fb_class = np.array([class_for(r["tag"], r["type"]) for r in fb], dtype=object)
+
+
+def score_batch(
+    cands: CandidateSet,
+    selectors: Sequence[str],
+    thresh: int,
+    wanted_classes: Optional[Sequence[Optional[str]]] = None,
+    k: int = 5,
+    workers: int = HEAL_WORKERS,
+) -> List[HealResult]:
+    """Score every selector in *selectors* against one candidate set."""
+    n = len(selectors)
+    wanted = list(wanted_classes) if wanted_classes is not None else [None] * n
+    attrs  = [extract_attr(s) for s in selectors]
+    keys   = [_key(split_compound(s)[1]) for s in selectors]
+
+    # ── phase 1 + 2: one WRatio matrix, queries stacked as [targets…, keys…] ──
+    attr_scores = np.zeros((2 * n, len(cands.attr_values)), dtype=np.float32)
+    if cands.attr_values:
+        queries = [t or "" for _, t in attrs] + keys
+        attr_scores = process.cdist(queries, cands.attr_values, scorer=fuzz.WRatio,
+                                    dtype=np.float32, workers=workers)
+
+    # ── fallback: one partial_ratio matrix + registry boost ─────────────────
+    fb_scores = np.zeros((n, len(cands.fb_keys)), dtype=np.float32)
+    if cands.fb_keys:
+        fb_scores = process.cdist(keys, cands.fb_keys, scorer=fuzz.partial_ratio,
+                                  dtype=np.float32, workers=workers)
+        boost = cands.fb_class[None, :] == np.array(wanted, dtype=object)[:, None]
+        fb_scores = fb_scores + CLASS_BOOST * boost
+
+    results = []
+    for i, orig in enumerate(selectors):
+        attr, _ = attrs[i]
+        per_phase: Dict[str, tuple] = {}
+        if cands.attr_values:
+            # phase 1 only looks at the attribute family the selector used
+            if attr:
+                mask = cands.attr_phase_arr == attr
+                per_phase[attr] = (np.where(mask, attr_scores[i], 0), cands.attr_sels)
+            mask = cands.attr_phase_arr == "data-testid"
+            per_phase["data-testid"] = (np.where(mask, attr_scores[n + i], 0), cands.attr_sels)
+        if cands.fb_keys:
+            per_phase["fallback"] = (fb_scores[i], cands.fb_sels)
+
+        ranked, best_score = [], 0
+        for phase in PHASES:
+            if phase not in per_phase:
+                continue
+            row, sels = per_phase[phase]
+            best_score = max(best_score, int(row.max(initial=0)))
+            order = np.argsort(-row, kind="stable")[:k]   # stable → first best wins, like extractOne
+            ranked += [Match(sels[j], int(row[j]), phase) for j in order if row[j] >= thresh]
+        results.append(HealResult(orig, ranked[:k], best_score, cands.size))
+    return results
@@ -0,0 +1,194 @@
+"""
+Duration-aware sharding and scheduling.
+• sharded runs (and --record-durations / HEAL_RECORD_DURATIONS=1) record
+  setup + call + teardown time per test in .test_durations.json (smoothed
+  with earlier runs, newest entry wins on merge); plain runs write nothing
+• --num-shards N --shard-id K keeps shard K of N, balanced on that history
+  (greedy longest-first), everything else is deselected
+• tests depending on an expensive session fixture (GROUP_FIXTURES: the login
+  state, also behind logged_in_page / txn_factory) form one unit and stay on
+  one shard / xdist worker, whatever other fixtures they use
+  (pytest -n … --dist loadgroup); a unit bigger than its fair share is split
+• units run slowest first, so the long tail does not start last
+• tests without history are estimated at DEFAULT_S (new tests are usually E2E)
+• CLI:  python -m tests.sharding merge <out> <in>…   (matrix shard files → one)
+        python -m tests.sharding show [--top 10] [path]
+"""
+
+import argparse, heapq, json, os, sys, time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+DURATIONS_PATH = Path(os.getenv("HEAL_DURATIONS", ".test_durations.json"))
+RECORD         = os.getenv("HEAL_RECORD_DURATIONS") == "1"
+GROUP_FIXTURES = ("auth_state",)          # most expensive first; the first one used names the group
+DEFAULT_S      = 1.0                      # estimate for a test without history
+SMOOTHING      = 0.5                      # weight of the newest run
+
+
+# ─── history ─────────────────────────────────────────────────────────────
+def load(path: Path) -> Dict[str, dict]:
+    """{nodeid: {"s": seconds, "ts": last update}} ({} if missing or unreadable)."""
+    try:
+        return json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def save(path: Path, history: Dict[str, dict]) -> None:
+    path = Path(path)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(dict(sorted(history.items())), indent=1))
+    os.replace(tmp, path)
+
+
+def update(history: Dict[str, dict], measured: Dict[str, float]) -> Dict[str, dict]:
+    now = round(time.time(), 3)
+    out = dict(history)
+    for nodeid, s in measured.items():
+        old = history.get(nodeid)
+        value = s if old is None else SMOOTHING * s + (1 - SMOOTHING) * old["s"]
+        out[nodeid] = {"s": round(value, 3), "ts": now}
+    return out
+
+
+def merge(histories: List[Dict[str, dict]]) -> Dict[str, dict]:
+    out: Dict[str, dict] = {}
+    for h in histories:
+        for nodeid, rec in h.items():
+            if nodeid not in out or rec["ts"] > out[nodeid]["ts"]:
+                out[nodeid] = rec
+    return out
+
+
+# ─── planning ────────────────────────────────────────────────────────────
+class Unit:
+    """Tests that must run in one place, with their estimated cost."""
+    def __init__(self, key: str, items: List):
+        self.key, self.items, self.cost = key, items, 0.0
+
+
+def _estimate(history: Dict[str, dict]):
+    return lambda nodeid: history[nodeid]["s"] if nodeid in history else DEFAULT_S
+
+
+def _affinity(item) -> Optional[str]:
+    # fixturenames is the full closure: logged_in_page / txn_factory pull in auth_state
+    used = set(getattr(item, "fixturenames", ()))
+    return next((name for name in GROUP_FIXTURES if name in used), None)
+
+
+def units(items: List, history: Dict[str, dict], n: int) -> List[Unit]:
+    """Group by shared fixture, split groups above total / n, slowest first."""
+    cost_of = _estimate(history)
+    total = sum(cost_of(i.nodeid) for i in items) or 1.0
+    cap = total / max(1, n)
+    groups: Dict[Optional[str], List] = defaultdict(list)
+    for item in items:
+        groups[_affinity(item)].append(item)
+
+    out: List[Unit] = []
+    for key, members in groups.items():
+        members = sorted(members, key=lambda i: -cost_of(i.nodeid))
+        if key is None:                   # no shared fixture: every test is its own unit
+            for item in members:
+                u = Unit(item.nodeid, [item])
+                u.cost = cost_of(item.nodeid)
+                out.append(u)
+            continue
+        chunk = Unit(f"{key}#0", [])
+        for item in members:
+            c = cost_of(item.nodeid)
+            if chunk.items and chunk.cost + c > cap:
+                out.append(chunk)
+                chunk = Unit(f"{key}#{len(out)}", [])
+            chunk.items.append(item)
+            chunk.cost += c
+        out.append(chunk)
+    return sorted(out, key=lambda u: -u.cost)
+
+
+def assign(unit_list: List[Unit], n: int) -> List[List[Unit]]:
+    """Greedy longest-processing-time: next biggest unit → least loaded shard."""
+    shards: List[List[Unit]] = [[] for _ in range(n)]
+    heap: List[Tuple[float, int]] = [(0.0, k) for k in range(n)]
+    for u in sorted(unit_list, key=lambda u: -u.cost):
+        load_, k = heapq.heappop(heap)
+        shards[k].append(u)
+        heapq.heappush(heap, (load_ + u.cost, k))
+    return shards
+
+
+# ─── pytest plugin ───────────────────────────────────────────────────────
+class ShardingPlugin:
+    def __init__(self, config):
+        self.config    = config
+        self.path      = Path(config.getoption("--durations-path") or DURATIONS_PATH)
+        self.num       = config.getoption("--num-shards") or 1
+        self.shard_id  = config.getoption("--shard-id") or 0
+        self.history   = load(self.path)
+        self.record    = self.num > 1 or RECORD or config.getoption("--record-durations")
+        self.measured: Dict[str, float] = defaultdict(float)
+        if not 0 <= self.shard_id < self.num:
+            raise ValueError(f"--shard-id must be in [0, {self.num})")
+
+    def pytest_collection_modifyitems(self, session, config, items):
+        workers = getattr(config.option, "numprocesses", None) or 1
+        plan = units(items, self.history, self.num * workers if isinstance(workers, int) else self.num)
+        if self.num > 1:
+            shards = assign(plan, self.num)
+            plan = shards[self.shard_id]
+            keep = {id(i) for u in plan for i in u.items}
+            dropped = [i for i in items if id(i) not in keep]
+            if dropped:
+                config.hook.pytest_deselected(items=dropped)
+        if getattr(config.option, "dist", None) == "loadgroup":
+            import pytest
+            for u in plan:
+                if len(u.items) > 1:
+                    for item in u.items:
+                        item.add_marker(pytest.mark.xdist_group(name=u.key))
+        items[:] = [i for u in sorted(plan, key=lambda u: -u.cost) for i in u.items]
+
+    def pytest_runtest_logreport(self, report):
+        if not self.record or hasattr(self.config, "workerinput"):
+            return                        # xdist: the controller sees every report too
+        self.measured[report.nodeid] += report.duration
+
+    def pytest_sessionfinish(self, session):
+        if hasattr(self.config, "workerinput") or not self.measured:
+            return
+        save(self.path, update(load(self.path), self.measured))
+
+    def pytest_report_header(self, config):
+        if self.num > 1:
+            return f"sharding: shard {self.shard_id + 1}/{self.num}, history {self.path} ({len(self.history)} tests)"
+
+
+# ─── CLI ─────────────────────────────────────────────────────────────────
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Test duration history")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    m = sub.add_parser("merge", help="merge per-shard histories, newest entry wins")
+    m.add_argument("out", type=Path)
+    m.add_argument("inputs", type=Path, nargs="+")
+    s = sub.add_parser("show", help="slowest tests in a history file")
+    s.add_argument("path", type=Path, nargs="?", default=DURATIONS_PATH)
+    s.add_argument("--top", type=int, default=10)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "merge":
+        merged = merge([load(p) for p in [args.out, *args.inputs]])
+        save(args.out, merged)
+        print(f"{len(merged)} tests → {args.out}")
+        return 0
+    history = load(args.path)
+    for nodeid, rec in sorted(history.items(), key=lambda kv: -kv[1]["s"])[:args.top]:
+        print(f"{rec['s']:8.2f} s  {nodeid}")
+    print(f"{len(history)} tests, {sum(r['s'] for r in history.values()):.1f} s total")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,64 +1,62 @@
 """
 Self-healing locator helper.
-• fast-path: if orig selector already mapped in locator_cache.json ➜ return it
+• fast-path: if orig selector already mapped in locator_cache.json ➜ return it;
+  compound selectors ("select#payment_method", "#popup #amount") also hit the
+  entry of their bare #id / [name="…"] key (heal-ahead and earlier heals)
+• fail-fast: if orig selector already failed to heal on this page ➜ raise
 • slow-path: fuzzy-scan DOM, cache the mapping, log the heal
+• compound selectors ("#popup button", "tbody tr:has-text('x') #qty") are healed
+  inside the subtree of their surviving ancestor part first (innermost scope
+  that resolves and yields a match); the whole-document scan is the fallback
+• HEAL_SNAPSHOTS=<dir>: keep the scanned DOM for offline replay (tests/snapshots.py)
+• async pages: tests/async_smart_locator.py, same cache and scoring (_rank/_commit)
 """
 
-import sys, json, re
+import os, re, sys, time
 from pathlib import Path
-from typing import List, Tuple
+from urllib.parse import urlparse
+from typing import Dict, List, Sequence, Tuple
 from rich.console import Console          # show HEAL logs in CI and local
-from playwright.sync_api import Page, Locator
-from rapidfuzz import fuzz, process
-from bs4 import BeautifulSoup
-
-# ---Adding a small helper to detect “id” vs “name”-----------------
-
-def _extract_attr(orig_css: str):
-    """
-    If orig_css contains an #id or a name="…", return ("id", value) or ("name", value).
-    Otherwise (None, None).
-    """
-    m = re.search(r"#([\w\-]+)", orig_css)
-    if m:
-        return "id", m.group(1)
-    m = re.search(r"name=['\"]([\w\-]+)['\"]", orig_css)
-    if m:
-        return "name", m.group(1)
-    return None, None
-# ____________________________________________________________
+from playwright.sync_api import Page, Locator, Error as PWError
+from tests.locator_cache import open_cache
+from tests.registry import LazyRegistry, classify
+from tests.candidates import EXTRACT_MODE, Extractor
+from tests.scoring import (CandidateSet, HealResult, extract_attr as _extract_attr, score_batch,
+                           split_compound, within)
+from tests.telemetry import TELEMETRY
+from tests.snapshots import SNAPSHOTS
 
 console = Console(file=sys.stdout)        # stream to stdout so GitHub Actions captures it
-CACHE = Path("locator_cache.json")
+CACHE = open_cache(Path("locator_cache.json"))     # JSON (flushed at session end) or shared SQLite
 
 # Only consider form controls (keeps noise low)
 ALLOWED_TAGS = ["input", "textarea", "select"]
+HEAL_TAGS    = {"input", "textarea", "select", "button"}   # tag selectors worth healing
 DEFAULT_THRESHOLD = 60                    # 60 ≈ typo/abbrev tolerance
 
 # ─── per-run store: (orig, new, score) ─────────────────────────────────────────
 HEAL_EVENTS: List[Tuple[str, str, int]] = []
+_LOGGED: set = set()                      # (orig, new) already in HEAL_EVENTS
 
 # ───registry + classifier helpers ──────────────────────────
-REGISTRY = json.loads(Path("selector_registry.json").read_text()) # <- loads once
+# repo-root path (not CWD); read + indexed on the first heal, not at import
+REGISTRY_PATH = Path(os.getenv("HEAL_REGISTRY") or Path(__file__).resolve().parents[1] / "selector_registry.json")
+REGISTRY = LazyRegistry(REGISTRY_PATH)
 
 #---Score‑boost using class, if registry says broken selector is input.number, 
 #----prefer candidates with the same type/tag even if their raw fuzzy score is a lower---
-def _registry_class(sel: str) -> str | None:
+def _registry_class(sel: str, route: str | None = None) -> str | None:
     """Return the stored class (input.text, button.submit, …) for a selector."""
-    for _, items in REGISTRY.items():
-        for it in items:
-            if it["selector"] == sel:
-                return it["class"]
-    return None
-
-def _bs4_class(el) -> str:
-    """Same classifier logic we used in the crawler."""
-    if el.name == "input":
-        t = el.get("type", "text").lower()
-        return f"input.{t}"
-    if el.name == "button":
-        return "button.submit" if el.get("type", "").lower() == "submit" else "button"
-    return el.name
+    return REGISTRY.class_of(sel, route)
+
+_bs4_class = classify                     # same classifier logic we used in the crawler
+
+def should_heal(selector: str) -> bool:
+    """Only #id / name= selectors and form-control tag selectors are healed."""
+    if "#" in selector or "name=" in selector:
+        return True
+    m = re.match(r"(\w+)", selector)
+    return bool(m and m.group(1).lower() in HEAL_TAGS)
 # ─────────────────────────────────────────────────────────────────
 
 def fuzzy_find(page: Page, orig_css: str, thresh: int = DEFAULT_THRESHOLD) -> Locator:
@@ -67,81 +65,158 @@ def fuzzy_find(page: Page, orig_css: str, thresh: int = DEFAULT_THRESHOLD) -> Lo
     Healed mappings are cached; subsequent runs use the cache immediately.
     """
 # ① fast-path ────────────────────────────────────────────────────────────
-    if CACHE.exists():
-        cache = json.loads(CACHE.read_text())
-        if orig_css in cache:
-            return page.locator(cache[orig_css])
+    cached = _cached(orig_css)
+    if cached:
+        return page.locator(cached)
+    if CACHE.is_failed(orig_css, page.url):
+        raise ValueError(
+            f"No fuzzy match for selector '{orig_css}' (known broken on {page.url}, scan skipped)"
+        )
 
 # ② slow path: scan live DOM ────────────────────────────────────────────
-    soup = BeautifulSoup(page.content(), "html.parser")
-
-    # ―――――― Phase 1: ID/Name–only healing ――――――
-    attr, target = _extract_attr(orig_css)
-    if attr:
-        candidates = [tag[attr] for tag in soup.find_all(attrs={attr: True})]
-        if candidates:
-            healed_value, score, _ = process.extractOne(target, candidates, score_cutoff=thresh) or (None, 0, None)
-            if healed_value:
-                new_sel = f"#{healed_value}" if attr == "id" else f"[name=\"{healed_value}\"]"
-                _update_cache(orig_css, new_sel)
-                _log_once(orig_css, new_sel, int(score))
-                return page.locator(new_sel)
-
-    # ―――――― Phase 2: data-testid Fallback Healing ――――――
-    # If your app uses data-testid="<value>" on elements, heal to the closest one.
-    testids = [tag["data-testid"] for tag in soup.find_all(attrs={"data-testid": True})]
-    if testids:
-        # Compare against the cleaned orig_css key
-        orig_key = re.sub(r"\W+", "", orig_css)
-        match = process.extractOne(orig_key, testids, score_cutoff=thresh)
-        if match:
-            healed_value, score = match[0], int(match[1])
-            new_sel = f"[data-testid=\"{healed_value}\"]"
-            _update_cache(orig_css, new_sel)
-            _log_once(orig_css, new_sel, score)
-            return page.locator(new_sel)
-
-    # ―――――― Phase 1b: Original fuzzy-text/CLASS fallback ――――――
-    orig_key = re.sub(r"\W+", "", orig_css)
-    best_score, best_el = 0, None
-    for el in soup.find_all(ALLOWED_TAGS):
-        cand_text = el.get("id") or el.get("name") or el.get_text() or ""
-        cand_key  = re.sub(r"\W+", "", cand_text)
-        score     = fuzz.partial_ratio(orig_key, cand_key)
-
-        # ── registry‑aware boost ───────────────────────────────
-        wanted_cls = _registry_class(orig_css)      # from the helper you added
-        if wanted_cls and _bs4_class(el) == wanted_cls:
-            score += 10     # bump ~10 pts when tag+type match
-        # ───────────────────────────────────────────────────
-
-        if score > best_score:
-            best_score, best_el = score, el
-
-    if best_score >= thresh and best_el:
-        selector = best_el.name
-        if best_el.get("id"):
-            selector += f"#{best_el['id']}"
-        elif best_el.get("class"):
-            selector += f".{best_el['class'][0]}"
-
-        _update_cache(orig_css, selector)
-        _log_once(orig_css, selector, int(best_score))
-        return page.locator(selector)
-
-    raise ValueError(
-        f"No fuzzy match for selector '{orig_css}' (best score: {best_score})"
+    results, timings = _score(page, [orig_css], thresh)
+    return page.locator(_commit(page, results[0], timings))
+
+
+def heal_many(page: Page, selectors: Sequence[str], thresh: int = DEFAULT_THRESHOLD) -> Dict[str, Locator]:
+    """
+    Heal several broken selectors against one DOM snapshot in one batch.
+    Returns {orig: Locator} for the ones that healed; failures are marked in the cache.
+    """
+    healed, todo = {}, []
+    for sel in dict.fromkeys(selectors):
+        cached = _cached(sel)
+        if cached:
+            healed[sel] = page.locator(cached)
+        elif not CACHE.is_failed(sel, page.url):
+            todo.append(sel)
+    if not todo:
+        return healed
+    results, timings = _score(page, todo, thresh)
+    for result in results:
+        try:
+            healed[result.orig] = page.locator(_commit(page, result, timings))
+        except ValueError:
+            pass
+    return healed
+
+
+def _cached(orig_css: str) -> str | None:
+    """Cache entry for *orig_css*, else for the bare #id / [name] key of its last part."""
+    cached = CACHE.get(orig_css)
+    if cached:
+        return cached
+    attr, value = _extract_attr(orig_css)
+    key = {"id": f"#{value}", "name": f'[name="{value}"]'}.get(attr)
+    if key is None or key == orig_css:
+        return None
+    cached = CACHE.get(key)
+    scopes, _ = split_compound(orig_css)
+    return cached and (f"{scopes[0]} {cached}" if scopes else cached)
+
+
+def _score(page: Page, selectors: Sequence[str], thresh: int) -> Tuple[List[HealResult], dict]:
+    timings = {"batch": len(selectors)}
+    url     = page.url
+    reader  = Extractor(page, ALLOWED_TAGS, mode=EXTRACT_MODE,   # in-browser, HTML parse as
+                        timings=timings)                        # fallback; one read per scope
+    found: Dict[str, HealResult] = {}
+    scopes: Dict[str, str] = {}
+    pending = _scope_chains(selectors)
+    while pending:                        # ① innermost surviving ancestor first, one batch per scope
+        for scope, sels in _by_scope(pending).items():
+            for sel, result in _scoped(reader.records(scope), url, sels, scope, thresh, timings).items():
+                found[sel], scopes[sel] = result, scope
+        pending = _advance(pending, found)
+    rest = [sel for sel in selectors if sel not in found]
+    if rest:                              # ② whole document: plain selectors + scopes that missed
+        found.update(zip(rest, _rank(reader.records(), url, rest, thresh, timings)))
+    timings["scoped"] = len(scopes)
+    results = [found[sel] for sel in selectors]
+    if SNAPSHOTS.enabled:                 # opt-in: one extra page.content() per scan
+        try:
+            _capture(page.content(), url, selectors, results, thresh, [scopes.get(s) for s in selectors])
+        except PWError:
+            pass                          # page went away; the heal itself is unaffected
+    return results, timings
+
+
+def _scope_chains(selectors: Sequence[str]) -> Dict[str, List[str]]:
+    """{compound selector: its ancestor scopes, innermost first}."""
+    chains = {sel: split_compound(sel)[0] for sel in selectors}
+    return {sel: chain for sel, chain in chains.items() if chain}
+
+
+def _by_scope(pending: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """The scope each pending selector tries next → those selectors (one read + batch each)."""
+    groups: Dict[str, List[str]] = {}
+    for sel, chain in pending.items():
+        groups.setdefault(chain[0], []).append(sel)
+    return groups
+
+
+def _advance(pending: Dict[str, List[str]], found: Dict[str, HealResult]) -> Dict[str, List[str]]:
+    """Unhealed selectors move one ancestor out; exhausted chains drop to the global scan."""
+    return {sel: chain[1:] for sel, chain in pending.items() if sel not in found and len(chain) > 1}
+
+
+def _scoped(records: List[dict], url: str, selectors: Sequence[str], scope: str, thresh: int,
+            timings: dict) -> Dict[str, HealResult]:
+    """{selector: result} for the *selectors* that match inside *scope* (prefixed with it)."""
+    if not records:
+        return {}                         # scope did not resolve (or holds no candidates)
+    results = _rank(records, url, selectors, thresh, timings)
+    return {r.orig: within(r, scope) for r in results if r.best}
+
+
+def _wanted(selectors: Sequence[str], url: str) -> List[str | None]:
+    route = urlparse(url).path
+    return [_registry_class(sel, route) for sel in selectors]   # one index lookup per selector
+
+
+def _rank(records: List[dict], url: str, selectors: Sequence[str], thresh: int,
+          timings: dict) -> List[HealResult]:
+    """Pure scoring step (no page access): safe to run off the event loop."""
+    # ―――――― phases 1 (id/name), 2 (data-testid), 1b (fuzzy-text + CLASS boost) ――――――
+    start   = time.perf_counter()
+    results = score_batch(CandidateSet(records, ALLOWED_TAGS), selectors, thresh,
+                          _wanted(selectors, url))
+    timings["score_ms"] = timings.get("score_ms", 0.0) + (time.perf_counter() - start) * 1000
+    return results
+
+
+def _capture(html: str, url: str, selectors: Sequence[str], results: List[HealResult],
+             thresh: int, scopes: Sequence[str | None] | None = None) -> None:
+    SNAPSHOTS.capture(html, url, results, _wanted(selectors, url), thresh, ALLOWED_TAGS, scopes)
+
+
+def _commit(page, result: HealResult, timings: dict) -> str:
+    """Cache + log the winning match, or remember the failure and raise."""
+    best = result.best
+    TELEMETRY.record(
+        selector=result.orig, healed=best and best.selector, phase=best and best.phase,
+        score=best.score if best else result.best_score, candidates=result.candidates,
+        route=urlparse(page.url).path,
+        **{k: round(v, 2) if isinstance(v, float) else v for k, v in timings.items()},
     )
+    if best is None:
+        CACHE.mark_failed(result.orig, page.url)
+        raise ValueError(
+            f"No fuzzy match for selector '{result.orig}' (best score: {result.best_score})"
+        )
+    _update_cache(result.orig, best.selector)
+    _log_once(result.orig, best.selector, best.score)
+    return best.selector
 
 # ───────────────────────── helpers ────────────────────────────────────────────
 def _update_cache(orig: str, new: str) -> None:
-    data = json.loads(CACHE.read_text()) if CACHE.exists() else {}
-    data[orig] = new
-    CACHE.write_text(json.dumps(data, indent=2))
+    CACHE.put(orig, new)                  # buffered; written by CACHE.flush()
 
 def _log_once(orig: str, new: str, score: int) -> None:
     """Log heal only the first time during this run."""
     key = (orig, new)
-    if key not in {(o, n) for o, n, _ in HEAL_EVENTS}:
+    if key not in _LOGGED:
+        _LOGGED.add(key)
         HEAL_EVENTS.append((orig, new, score))
+        CACHE.log_heal(orig, new, score)  # shared backend: merged across xdist workers
         console.log(f"[green]✅ Healed[/] '{orig}' → '{new}' ({score} %)")
\ No newline at end of file
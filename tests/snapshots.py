@@ -0,0 +1,180 @@
+"""
+DOM snapshots of heal attempts + offline replay.
+• opt-in: HEAL_SNAPSHOTS=<dir> makes fuzzy_find / heal_many store the DOM each
+  heal was scored against (healed or not) next to the broken selector
+• DOMs are gzip'd and content-addressed (<dir>/dom/ab/abcdef….html.gz), so the
+  same page captured by many heals / tests / workers is stored once
+• one JSON line per heal in <dir>/cases.jsonl: dom hash, selector, route,
+  registry class, threshold, the subtree it was healed in (scope) and what
+  the live run picked
+• CLI:  python -m tests.snapshots [<dir>] [--workers N] [--thresh 60]
+                                 [--registry selector_registry.json] [--json out.json]
+        re-scores every case from its snapshot (no browser) across processes
+        and lists the cases whose heal changed
+"""
+
+import argparse, gzip, hashlib, json, os, sys, time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+from urllib.parse import urlparse
+from rich.console import Console
+from rich.table import Table
+
+from tests.candidates import from_html
+from tests.scoring import CandidateSet, HealResult, score_batch, within
+from tests.telemetry import TelemetrySink, load
+
+SNAPSHOT_DIR = os.getenv("HEAL_SNAPSHOTS")           # unset = no snapshots
+DEFAULT_DIR  = "heal_snapshots"
+CASES_FILE   = "cases.jsonl"
+
+
+class SnapshotStore:
+    def __init__(self, root: Optional[str]):
+        self.enabled = bool(root)
+        self.root    = Path(root or DEFAULT_DIR)
+        self._cases  = TelemetrySink(self.root / CASES_FILE)   # buffered O_APPEND, xdist-safe
+
+    def dom_path(self, digest: str) -> Path:
+        return self.root / "dom" / digest[:2] / f"{digest}.html.gz"
+
+    def save_dom(self, html: str) -> str:
+        """Store *html* once under its sha256; returns the hash."""
+        data   = html.encode()
+        digest = hashlib.sha256(data).hexdigest()
+        path   = self.dom_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp.write_bytes(gzip.compress(data, compresslevel=6))
+            os.replace(tmp, path)         # atomic: a racing worker writes identical bytes
+        return digest
+
+    def read_dom(self, digest: str) -> str:
+        return gzip.decompress(self.dom_path(digest).read_bytes()).decode()
+
+    def capture(self, html: str, url: str, results: Sequence[HealResult],
+                wanted: Sequence[Optional[str]], thresh: int, tags: Sequence[str],
+                scopes: Optional[Sequence[Optional[str]]] = None) -> None:
+        if not self.enabled:
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        digest = self.save_dom(html)
+        scopes = scopes or [None] * len(results)
+        for result, cls, scope in zip(results, wanted, scopes):
+            best = result.best
+            self._cases.record(
+                dom=digest, url=url, route=urlparse(url).path, selector=result.orig,
+                wanted=cls, thresh=thresh, tags=list(tags), scope=scope,
+                healed=best and best.selector, phase=best and best.phase,
+                score=best.score if best else result.best_score,
+            )
+
+    def flush(self) -> None:
+        if self.enabled:
+            self._cases.flush()
+
+
+SNAPSHOTS = SnapshotStore(SNAPSHOT_DIR)
+
+
+# ─── offline replay ──────────────────────────────────────────────────────
+def _replay_dom(task) -> List[dict]:
+    """Worker: parse one snapshot once, re-score all of its selectors in one batch."""
+    root, digest, tags, thresh, scope, selectors, wanted = task
+    html    = SnapshotStore(root).read_dom(digest)
+    results = score_batch(CandidateSet(from_html(html, tags), tags), selectors, thresh,
+                          wanted, workers=1)          # parallelism comes from the process pool
+    if scope:                             # healed inside a subtree live: same order here
+        records = from_html(html, tags, scope)
+        if records:
+            scoped  = score_batch(CandidateSet(records, tags), selectors, thresh, wanted, workers=1)
+            results = [within(s, scope) if s.best else r for s, r in zip(scoped, results)]
+    return [{"selector": r.orig, "healed": r.best and r.best.selector,
+             "phase": r.best and r.best.phase,
+             "score": r.best.score if r.best else r.best_score} for r in results]
+
+
+def replay(root: Path, workers: Optional[int] = None, thresh: Optional[int] = None,
+           registry=None) -> List[dict]:
+    """
+    Re-score every captured case. Identical (dom, selector, class, threshold)
+    cases are scored once. *thresh* overrides the recorded threshold,
+    *registry* (a SelectorRegistry) re-derives the class boost per route.
+    Returns one row per distinct case: before / after heal and how often it was seen.
+    """
+    store = SnapshotStore(str(root))
+    cases: Dict[tuple, dict] = {}
+    for c in load(store.root / CASES_FILE):
+        wanted = registry.class_of(c["selector"], c["route"]) if registry else c["wanted"]
+        t      = thresh if thresh is not None else c["thresh"]
+        key    = (c["dom"], c["selector"], wanted, t, c.get("scope"))
+        if key in cases:
+            cases[key]["seen"] += 1
+            continue
+        cases[key] = {"dom": c["dom"], "route": c["route"], "selector": c["selector"],
+                      "wanted": wanted, "thresh": t, "tags": tuple(c["tags"]), "scope": c.get("scope"),
+                      "before": c["healed"], "before_score": c["score"], "seen": 1}
+
+    # one task per (dom, tags, threshold, scope): the CandidateSet is built once per task
+    groups = defaultdict(list)
+    for case in cases.values():
+        groups[(case["dom"], case["tags"], case["thresh"], case["scope"])].append(case)
+    tasks = [(str(store.root), dom, list(tags), t, scope,
+              [c["selector"] for c in group], [c["wanted"] for c in group])
+             for (dom, tags, t, scope), group in groups.items()]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for group, scored in zip(groups.values(), pool.map(_replay_dom, tasks, chunksize=4)):
+            for case, new in zip(group, scored):
+                case.update(after=new["healed"], after_score=new["score"], phase=new["phase"])
+    return list(cases.values())
+
+
+def _table(rows: List[dict]) -> Table:
+    t = Table(title="heals that changed on replay")
+    for col in ("route", "selector", "class", "before", "after", "score", "seen"):
+        t.add_column(col)
+    for r in rows:
+        t.add_row(r["route"], r["selector"], str(r["wanted"]), str(r["before"]), str(r["after"]),
+                  f"{r['before_score']} → {r['after_score']}", str(r["seen"]))
+    return t
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Replay captured heal snapshots offline")
+    ap.add_argument("root", nargs="?", default=SNAPSHOT_DIR or DEFAULT_DIR)
+    ap.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    ap.add_argument("--thresh", type=int, default=None, help="override the recorded threshold")
+    ap.add_argument("--registry", type=Path, help="re-derive class boosts from this registry")
+    ap.add_argument("--json", type=Path, help="write every replayed case here")
+    ap.add_argument("--fail-on-change", action="store_true", help="exit 1 if any heal changed")
+    args = ap.parse_args(argv)
+
+    console = Console()
+    if not (Path(args.root) / CASES_FILE).exists():
+        console.print(f"[yellow]no snapshots in {args.root}")
+        return 0
+    registry = None
+    if args.registry:
+        from tests.registry import SelectorRegistry
+        registry = SelectorRegistry.load(args.registry)
+
+    start   = time.perf_counter()
+    rows    = replay(Path(args.root), args.workers, args.thresh, registry)
+    elapsed = time.perf_counter() - start
+    changed = [r for r in rows if r["after"] != r["before"]]
+    console.print(f"{len(rows)} cases on {len({r['dom'] for r in rows})} snapshots replayed "
+                  f"in {elapsed:.2f}s — healed before {sum(bool(r['before']) for r in rows)}, "
+                  f"after {sum(bool(r['after']) for r in rows)}, changed {len(changed)}")
+    if changed:
+        console.print(_table(changed))
+    if args.json:
+        args.json.write_text(json.dumps(rows, indent=2))
+    return 1 if changed and args.fail_on_change else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
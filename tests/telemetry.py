@@ -0,0 +1,126 @@
+"""
+Heal telemetry.
+• one JSON line per heal attempt (healed or not) in heal_telemetry.jsonl:
+    selector, healed, phase, score, candidates, fetch/parse/score ms, test, run …
+• records are buffered in memory and appended in one write per flush(), so
+  xdist workers can share the file and CI can keep growing it across runs
+• CLI:  python -m tests.telemetry [--top 10] [heal_telemetry.jsonl]
+        prints the slowest and the most frequent heals
+"""
+
+import argparse, json, os, time, uuid
+from collections import defaultdict
+from pathlib import Path
+from typing import List
+from rich.console import Console
+from rich.table import Table
+
+TELEMETRY_PATH = Path(os.getenv("HEAL_TELEMETRY", "heal_telemetry.jsonl"))
+BUFFER_SIZE    = 200                      # records kept before an early flush
+RUN_ID         = os.getenv("HEAL_RUN_ID") or os.getenv("GITHUB_RUN_ID") or uuid.uuid4().hex[:12]
+
+
+class TelemetrySink:
+    def __init__(self, path: Path, buffer_size: int = BUFFER_SIZE):
+        self.path        = Path(path)
+        self.buffer_size = buffer_size
+        self._buf: List[str] = []
+
+    def record(self, **fields) -> None:
+        rec = {
+            "ts":     round(time.time(), 3),
+            "run":    RUN_ID,
+            "worker": os.getenv("PYTEST_XDIST_WORKER", "main"),
+            "test":   os.getenv("PYTEST_CURRENT_TEST", "").rsplit(" ", 1)[0],
+            **fields,
+        }
+        self._buf.append(json.dumps(rec, separators=(",", ":")))
+        if len(self._buf) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._buf:
+            return
+        chunk = ("\n".join(self._buf) + "\n").encode()
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, chunk)           # single O_APPEND write: workers don't interleave lines
+        finally:
+            os.close(fd)
+        self._buf.clear()
+
+
+TELEMETRY = TelemetrySink(TELEMETRY_PATH)
+
+
+# ─── aggregation CLI ─────────────────────────────────────────────────────
+def load(path: Path) -> List[dict]:
+    out = []
+    for line in Path(path).read_text().splitlines():
+        try:
+            out.append(json.loads(line))
+        except ValueError:
+            continue                      # torn last line from a killed run
+    return out
+
+
+def aggregate(records: List[dict]) -> List[dict]:
+    """One row per original selector: count, heal rate, mean/max time and phase split."""
+    groups = defaultdict(list)
+    for r in records:
+        groups[r["selector"]].append(r)
+    rows = []
+    for sel, recs in groups.items():
+        totals = [r.get("fetch_ms", 0) + r.get("parse_ms", 0) + r.get("score_ms", 0) for r in recs]
+        phases = defaultdict(int)
+        for r in recs:
+            phases[r.get("phase") or "failed"] += 1
+        rows.append({
+            "selector": sel,
+            "count":    len(recs),
+            "healed":   sum(1 for r in recs if r.get("healed")),
+            "mean_ms":  sum(totals) / len(totals),
+            "max_ms":   max(totals),
+            "fetch_ms": sum(r.get("fetch_ms", 0) for r in recs) / len(recs),
+            "parse_ms": sum(r.get("parse_ms", 0) for r in recs) / len(recs),
+            "score_ms": sum(r.get("score_ms", 0) for r in recs) / len(recs),
+            "phases":   dict(phases),
+            "last":     recs[-1].get("healed"),
+        })
+    return rows
+
+
+def _table(title, rows):
+    t = Table(title=title)
+    for col in ("selector", "count", "healed", "mean ms", "max ms", "fetch", "parse", "score", "phases", "→ last"):
+        t.add_column(col)
+    for r in rows:
+        t.add_row(r["selector"], str(r["count"]), str(r["healed"]),
+                  f"{r['mean_ms']:.0f}", f"{r['max_ms']:.0f}",
+                  f"{r['fetch_ms']:.0f}", f"{r['parse_ms']:.0f}", f"{r['score_ms']:.0f}",
+                  " ".join(f"{k}:{v}" for k, v in r["phases"].items()), str(r["last"]))
+    return t
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="Aggregate heal telemetry")
+    ap.add_argument("path", nargs="?", default=str(TELEMETRY_PATH))
+    ap.add_argument("--top", type=int, default=10)
+    args = ap.parse_args(argv)
+
+    console = Console()
+    if not Path(args.path).exists():
+        console.print(f"[yellow]no telemetry at {args.path}")
+        return
+    records = load(args.path)
+    rows = aggregate(records)
+    runs = len({r.get("run") for r in records})
+    console.print(f"{len(records)} heal attempts, {len(rows)} selectors, {runs} runs")
+    console.print(_table("🐢 slowest heals (mean ms)",
+                         sorted(rows, key=lambda r: -r["mean_ms"])[:args.top]))
+    console.print(_table("🔁 most frequent heals",
+                         sorted(rows, key=lambda r: (-r["count"], -r["mean_ms"]))[:args.top]))
+
+
+if __name__ == "__main__":
+    main()
@@ -9,13 +9,13 @@ def test_add_transaction(page):
     tag = uuid4().hex[:8]          # unique marker for this run
 
     # --- login ---
-    page.goto("http://127.0.0.1:5000/login", wait_until="networkidle")
+    page.goto("/login", wait_until="networkidle")
     page.fill("#username", os.environ["FT_USER"])
     page.fill("#password", os.environ["FT_PASS"])
     page.click("button[type='submit']")
 
     # --- go to transactions ---
-    page.goto("http://127.0.0.1:5000/transactions", wait_until="networkidle")
+    page.goto("/transactions", wait_until="networkidle")
 
     # --- open the popup and fill form ---
     page.click("button:has-text('Add Transaction')")
@@ -0,0 +1,55 @@
+"""
+App server (no browser):
+
+ • app.py runs as __main__ with cwd=app: relative SQLite paths, inline ones
+   included, and its __main__ setup behave like `cd app && python app.py`
+ • the server gets a free port and answers before start() returns
+ • an app that dies during startup fails fast with its log
+ • an external base URL is used as-is and nothing is started
+"""
+
+import sqlite3, urllib.request
+import pytest
+from tests.app_server import AppServer, serve
+
+APP = '''
+import sqlite3
+from flask import Flask
+app = Flask(__name__)
+
+@app.route("/login")
+def login():
+    with sqlite3.connect("finance_tracker.db") as conn:       # inline, relative to cwd
+        return ",".join(u for (u,) in conn.execute("SELECT username FROM users"))
+
+if __name__ == "__main__":
+    with sqlite3.connect("finance_tracker.db") as conn:
+        conn.execute("CREATE TABLE IF NOT EXISTS users(username TEXT)")
+        conn.execute("INSERT INTO users VALUES ('demo')")
+    app.run(debug=True, port=5000)
+'''
+
+
+def test_app_runs_like_main_in_app_dir(tmp_path):
+    pytest.importorskip("flask")
+    (tmp_path / "app.py").write_text(APP)
+    server = AppServer(tmp_path).start()
+    try:
+        assert not server.url.endswith(":5000")
+        with urllib.request.urlopen(server.url + "/login") as resp:
+            assert resp.read() == b"demo"
+    finally:
+        server.stop()
+    with sqlite3.connect(tmp_path / "finance_tracker.db") as conn:
+        assert conn.execute("SELECT count(*) FROM users").fetchone() == (1,)
+
+
+def test_startup_crash_fails_fast(tmp_path):
+    pytest.importorskip("flask")
+    (tmp_path / "app.py").write_text("raise SystemExit('no database')\n")
+    with pytest.raises(RuntimeError, match="no database"):
+        AppServer(tmp_path).start(timeout=10)
+
+
+def test_external_url_starts_nothing():
+    assert serve("http://127.0.0.1:5000/") == ("http://127.0.0.1:5000", None)
@@ -0,0 +1,116 @@
+"""
+Asset routing (no browser):
+
+ • record mode fetches a third-party asset once and stores it
+ • replay serves it from disk and credits the recorded fetch time to the page
+   that loaded it (also for fonts a stylesheet asked for)
+ • trackers are aborted, app requests are never routed
+ • a failed record fetch falls back to the network instead of hanging
+ • replay with nothing recorded installs no route at all
+"""
+
+from playwright.sync_api import Error as PWError
+from tests.asset_cache import AssetCache
+
+CDN  = "https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.5.0/css/all.min.css"
+FONT = "https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.5.0/webfonts/fa-solid-900.woff2"
+DOC = "http://127.0.0.1:5000/transactions"
+
+
+class FakeResponse:
+    ok, status, headers = True, 200, {"content-type": "text/css", "date": "now"}
+
+    def body(self):
+        return b".fa{}"
+
+
+class FakeRoute:
+    def __init__(self, url, resource_type="stylesheet", offline=False, referer=DOC):
+        frame = type("Frame", (), {"url": DOC})()
+        self.request = type("Req", (), {"url": url, "method": "GET", "resource_type": resource_type,
+                                        "headers": {"referer": referer}, "frame": frame})()
+        self.outcome, self.offline = None, offline
+
+    def fetch(self):
+        if self.offline:
+            raise PWError("net::ERR_INTERNET_DISCONNECTED")
+        return FakeResponse()
+
+    def fulfill(self, **kw):
+        self.outcome = ("fulfill", kw)
+
+    def continue_(self):
+        self.outcome = ("continue", None)
+
+    def abort(self):
+        self.outcome = ("abort", None)
+
+
+def test_record_then_replay(tmp_path):
+    recorder = AssetCache(tmp_path, mode="record")
+    route = FakeRoute(CDN)
+    recorder.handle(route)
+    assert route.outcome[0] == "fulfill" and recorder.summary()["recorded"] == 1
+
+    replay = AssetCache(tmp_path, mode="replay")
+    route = FakeRoute(CDN)
+    replay.handle(route)
+    kind, kw = route.outcome
+    assert kind == "fulfill" and kw["body"] == b".fa{}"
+    assert kw["headers"] == {"content-type": "text/css"}
+    nav = replay.summary()["per_navigation"][0]
+    assert nav["navigation"] == DOC and nav["served"] == 1
+
+
+def test_stylesheet_assets_credited_to_page(tmp_path):
+    AssetCache(tmp_path, mode="record").handle(FakeRoute(FONT, "font", referer=CDN))
+    replay = AssetCache(tmp_path, mode="replay")
+    replay.handle(FakeRoute(FONT, "font", referer=CDN))    # the CSS file asked for the font
+    assert [n["navigation"] for n in replay.summary()["per_navigation"]] == [DOC]
+
+
+def test_replay_miss_goes_to_network(tmp_path):
+    cache = AssetCache(tmp_path, mode="replay")
+    route = FakeRoute(CDN)
+    cache.handle(route)
+    assert route.outcome[0] == "continue"
+    assert not list(tmp_path.iterdir())
+
+
+def test_trackers_blocked_and_app_untouched(tmp_path):
+    cache = AssetCache(tmp_path, mode="replay")
+    route = FakeRoute("https://www.googletagmanager.com/gtag/js?id=x", "script")
+    cache.handle(route)
+    assert route.outcome[0] == "abort"
+    assert not cache.wants("http://127.0.0.1:5000/static/app.js")
+    assert not cache.wants("http://127.0.0.1:53017/static/app.js")   # suite-started app, free port
+    assert cache.wants(CDN)
+
+
+def test_record_fetch_failure_continues(tmp_path):
+    cache = AssetCache(tmp_path, mode="record")
+    route = FakeRoute(CDN, offline=True)
+    cache.handle(route)
+    assert route.outcome[0] == "continue"
+    assert cache.summary()["recorded"] == 0
+
+
+class FakeContext:
+    def __init__(self):
+        self.routes = []
+
+    def route(self, matcher, handler):
+        self.routes.append(matcher)
+
+
+def test_attach_only_when_useful(tmp_path):
+    empty, context = AssetCache(tmp_path / "empty", mode="replay"), FakeContext()
+    empty.attach(context)
+    assert context.routes == []
+    AssetCache(tmp_path, mode="record").attach(context)
+    assert len(context.routes) == 1
+
+    AssetCache(tmp_path, mode="record").handle(FakeRoute(CDN))
+    context = FakeContext()
+    AssetCache(tmp_path, mode="replay").attach(context)
+    assert len(context.routes) == 1
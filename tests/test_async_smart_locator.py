@@ -0,0 +1,146 @@
+"""
+Async smart locator (no browser):
+
+ • concurrent heals of one selector scan the DOM once, the rest hit the cache
+ • heals on different pages run side by side in one event loop
+ • a failed heal is remembered for that page URL, like the sync path
+ • compound selectors are healed inside their ancestor's subtree first
+ • a slow but matching selector is retried with the default timeout, not healed
+ • is_visible() on a missing selector is False: no probe, no heal
+ • coroutines run on their own loop in a worker thread, so the file also
+   passes after browser tests (pytest-playwright's sync loop is still running)
+"""
+
+import asyncio
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+import tests.smart_locator as sl
+import tests.async_smart_locator as asl
+from tests.locator_cache import LocatorCache
+from tests.telemetry import TelemetrySink
+
+HTML = """<form>
+  <input id="amoumt" type="number">
+  <select id="categry"><option>Food</option></select>
+</form>"""
+
+
+class _Locator(str):
+    """page.locator() result: compares equal to its selector, has no browser behind it."""
+    async def evaluate_all(self, *a, **kw):
+        raise sl.PWError("no browser")
+
+
+class FakeAsyncPage:
+    """Async Page stand-in: evaluate() fails, so candidates come from content()."""
+    def __init__(self, html=HTML, url="http://127.0.0.1:5000/transactions"):
+        self._html, self.url, self.reads = html, url, 0
+
+    async def evaluate(self, *a, **kw):
+        raise sl.PWError("no browser")
+
+    async def content(self):
+        self.reads += 1
+        await asyncio.sleep(0.01)         # let the other coroutines run
+        return self._html
+
+    def locator(self, selector):
+        return _Locator(selector)
+
+
+def run(coro):
+    """asyncio.run() on a fresh loop in a worker thread; works beside a running sync Playwright."""
+    with ThreadPoolExecutor(1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+
+@pytest.fixture(autouse=True)
+def _isolated(monkeypatch, tmp_path):
+    monkeypatch.setattr(sl, "CACHE", LocatorCache(tmp_path / "locator_cache.json"))
+    monkeypatch.setattr(sl, "TELEMETRY", TelemetrySink(tmp_path / "telemetry.jsonl"))
+    monkeypatch.setattr(sl, "HEAL_EVENTS", [])
+    monkeypatch.setattr(sl, "_LOGGED", set())
+
+
+def test_concurrent_heals_scan_once():
+    page = FakeAsyncPage()
+
+    async def main():
+        return await asyncio.gather(*(asl.fuzzy_find_async(page, "#amount") for _ in range(5)))
+
+    assert run(main()) == ["#amoumt"] * 5
+    assert page.reads == 1
+
+
+def test_many_pages_in_one_loop():
+    pages = [FakeAsyncPage(url=f"http://127.0.0.1:5000/p{i}") for i in range(3)]
+
+    async def main():
+        return await asyncio.gather(*(asl.heal_many_async(p, ["#category"]) for p in pages))
+
+    results = run(main())
+    assert all(r == {"#category": "#categry"} for r in results)
+
+
+def test_failure_is_remembered():
+    page = FakeAsyncPage()
+
+    async def main():
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                await asl.fuzzy_find_async(page, "#zzzzqqqq")
+
+    run(main())
+    assert page.reads == 1
+
+
+def test_compound_selector_heals_in_subtree():
+    page = FakeAsyncPage(html='<form id="main"><input id="amount1"></form>'
+                              '<form id="popup"><input id="amount2"></form>')
+    healed = run(asl.fuzzy_find_async(page, "#popup #amount"))
+    assert healed == "#popup #amount2"    # the whole-document scan would pick #amount1
+
+
+def test_slow_selector_retried_not_healed(monkeypatch):
+    from tests.probing import DEFAULT_TIMEOUT, ProbeStats
+    probes = ProbeStats()
+    probes.record("#amount", 100)         # adaptive timeout: 500 ms
+    monkeypatch.setattr(asl, "PROBES", probes)
+    timeouts = []
+
+    class Raw:
+        async def count(self):
+            return 1
+
+        async def fill(self, value, timeout):
+            timeouts.append(timeout)
+            if timeout < DEFAULT_TIMEOUT:
+                raise asl.PWTimeout("slow")
+            return value
+
+    loc = asl.AsyncSmartLocator(Raw(), FakeAsyncPage(), "#amount")
+    assert run(loc.fill("12")) == "12"
+    assert timeouts == [500, DEFAULT_TIMEOUT] and sl.HEAL_EVENTS == []
+
+
+def test_missing_selector_is_not_visible():
+    class Raw:
+        async def count(self):
+            return 0
+
+        async def is_visible(self):
+            return False
+
+    page = FakeAsyncPage()
+    loc = asl.AsyncSmartLocator(Raw(), page, "#amount")   # "#amoumt" would heal it
+    assert run(loc.is_visible()) is False
+    assert page.reads == 0 and sl.HEAL_EVENTS == []
+
+
+def test_runs_beside_sync_playwright(playwright):
+    """Regression: the session playwright fixture leaves its event loop running."""
+    probe = asyncio.sleep(0)
+    with pytest.raises(RuntimeError):     # what the bare asyncio.run() calls used to hit
+        asyncio.run(probe)
+    probe.close()
+    assert run(asl.fuzzy_find_async(FakeAsyncPage(), "#amount")) == "#amoumt"
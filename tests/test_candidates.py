@@ -0,0 +1,40 @@
+"""
+Candidate records from HTML (no browser):
+
+ • id/name/data-testid carriers of any tag are kept, plus bare form controls
+ • record shape matches what the in-browser extractor returns
+ • full text for the fallback tags, none for other carriers (a form, a button)
+ • a scope limits the scan to its subtrees; unresolvable scopes yield nothing
+"""
+
+from tests.candidates import from_html
+
+HTML = """
+<form id="popup">
+  <input id="amount" type="number" class="form-control wide">
+  <select name="payment_method"><option>Cash</option></select>
+  <textarea></textarea>
+  <button data-testid="save">Add</button>
+  <span>ignored</span>
+</form>
+"""
+
+
+def test_from_html_records():
+    recs = from_html(HTML, ["input", "textarea", "select"])
+    assert [r["tag"] for r in recs] == ["form", "input", "select", "textarea", "button"]
+
+    amount = recs[1]
+    assert amount == {"tag": "input", "type": "number", "id": "amount", "name": None,
+                      "testid": None, "cls": "form-control wide", "text": ""}
+    assert recs[2]["name"] == "payment_method" and recs[2]["text"] == "Cash"
+    assert recs[4]["testid"] == "save"
+    assert recs[0]["text"] == recs[4]["text"] == ""
+
+
+def test_from_html_scoped():
+    html = f'<div class="wrap">{HTML}</div><input id="outside">'
+    recs = from_html(html, ["input", "textarea"], scope="div, #popup")   # nested roots → once each
+    assert [r["tag"] for r in recs] == ["form", "input", "select", "textarea", "button"]
+    assert from_html(html, ["input"], scope="#gone") == []
+    assert from_html(html, ["input"], scope="tr:has-text('x')") == []   # Playwright-only syntax
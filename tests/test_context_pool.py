@@ -0,0 +1,108 @@
+"""
+Context pool (no browser):
+
+ • tests reuse the warm contexts instead of creating one each
+ • release() clears cookies / routes and restores nothing of the last test
+ • a context that fails to reset is replaced, never handed out again
+ • the fresh-context cost excludes the warm-up navigation
+"""
+
+import json, time
+from playwright.sync_api import Error as PWError
+from tests.context_pool import ContextPool
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context, self.url, self.closed = context, "about:blank", False
+
+    def goto(self, url, **kw):
+        if self.context.broken:
+            raise PWError("target closed")
+        self.url = url
+
+    def evaluate(self, js):
+        self.context.storage_cleared += 1
+
+    def is_closed(self):
+        return self.closed
+
+    def close(self):
+        self.closed = True
+        self.context.pages.remove(self)
+
+
+class FakeContext:
+    def __init__(self):
+        self.pages, self.cookies, self.routes = [], [], 1
+        self.broken, self.closed, self.storage_cleared = False, False, 0
+
+    def new_page(self):
+        self.pages.append(FakePage(self))
+        return self.pages[-1]
+
+    def add_cookies(self, cookies):
+        self.cookies += cookies
+
+    def clear_cookies(self):
+        self.cookies = []
+
+    def clear_permissions(self):
+        pass
+
+    def unroute_all(self, behavior=None):
+        self.routes = 0
+
+    def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+
+    def new_context(self, **kw):
+        self.contexts.append(FakeContext())
+        return self.contexts[-1]
+
+
+def test_contexts_are_reused_and_reset(tmp_path):
+    state = tmp_path / "state.json"
+    state.write_text(json.dumps({"cookies": [{"name": "session", "value": "x"}], "origins": []}))
+    browser = FakeBrowser()
+    pool = ContextPool(browser, {}, size=1, warm_url="http://127.0.0.1:5000/login",
+                       on_new=lambda ctx: setattr(ctx, "routes", 1)).warm()
+
+    for _ in range(3):
+        context, page = pool.acquire(storage_state=str(state))
+        assert context.cookies == [{"name": "session", "value": "x"}]
+        page.goto("http://127.0.0.1:5000/transactions")
+        context.new_page()                                # popup left open by the test
+        pool.release(context, page)
+        assert context.cookies == [] and context.routes == 1
+        assert context.pages == [page] and page.url == "about:blank"
+
+    assert len(browser.contexts) == 1
+    s = pool.summary()
+    assert (s["created"], s["acquired"]) == (1, 3)
+
+
+def test_broken_context_is_replaced():
+    browser = FakeBrowser()
+    pool = ContextPool(browser, {}, size=1, warm_url=None).warm()
+    context, page = pool.acquire()
+    context.broken = True
+    pool.release(context, page)
+    assert context.closed
+    assert pool.acquire()[0] is browser.contexts[-1] is not context
+
+
+def test_fresh_cost_excludes_warm_up(monkeypatch):
+    slow_goto = FakePage.goto
+    def goto(self, url, **kw):
+        time.sleep(0.05)
+        return slow_goto(self, url, **kw)
+    monkeypatch.setattr(FakePage, "goto", goto)
+    pool = ContextPool(FakeBrowser(), {}, size=2, warm_url="/login").warm()
+    s = pool.summary()
+    assert s["warm_ms"] >= 100 and s["fresh_ms"] < 25
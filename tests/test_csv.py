@@ -9,7 +9,6 @@ CSV download flow
 """
 
 import csv, uuid, io
-from tests.conftest import login, creds
 
 EXPECTED_HEADER = [
     "Date",
@@ -20,24 +19,13 @@ EXPECTED_HEADER = [
 ]
 
 
-def add_txn(page, tag):
-    page.click("button:has-text('Add Transaction')")
-    page.fill("#date", "2025-04-27")
-    page.select_option("#category", label="Food")
-    page.fill("#amount", "444")
-    page.select_option("select#payment_method", label="Cash")
-    page.fill("#notes", tag)
-    with page.expect_navigation(wait_until="networkidle"):
-        page.click("#popup button[type='submit']")
-
-
-def test_csv_download(page, creds, tmp_path):
+def test_csv_download(logged_in_page, txn_factory, tmp_path):
+    page = logged_in_page          # already logged in (session storage_state)
     tag = f"CSV-{uuid.uuid4().hex[:6]}"
 
-    # create row
-    login(page, creds)
-    page.goto("http://127.0.0.1:5000/transactions", wait_until="networkidle")
-    add_txn(page, tag)
+    # create row (backend, not the popup)
+    txn_factory.add(tag, 444, payment_method="Cash", category="Food", date="2025-04-27")
+    page.goto("/transactions", wait_until="networkidle")
     page.wait_for_selector(f"tbody tr:has-text('{tag}')")
 
     # download
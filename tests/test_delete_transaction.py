@@ -6,26 +6,14 @@ Delete flow:
 """
 
 from uuid import uuid4
-from tests.conftest import login, creds
 
 
-def add_txn(page, tag):
-    page.click("button:has-text('Add Transaction')")
-    page.fill("#date", "2025-04-29")
-    page.select_option("#category", label="Gifts")
-    page.fill("#amount", "333")
-    page.select_option("select#payment_method", label="Cash")
-    page.fill("#notes", tag)
-    with page.expect_navigation(wait_until="networkidle"):
-        page.click("#popup button[type='submit']")
-
-
-def test_delete_transaction(page, creds):
+def test_delete_transaction(logged_in_page, txn_factory):
+    page = logged_in_page          # already logged in (session storage_state)
     tag = f"Del-{uuid4().hex[:6]}"
 
-    login(page, creds)
-    page.goto("http://127.0.0.1:5000/transactions", wait_until="networkidle")
-    add_txn(page, tag)
+    txn_factory.add(tag, 333, payment_method="Cash", category="Gifts", date="2025-04-29")
+    page.goto("/transactions", wait_until="networkidle")
 
     # trash it
     row = page.locator(f"tbody tr:has-text('{tag}')")
@@ -0,0 +1,53 @@
+"""
+Heal-ahead (no browser):
+
+ • a same-class rename in the registry becomes a locator-cache entry
+ • a rename to a control of another class is not trusted
+ • routes that disagree on the target produce no entry
+"""
+
+import json
+from tests.heal_ahead import apply, plan
+from tests.locator_cache import LocatorCache
+
+OLD = {
+    "/transactions": [
+        {"selector": "#amount", "class": "input.number"},
+        {"selector": "#notes", "class": "input.text"},
+        {"selector": '[name="payment_method"]', "class": "select"},
+    ],
+}
+
+
+def test_same_class_rename_prefills_cache(tmp_path):
+    new = {"/transactions": [
+        {"selector": "#txn_amount", "class": "input.number"},
+        {"selector": "#notes", "class": "input.text"},
+        {"selector": '[name="payment_mode"]', "class": "select"},
+    ]}
+    mappings = plan(OLD, new)
+    assert mappings["#amount"]["to"] == "#txn_amount"
+    assert mappings['[name="payment_method"]']["to"] == '[name="payment_mode"]'
+    assert "#notes" not in mappings
+
+    path = tmp_path / "locator_cache.json"
+    assert apply(mappings, LocatorCache(path)) == 2
+    assert json.loads(path.read_text())["#amount"] == "#txn_amount"
+    assert apply(mappings, LocatorCache(path)) == 0          # idempotent
+
+
+def test_class_change_is_not_mapped():
+    new = {"/transactions": [
+        {"selector": "#amounts", "class": "input.text"},      # number → text
+        {"selector": "#notes", "class": "input.text"},
+        {"selector": '[name="payment_method"]', "class": "select"},
+    ]}
+    assert "#amount" not in plan(OLD, new)
+
+
+def test_routes_disagreeing_are_skipped():
+    old = {"/a": [{"selector": "#amount", "class": "input.number"}],
+           "/b": [{"selector": "#amount", "class": "input.number"}]}
+    new = {"/a": [{"selector": "#amount_a", "class": "input.number"}],
+           "/b": [{"selector": "#amount_b", "class": "input.number"}]}
+    assert plan(old, new) == {}
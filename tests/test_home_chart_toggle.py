@@ -1,42 +1,35 @@
 """
-Chart legend toggle (pixel hash):
+Chart legend toggle (pixel digest, computed in the page):
 
- • click legend once ‑ dataset hidden  → hash changes
- • click legend again ‑ dataset shown → hash changes back
+ • click legend once ‑ dataset hidden  → digest changes
+ • click legend again ‑ dataset shown → digest changes back, and the
+   perceptual hash is within PHASH_TOLERANCE bits of the first draw
 """
 
-import hashlib, base64
-from tests.conftest import login, creds
+from tests.visual import PHASH_TOLERANCE, canvas_phash, hamming, wait_for_redraw
 
 CANVAS = "#dailySpendingChart"
 
 
-def canvas_hash(page):
-    data_url = page.evaluate(
-        "() => document.querySelector('#dailySpendingChart').toDataURL('image/png')"
-    )
-    png = base64.b64decode(data_url.split(",")[1])
-    return hashlib.sha1(png).hexdigest()
-
-
 def click_legend(page):
     box = page.locator(CANVAS).bounding_box()
     page.locator(CANVAS).click(position={"x": box["width"] / 2, "y": 20})
 
 
-def test_chart_legend_toggle_hash(page, creds):
-    login(page, creds)
-    page.goto("http://127.0.0.1:5000/", wait_until="networkidle")
+def test_chart_legend_toggle_hash(logged_in_page):
+    page = logged_in_page          # already logged in (session storage_state)
+    page.goto("/", wait_until="networkidle")
     page.wait_for_selector(CANVAS)
 
-    h_visible = canvas_hash(page)
+    h_visible = wait_for_redraw(page, CANVAS)                # initial draw settled
+    p_visible = canvas_phash(page, CANVAS)
 
-    click_legend(page)               # hide
-    page.wait_for_timeout(300)       # small debounce for chart redraw
-    h_hidden = canvas_hash(page)
+    click_legend(page)                                       # hide
+    h_hidden = wait_for_redraw(page, CANVAS, previous=h_visible)
     assert h_hidden != h_visible
 
-    click_legend(page)               # show
-    page.wait_for_timeout(300)
-    h_shown = canvas_hash(page)
-    assert h_shown != h_hidden
\ No newline at end of file
+    click_legend(page)                                       # show
+    h_shown = wait_for_redraw(page, CANVAS, previous=h_hidden)
+    assert h_shown != h_hidden
+    # looks like the first draw again (HEAL_PHASH_TOLERANCE)
+    assert hamming(canvas_phash(page, CANVAS), p_visible) <= PHASH_TOLERANCE
@@ -9,7 +9,6 @@ Home‑page totals sanity:
 
 from uuid import uuid4
 from decimal import Decimal
-from tests.conftest import login, creds
 
 
 def get_totals(page):
@@ -25,30 +24,21 @@ def get_totals(page):
     return _value("Total UPI Transactions"), _value("Total Cash Transactions"), _value("Total Amount")
 
 
-def add_txn(page, tag, amt, pay_method):
-    page.click("button:has-text('Add Transaction')")
-    page.fill("#date", "2025-05-01")
-    page.select_option("#category", label="Food")
-    page.fill("#amount", str(amt))
-    page.select_option("select#payment_method", label=pay_method)
-    page.fill("#notes", tag)
-    with page.expect_navigation(wait_until="networkidle"):
-        page.click("#popup button[type='submit']")
-
-
-def test_home_totals(page, creds):
-    login(page, creds)
+def test_home_totals(logged_in_page, txn_factory):
+    page = logged_in_page          # already logged in (session storage_state)
 
     # baseline
-    page.goto("http://127.0.0.1:5000/", wait_until="networkidle")
+    page.goto("/", wait_until="networkidle")
     upi0, cash0, total0 = get_totals(page)
 
-    # add two rows
-    page.goto("http://127.0.0.1:5000/transactions")
+    # add two rows (backend, the popup isn't under test here)
     tag_upi  = f"HUPI-{uuid4().hex[:4]}"
     tag_cash = f"HCASH-{uuid4().hex[:4]}"
-    add_txn(page, tag_upi, 100, "UPI")
-    add_txn(page, tag_cash, 200, "Cash")
+    txn_factory.add_many([
+        dict(notes=tag_upi,  amount=100, payment_method="UPI",  category="Food", date="2025-05-01"),
+        dict(notes=tag_cash, amount=200, payment_method="Cash", category="Food", date="2025-05-01"),
+    ])
+    page.goto("/transactions", wait_until="networkidle")
 
     # delete Cash row
     row_cash = page.locator(f"tbody tr:has-text('{tag_cash}')")
@@ -56,7 +46,7 @@ def test_home_totals(page, creds):
     page.wait_for_selector(f"tbody tr:has-text('{tag_cash}')", state="detached")
 
     # re‑check cards
-    page.goto("http://127.0.0.1:5000/")
+    page.goto("/")
     upi1, cash1, total1 = get_totals(page)
 
     assert upi1 == upi0 + 100
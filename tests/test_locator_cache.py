@@ -0,0 +1,75 @@
+"""
+Locator cache (no browser):
+
+ • heals are served from memory and only hit disk on flush()
+ • failed heals fail fast on the same page until the TTL expires, for this
+   session only: they are never persisted, so a fixed DOM is rescanned next run
+ • the SQLite backend shares heals between workers without a flush
+"""
+
+import json
+from tests.locator_cache import LocatorCache, SharedLocatorCache, NEGATIVE_KEY
+
+
+def test_heals_buffered_until_flush(tmp_path):
+    path = tmp_path / "locator_cache.json"
+    path.write_text(json.dumps({"#old": "#new"}))
+
+    cache = LocatorCache(path)
+    assert cache.get("#old") == "#new"
+
+    cache.put("#amount", "#amoumt")
+    assert json.loads(path.read_text()) == {"#old": "#new"}    # not written yet
+
+    cache.flush()
+    assert json.loads(path.read_text()) == {"#old": "#new", "#amount": "#amoumt"}
+    assert LocatorCache(path).get("#amount") == "#amoumt"
+
+
+def test_negative_entries_expire(tmp_path):
+    path = tmp_path / "locator_cache.json"
+    cache = LocatorCache(path, negative_ttl=60)
+
+    cache.mark_failed("#gone", "http://host/transactions")
+    assert cache.is_failed("#gone", "http://host/transactions")
+    assert not cache.is_failed("#gone", "http://host/")         # other page → rescan
+
+    expired = LocatorCache(path, negative_ttl=0)
+    expired.mark_failed("#gone", "http://host/transactions")
+    assert not expired.is_failed("#gone", "http://host/transactions")
+
+    cache.put("#amount", "#amoumt")
+    cache.flush()
+    assert NEGATIVE_KEY not in json.loads(path.read_text())
+    assert not LocatorCache(path, negative_ttl=60).is_failed("#gone", "http://host/transactions")
+
+    path.write_text(json.dumps({NEGATIVE_KEY: {"#gone": {"url": "http://host/transactions",
+                                                         "ts": 9e12}}}))   # older format
+    assert not LocatorCache(path).is_failed("#gone", "http://host/transactions")
+
+    cache.put("#gone", "#back")                                 # a later heal clears it
+    assert not cache.is_failed("#gone", "http://host/transactions")
+
+
+def test_shared_cache_is_visible_across_workers(tmp_path):
+    path = tmp_path / "locator_cache.json"
+    path.write_text(json.dumps({"#seeded": "#kept"}))
+    db = tmp_path / "shared.db"
+
+    w1, w2 = SharedLocatorCache(db, path), SharedLocatorCache(db, path)
+    assert w2.get("#seeded") == "#kept"                          # seeded once from JSON
+
+    assert w2.get("#amount") is None
+    w1.put("#amount", "#amoumt")
+    w1.log_heal("#amount", "#amoumt", 83)
+    assert w2.get("#amount") == "#amoumt"                        # no flush needed
+    w2.log_heal("#amount", "#amoumt", 83)                        # raced heal, same result
+    w2.mark_failed("#gone", "http://host/")
+    assert w1.is_failed("#gone", "http://host/")
+
+    assert w1.events() == [("#amount", "#amoumt", 83)]
+    w1.export()
+    for w in (w1, w2):
+        w.close()
+    data = json.loads(path.read_text())
+    assert data == {"#seeded": "#kept", "#amount": "#amoumt"}   # negatives stay in the run
@@ -0,0 +1,54 @@
+"""
+Action profiler (no browser):
+
+ • nothing is recorded until enable()
+ • summary() ranks selectors by total time, single waits and tests by time
+ • dump() writes one profile per xdist worker
+"""
+
+import json
+from tests.profiling import ActionProfiler
+
+
+def _profiler(tmp_path):
+    prof = ActionProfiler()
+    prof.enable(str(tmp_path / "action_profile.json"))
+    return prof
+
+
+def test_disabled_records_nothing():
+    prof = ActionProfiler()
+    prof.record("fill", "#a", 5)
+    with prof.measure("goto", "/"):
+        pass
+    assert prof.records == [] and prof.dump() is None
+
+
+def test_summary_ranks(tmp_path, monkeypatch):
+    prof = _profiler(tmp_path)
+    monkeypatch.setenv("PYTEST_CURRENT_TEST", "tests/test_x.py::test_one (call)")
+    prof.record("fill", "#a", 30)
+    prof.record("is_visible", "#a", 30)
+    prof.record("fill", "#b", 50)
+    monkeypatch.setenv("PYTEST_CURRENT_TEST", "tests/test_x.py::test_two (call)")
+    prof.record("timeout-wait", "#c", 100)
+    with prof.measure("goto", "/"):
+        pass
+
+    s = prof.summary(top=2)
+    assert s["actions"] == 5
+    assert [h["target"] for h in s["hottest_selectors"]] == ["#c", "#a"]
+    assert s["hottest_selectors"][1] == {"target": "#a", "count": 2, "total_ms": 60,
+                                         "max_ms": 30, "kinds": ["fill", "is_visible"]}
+    assert [w["ms"] for w in s["slowest_waits"]] == [100, 50]
+    assert s["slowest_tests"][0]["test"] == "tests/test_x.py::test_one"
+    assert s["slowest_tests"][0]["total_ms"] == 110
+
+
+def test_dump_per_worker(tmp_path, monkeypatch):
+    prof = _profiler(tmp_path)
+    prof.record("fill", "#a", 1)
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw1")
+    path = prof.dump()
+    assert path.name == "action_profile.gw1.json"
+    assert json.loads(path.read_text())["summary"]["actions"] == 1
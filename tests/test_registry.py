@@ -0,0 +1,77 @@
+"""
+Selector registry index (no browser):
+
+ • route-specific class wins over the global one
+ • unknown route falls back to the first route that lists the selector
+ • diff_routes pairs removed + added selectors of the same class as renames
+ • the compact layout stores a shared form once and loads like the old one
+ • LazyRegistry reads nothing until the first lookup
+"""
+
+import json
+from tests.registry import LazyRegistry, SelectorRegistry, decode, diff_routes, encode
+
+DATA = {
+    "/login":        [{"selector": "#username", "class": "input.text"}],
+    "/register":     [{"selector": "#username", "class": "input.email"},
+                      {"selector": "#phone",    "class": "input.tel"}],
+}
+
+
+def test_class_of_prefers_route():
+    reg = SelectorRegistry(DATA)
+    assert reg.class_of("#username", "/register") == "input.email"
+    assert reg.class_of("#username", "/nowhere") == "input.text"
+    assert reg.class_of("#username") == "input.text"
+    assert reg.class_of("#missing") is None
+    assert len(reg) == 3
+    assert [e["selector"] for e in reg.entries("/register")] == ["#username", "#phone"]
+
+
+def test_diff_routes_detects_renames():
+    new = {
+        "/login":    [{"selector": "#user_name", "class": "input.text"}],
+        "/register": [{"selector": "#username", "class": "input.email"},
+                      {"selector": "#mobile",   "class": "input.tel"}],
+    }
+    changes = diff_routes(DATA, new)
+    (rename,) = changes["/login"]["renamed"]
+    assert (rename["from"], rename["to"], rename["class"]) == ("#username", "#user_name", "input.text")
+    assert changes["/register"] == {"added": ["#mobile"], "removed": ["#phone"], "renamed": []}
+    assert diff_routes(DATA, DATA) == {}
+
+
+def test_compact_layout_dedups_shared_forms():
+    login = [{"selector": "#user_name", "class": "input.text"},
+             {"selector": "#pass", "class": "input.password"}]
+    legacy = {"/": login, "/transactions": login, "/statistics": list(login), **DATA}
+    compact = encode(legacy)
+    assert len(compact["groups"]) == 3                    # login form stored once
+    assert decode(compact) == legacy
+    assert decode(legacy) == legacy                       # old layout passes through
+    reg, old = SelectorRegistry(compact), SelectorRegistry(legacy)
+    assert reg.routes() == old.routes() and len(reg) == len(old)
+    assert reg.class_of("#pass", "/statistics") == "input.password"
+    assert reg.class_of("#username", "/register") == "input.email"
+
+
+def test_lazy_registry_loads_on_first_lookup(tmp_path):
+    path = tmp_path / "selector_registry.json"
+    reg = LazyRegistry(path)                              # file doesn't exist yet: no error
+    path.write_text(json.dumps(encode(DATA)))
+    assert reg.class_of("#phone", "/register") == "input.tel"
+    assert reg.routes() == ["/login", "/register"]
+
+
+def test_compact_layout_dedups_shared_blocks():
+    nav = [{"selector": "#search", "class": "input.text", "block": "nav"},
+           {"selector": "#logout", "class": "button", "block": "nav"}]
+    add = [{"selector": "#amount", "class": "input.number", "block": "form#add"}]
+    csv = [{"selector": "#range", "class": "select", "block": "form#export"}]
+    legacy = {"/transactions": nav + add, "/statistics": nav + csv, "/": list(nav)}
+    compact = encode(legacy)
+    assert len(compact["groups"]) == 3                    # nav once, each page form once
+    assert compact["routes"]["/"] == compact["routes"]["/statistics"][:1]
+    assert decode(compact) == legacy
+    assert encode(decode(compact)) == compact             # stable across crawler runs
+    assert SelectorRegistry(compact).class_of("#range", "/statistics") == "select"
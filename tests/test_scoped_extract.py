@@ -0,0 +1,48 @@
+"""
+Scoped candidate extraction in Chromium (no app server):
+
+ • SCOPED_JS returns the same records as EXTRACT_JS, limited to the scope's subtrees
+ • nested scope roots are not scanned twice; Playwright pseudo-classes resolve
+ • browser records equal the BeautifulSoup ones (class lists normalised alike)
+"""
+
+import pytest
+from tests.candidates import Extractor, from_html
+
+HTML = """
+<table><tbody>
+  <tr><td>Rent</td><td><input name="qty_rent" type="number"></td></tr>
+  <tr><td>Food</td><td><input name="qty_food" type="number"></td></tr>
+</tbody></table>
+<div id="popup"><form id="inner"><input id="amount2"><select name="pm"></select></form></div>
+"""
+
+
+@pytest.fixture
+def blank_page(browser):
+    context = browser.new_context()
+    page = context.new_page()
+    page.set_content(HTML)
+    yield page
+    context.close()
+
+
+def test_scoped_records_in_browser(blank_page):
+    timings = {}
+    reader = Extractor(blank_page, ["input", "select"], mode="browser", timings=timings)
+    everything = reader.records()
+    popup = reader.records("#popup, #inner")
+    assert [r["id"] or r["name"] for r in popup] == ["inner", "amount2", "pm"]
+    assert all(r in everything for r in popup)
+    row = reader.records("tbody tr:has-text('Food')")
+    assert [r["name"] for r in row] == ["qty_food"]
+    assert reader.records("#gone") == []
+    assert timings["mode"] == "browser"
+
+
+def test_browser_records_match_html(blank_page):
+    blank_page.set_content(HTML + '<input name="blank" class=" "><textarea class="  a   b "></textarea>')
+    tags = ["input", "select", "textarea"]
+    browser = Extractor(blank_page, tags, mode="browser").records()
+    assert browser == from_html(blank_page.content(), tags)
+    assert [r["cls"] for r in browser[-2:]] == [None, "a b"]
@@ -0,0 +1,70 @@
+"""
+Batched scoring engine (no browser):
+
+ • id/name phase wins over data-testid and fallback
+ • registry class boost decides between similar fallback candidates
+ • many selectors are ranked against one candidate set in one call
+ • compound selectors split into ancestor scopes + the part that is matched
+ • a whitespace-only class attribute yields a bare tag fallback, not a crash
+ • the fallback key is the full text: a difference past 80 chars still counts
+"""
+
+from tests.candidates import from_html
+from tests.scoring import CandidateSet, extract_attr, fallback_selector, score_batch, split_compound
+
+HTML = """
+<input id="amoumt" type="number">
+<select id="categroy"></select>
+<div data-testid="notes-field"></div>
+<input name="qty_a" class="a" type="text"><input name="qty_b" class="b" type="number">
+"""
+TAGS = ["input", "textarea", "select"]
+
+
+def test_score_batch_phases():
+    cands = CandidateSet(from_html(HTML, TAGS), TAGS)
+    amount, category, notes, missing = score_batch(
+        cands, ["#amount", "#category", "notesfield", "#zzzzzz"], thresh=60
+    )
+
+    assert amount.best.selector == "#amoumt" and amount.best.phase == "id"
+    assert category.best.selector == "#categroy"
+    assert (notes.best.selector, notes.best.phase) == ("[data-testid=\"notes-field\"]", "data-testid")
+    assert missing.best is None and missing.best_score < 60
+    assert all(r.candidates == cands.size for r in (amount, category, notes, missing))
+
+
+def test_class_boost_breaks_ties():
+    cands = CandidateSet(from_html(HTML, TAGS), TAGS)
+    plain, boosted = score_batch(cands, ["qty", "qty"], thresh=60,
+                                 wanted_classes=[None, "input.number"])
+    assert plain.best.selector == "input.a"
+    assert boosted.best.selector == "input.b" and boosted.best.phase == "fallback"
+    assert [m.score for m in boosted.ranked][:2] == [110, 100]
+
+
+def test_split_compound():
+    assert split_compound("#popup form > input#amount") == (["#popup form", "#popup"], "input#amount")
+    assert split_compound("tbody tr:has-text('Food bill') button") == \
+        (["tbody tr:has-text('Food bill')", "tbody"], "button")
+    assert split_compound("label + input") == ([], "input")          # a sibling is no scope
+    assert split_compound("input[name='a b'], select") == ([], "input[name='a b'], select")
+    assert extract_attr("#popup button[type='submit']") == (None, None)
+    assert extract_attr("#popup select#payment_method") == ("id", "payment_method")
+
+
+def test_blank_class_fallback():
+    rec = {"tag": "input", "type": None, "id": None, "name": None, "testid": None,
+           "cls": " ", "text": ""}
+    cands = CandidateSet([rec], TAGS)             # builds every fallback up front
+    assert cands.size == 1 and fallback_selector(rec) == "input"
+    assert fallback_selector({**rec, "cls": "  wide  note "}) == "input.wide"
+
+
+def test_fallback_uses_full_text():
+    prefix = "monthly household expense category " * 3           # > 80 chars in common
+    html = (f'<textarea class="a">{prefix}utilities</textarea>'
+            f'<textarea class="b">{prefix}groceries</textarea>')
+    cands = CandidateSet(from_html(html, TAGS), TAGS)
+    (res,) = score_batch(cands, ["groceries"], thresh=80)
+    assert (res.best.selector, res.best.phase, res.best.score) == ("textarea.b", "fallback", 100)
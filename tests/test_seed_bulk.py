@@ -0,0 +1,74 @@
+"""
+Bulk seeding (no browser):
+
+ • generated rows are deterministic per seed and land in one transaction
+ • a re-seed replaces earlier generated rows instead of piling up
+ • clear() only touches generated rows of that user
+ • with a request context, labels are stored as the form's option values
+"""
+
+import sqlite3
+from scripts.seed_bulk import BULK_TAG, clear, generate, seed
+
+
+def _db(tmp_path):
+    db = tmp_path / "finance_tracker.db"
+    with sqlite3.connect(db) as conn:
+        conn.execute("CREATE TABLE users(id INTEGER PRIMARY KEY, username TEXT)")
+        conn.executemany("INSERT INTO users(username) VALUES(?)", [("alice",), ("bob",)])
+        conn.execute("""CREATE TABLE transactions(id INTEGER PRIMARY KEY, user_id INTEGER,
+                        date TEXT, category TEXT, amount REAL, payment_method TEXT, notes TEXT)""")
+    return db
+
+
+def _count(db, where="1"):
+    with sqlite3.connect(db) as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM transactions WHERE {where}").fetchone()[0]
+
+
+def test_generate_is_deterministic():
+    a, b = list(generate(50, seed=3)), list(generate(50, seed=3))
+    assert a == b
+    assert all(r["notes"].startswith(BULK_TAG) and r["amount"] > 0 for r in a)
+
+
+def test_reseed_replaces_generated_rows(tmp_path):
+    db = _db(tmp_path)
+    seed("alice", 12_000, db, batch=5_000)         # spans several executemany() batches
+    seed("alice", 300, db)
+    assert _count(db) == 300
+    seed("alice", 200, db, replace=False)
+    assert _count(db) == 500
+
+
+def test_clear_keeps_other_rows(tmp_path):
+    db = _db(tmp_path)
+    seed("alice", 100, db)
+    seed("bob", 50, db)
+    with sqlite3.connect(db) as conn:
+        conn.execute("INSERT INTO transactions(user_id, notes) VALUES(1, 'CSV-abc123')")
+        assert clear(conn, "alice") == 100
+    assert _count(db, "user_id = 1") == 1
+    assert _count(db, "user_id = 2") == 50
+
+
+class _FormHttp:
+    """APIRequestContext stand-in serving an Add Transaction form."""
+    FORM = """<form id="popup" action="/transactions">
+      <select name="category"><option value="bills">Bills</option><option value="food">Food</option>
+        <option value="transport">Transport</option></select>
+      <select name="payment_method"><option value="card">Card</option></select></form>"""
+
+    def get(self, url):
+        return type("Resp", (), {"text": lambda _: self.FORM})()
+
+
+def test_labels_mapped_to_option_values(tmp_path):
+    db = _db(tmp_path)
+    seed("alice", 500, db, http=_FormHttp(), base_url="")
+    with sqlite3.connect(db) as conn:
+        cats = {c for (c,) in conn.execute("SELECT DISTINCT category FROM transactions")}
+        pays = {p for (p,) in conn.execute("SELECT DISTINCT payment_method FROM transactions")}
+    assert {"bills", "food", "transport"} <= cats and not {"Bills", "Food", "Transport"} & cats
+    assert "card" in pays and "Card" not in pays
+    assert "Cash" in pays                          # no option for it: label kept
@@ -0,0 +1,54 @@
+"""
+Sharding planner (no pytest run):
+
+ • shards are balanced on recorded durations, slowest units first
+ • tests needing the session login stay together unless that unbalances shards,
+   whatever other fixtures they use
+ • merging shard histories keeps the newest entry per test
+"""
+
+from types import SimpleNamespace
+from tests.sharding import assign, merge, units, update
+
+LOGIN = ["page", "auth_state", "logged_in_page"]
+
+
+def _item(name, fixtures=()):
+    return SimpleNamespace(nodeid=f"tests/test_x.py::{name}", fixturenames=list(fixtures))
+
+
+def _h(**secs):
+    return {f"tests/test_x.py::{k}": {"s": v, "ts": 1.0} for k, v in secs.items()}
+
+
+def test_balanced_slowest_first():
+    items = [_item(n) for n in "abcde"]
+    shards = assign(units(items, _h(a=8, b=5, c=4, d=3, e=1), 2), 2)
+    loads = sorted(sum(u.cost for u in s) for s in shards)
+    assert loads == [10, 11]
+    assert all(s[0].cost >= s[-1].cost for s in shards)
+
+
+def test_login_tests_grouped_until_too_big():
+    items = [_item("x1", LOGIN), _item("x2", LOGIN), _item("y")]
+    plan = units(items, _h(x1=2, x2=2, y=4), 2)
+    assert [len(u.items) for u in plan] == [2, 1]           # 4 s login unit fits the 4 s share
+
+    plan = units(items, _h(x1=3, x2=3, y=1), 2)             # share is 3.5 s: the group is split
+    assert sorted(len(u.items) for u in plan) == [1, 1, 1]
+
+
+def test_merge_keeps_newest():
+    old = _h(a=1.0, b=2.0)
+    newer = update(old, {"tests/test_x.py::a": 3.0})
+    merged = merge([_h(a=9.0, b=2.0), newer])
+    assert merged["tests/test_x.py::a"]["s"] == 2.0         # smoothed 0.5 × 3 + 0.5 × 1
+    assert merged["tests/test_x.py::b"]["s"] == 2.0
+
+
+def test_grouped_on_login_not_fixture_set():
+    items = [_item("t1", ["auth_state", "txn_factory", "page"]),
+             _item("t2", ["auth_state", "logged_in_page"]), _item("y", ["page"])]
+    plan = units(items, _h(t1=1, t2=1, y=1), 1)
+    assert sorted(len(u.items) for u in plan) == [1, 2]
+    assert {i.nodeid.rsplit(":", 1)[1] for i in plan[0].items} == {"t1", "t2"}
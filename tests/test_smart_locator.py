@@ -0,0 +1,115 @@
+"""
+Subtree-scoped healing (no browser):
+
+ • "#popup #amount" is scored only against the controls inside #popup
+ • a scope that no longer resolves, or holds no match, falls back to the whole page
+ • selectors sharing a scope are read and ranked once; html mode parses the page once
+ • browser mode resolves scopes with locator(scope).evaluate_all(SCOPED_JS)
+ • compound selectors hit cache entries of their bare #id / [name] (heal-ahead)
+"""
+
+import pytest
+from bs4 import BeautifulSoup
+import tests.smart_locator as sl
+from tests.candidates import EXTRACT_JS, SCOPED_JS, soup_records
+from tests.locator_cache import LocatorCache
+from tests.telemetry import TelemetrySink
+
+HTML = """
+<form id="main"><input id="amount1" type="number"><input name="qty"></form>
+<form id="popup"><input id="amount2" type="number"><input name="note"></form>
+"""
+
+
+class FakeLocator(str):
+    def evaluate_all(self, *a, **kw):
+        raise sl.PWError("no browser")
+
+
+class FakePage:
+    """Sync Page stand-in: browser extraction fails, candidates come from content()."""
+    url = "http://127.0.0.1:5000/transactions"
+
+    def __init__(self):
+        self.reads = 0
+
+    def evaluate(self, *a, **kw):
+        raise sl.PWError("no browser")
+
+    def content(self):
+        self.reads += 1
+        return HTML
+
+    def locator(self, selector):
+        return FakeLocator(selector)
+
+
+class BrowserPage(FakePage):
+    """Stand-in for a live page: answers EXTRACT_JS / SCOPED_JS like the browser would."""
+    def __init__(self):
+        super().__init__()
+        self.soup, self.calls = BeautifulSoup(HTML, "html.parser"), []
+
+    def evaluate(self, js, arg):
+        assert js == EXTRACT_JS
+        self.calls.append(None)
+        return soup_records(self.soup, arg)
+
+    def locator(self, selector):
+        page = self
+
+        class Scoped(str):
+            def evaluate_all(self, js, arg):
+                assert js == SCOPED_JS
+                page.calls.append(selector)
+                return soup_records(page.soup, arg, selector)
+        return Scoped(selector)
+
+
+@pytest.fixture(autouse=True)
+def _isolated(monkeypatch, tmp_path):
+    monkeypatch.setattr(sl, "CACHE", LocatorCache(tmp_path / "locator_cache.json"))
+    monkeypatch.setattr(sl, "TELEMETRY", TelemetrySink(tmp_path / "telemetry.jsonl"))
+    monkeypatch.setattr(sl, "HEAL_EVENTS", [])
+    monkeypatch.setattr(sl, "_LOGGED", set())
+
+
+def test_scoped_heal_uses_subtree():
+    results, timings = sl._score(FakePage(), ["#popup #amount"], sl.DEFAULT_THRESHOLD)
+    assert results[0].best.selector == "#popup #amount2"
+    assert results[0].candidates == 2     # #popup's controls, not the page's six
+    assert timings["scoped"] == 1
+
+
+def test_unresolved_scope_falls_back_to_page():
+    assert sl.fuzzy_find(FakePage(), "#dialog #amount") == "#amount1"
+    results, timings = sl._score(FakePage(), ["#popup [name='qty']"], sl.DEFAULT_THRESHOLD)
+    assert results[0].best.selector == '[name="qty"]' and timings["scoped"] == 0
+
+
+def test_html_mode_parses_once():
+    page = FakePage()
+    sel = ["form#popup #amount", "form#popup [name='notes']", "#popup [name='qty']", "#amont1"]
+    results, timings = sl._score(page, sel, sl.DEFAULT_THRESHOLD)
+    assert page.reads == 1                # 2 scopes + the global scan on one soup
+    assert [r.best.selector for r in results] == [
+        "form#popup #amount2", 'form#popup [name="note"]', '[name="qty"]', "#amount1"]
+    assert timings["mode"] == "html"
+
+
+def test_browser_mode_reads_each_scope_once():
+    page = BrowserPage()
+    sel = ["#popup #amount", "#popup [name='notes']", "#gone [name='qtty']"]
+    results, timings = sl._score(page, sel, sl.DEFAULT_THRESHOLD)
+    assert page.calls == ["#popup", "#gone", None] and page.reads == 0
+    assert [r.best.selector for r in results] == ["#popup #amount2", '#popup [name="note"]', '[name="qty"]']
+    assert timings["mode"] == "browser" and timings["scoped"] == 2
+
+
+def test_compound_selector_uses_bare_cache_entry():
+    sl.CACHE.put("#payment_method", "#pay_method")          # as written by heal-ahead
+    sl.CACHE.put('[name="notes"]', '[name="note"]')
+    page = FakePage()
+    assert sl.fuzzy_find(page, "select#payment_method") == "#pay_method"
+    assert sl.fuzzy_find(page, "#popup [name='notes']") == '#popup [name="note"]'
+    assert page.reads == 0                # no DOM scan
@@ -0,0 +1,53 @@
+"""
+DOM snapshots + offline replay (no browser):
+
+ • the same DOM captured twice is stored once, gzip'd, under its hash
+ • replaying the captured cases reproduces the live heal
+ • a stricter threshold on replay shows up as a changed heal
+"""
+
+from tests.candidates import from_html
+from tests.scoring import CandidateSet, score_batch
+from tests.snapshots import SnapshotStore, replay
+
+TAGS = ["input", "textarea", "select"]
+HTML = """<form>
+  <input id="amoumt" type="number" class="form-control">
+  <input name="notes_text" type="text">
+  <select id="categry"><option>Food</option></select>
+</form>"""
+URL  = "http://127.0.0.1:5000/transactions"
+
+
+def _capture(store, selectors, thresh=60):
+    results = score_batch(CandidateSet(from_html(HTML, TAGS), TAGS), selectors, thresh, workers=1)
+    store.capture(HTML, URL, results, [None] * len(selectors), thresh, TAGS)
+    store.flush()
+    return results
+
+
+def test_dom_stored_once(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    _capture(store, ["#amount"])
+    _capture(store, ["#category"])
+    doms = list((tmp_path / "dom").rglob("*.html.gz"))
+    assert len(doms) == 1
+    assert store.read_dom(doms[0].name.split(".")[0]) == HTML
+
+
+def test_replay_reproduces_live_heal(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    live = _capture(store, ["#amount", "#category", "[name='notes']"])
+    rows = {r["selector"]: r for r in replay(tmp_path, workers=2)}
+    for result in live:
+        row = rows[result.orig]
+        assert row["before"] == row["after"] == (result.best and result.best.selector)
+        assert row["route"] == "/transactions"
+
+
+def test_threshold_override_changes_heal(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    _capture(store, ["#amount"])
+    [row] = replay(tmp_path, workers=1, thresh=101)       # nothing can score above 100
+    assert row["before"] == "#amoumt"
+    assert row["after"] is None
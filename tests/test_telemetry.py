@@ -0,0 +1,47 @@
+"""
+Heal telemetry (no browser):
+
+ • records stay buffered until flush() / a full buffer, then land as JSON lines
+ • load() skips a torn last line from a killed run
+ • aggregate() groups by selector: counts, heal rate, timings, phase split
+"""
+
+import json
+from tests.telemetry import TelemetrySink, aggregate, load
+
+
+def test_buffered_until_flush(tmp_path):
+    path = tmp_path / "t.jsonl"
+    sink = TelemetrySink(path, buffer_size=3)
+    sink.record(selector="#a", healed=True)
+    sink.record(selector="#b", healed=False)
+    assert not path.exists()
+    sink.record(selector="#c", healed=True)        # full buffer → one write
+    assert len(path.read_text().splitlines()) == 3
+    sink.record(selector="#d", healed=True)
+    sink.flush()
+    sink.flush()                                   # empty buffer: no-op
+    recs = load(path)
+    assert [r["selector"] for r in recs] == ["#a", "#b", "#c", "#d"]
+    assert all({"ts", "run", "worker", "test"} <= r.keys() for r in recs)
+
+
+def test_load_skips_torn_line(tmp_path):
+    path = tmp_path / "t.jsonl"
+    path.write_text(json.dumps({"selector": "#a"}) + "\n" + '{"selector": "#b", "hea')
+    assert load(path) == [{"selector": "#a"}]
+
+
+def test_aggregate_per_selector():
+    recs = [
+        {"selector": "#a", "healed": True,  "phase": "id",    "fetch_ms": 10, "parse_ms": 5, "score_ms": 5},
+        {"selector": "#a", "healed": False, "phase": None,    "fetch_ms": 30, "parse_ms": 10, "score_ms": 20},
+        {"selector": "#b", "healed": True,  "phase": "fuzzy", "fetch_ms": 1},
+    ]
+    rows = {r["selector"]: r for r in aggregate(recs)}
+    a = rows["#a"]
+    assert (a["count"], a["healed"], a["last"]) == (2, 1, False)
+    assert (a["mean_ms"], a["max_ms"]) == (40, 60)
+    assert (a["fetch_ms"], a["parse_ms"], a["score_ms"]) == (20, 7.5, 12.5)
+    assert a["phases"] == {"id": 1, "failed": 1}
+    assert rows["#b"]["mean_ms"] == 1 and rows["#b"]["phases"] == {"fuzzy": 1}
@@ -0,0 +1,87 @@
+"""
+Backend test data (no browser):
+
+ • sqlite backend: rows land with the owner's user_id, cleanup() removes only them
+ • http backend: labels and field ids are mapped from the real form before
+   POSTing, cleanup() follows the rows' delete links
+"""
+
+import sqlite3
+from scripts.test_data import TxnFactory
+
+FORM = """<form id="popup" action="/add">
+  <input id="txn-date" name="date"><input id="amt" name="amount"><input name="notes">
+  <select id="cat" name="category"><option value="1">Food</option><option value="2">Bills</option></select>
+  <select name="payment_method"><option value="cash">Cash</option></select>
+</form>
+<table><tbody>
+  <tr><td>T-1</td><td><a href="/delete/7"><i class="fa-trash-alt"></i></a></td></tr>
+  <tr><td>mine</td><td><a href="/delete/8"><i class="fa-trash-alt"></i></a></td></tr>
+</tbody></table>"""
+
+
+class _Resp:
+    def __init__(self, text="", ok=True):
+        self._text, self.ok, self.status = text, ok, 200 if ok else 500
+
+    def text(self):
+        return self._text
+
+
+class FakeHttp:
+    """Logged-in APIRequestContext stand-in: serves FORM, records every call."""
+    def __init__(self):
+        self.gets, self.posts = [], []
+
+    def get(self, url):
+        self.gets.append(url)
+        return _Resp(FORM)
+
+    def post(self, url, form):
+        self.posts.append((url, form))
+        return _Resp()
+
+
+def _db(tmp_path):
+    db = tmp_path / "finance_tracker.db"
+    with sqlite3.connect(db) as conn:
+        conn.execute("CREATE TABLE users(id INTEGER PRIMARY KEY, username TEXT)")
+        conn.executemany("INSERT INTO users(username) VALUES(?)", [("alice",), ("bob",)])
+        conn.execute("""CREATE TABLE transactions(id INTEGER PRIMARY KEY, user_id INTEGER,
+                        date TEXT, category TEXT, amount REAL, payment_method TEXT, notes TEXT)""")
+    return db
+
+
+def test_sqlite_add_and_cleanup(tmp_path):
+    db = _db(tmp_path)
+    factory = TxnFactory("bob", db=db)
+    assert factory.backend == "sqlite"
+    factory.add("T-1", 120, category="Bills")
+    factory.add_many([dict(notes="T-2", amount=5, payment_method="Card",
+                           category="Food", date="2025-06-01")])
+    with sqlite3.connect(db) as conn:
+        conn.execute("INSERT INTO transactions(user_id, notes) VALUES(2, 'by hand')")
+        rows = conn.execute("SELECT user_id, category, amount, notes FROM transactions ORDER BY id").fetchall()
+    assert rows[:2] == [(2, "Bills", 120, "T-1"), (2, "Food", 5, "T-2")]
+
+    assert factory.cleanup() == 2
+    assert factory.cleanup() == 0                  # nothing left to delete
+    with sqlite3.connect(db) as conn:
+        assert conn.execute("SELECT notes FROM transactions").fetchall() == [("by hand",)]
+
+
+def test_http_posts_mapped_form(tmp_path):
+    http = FakeHttp()
+    factory = TxnFactory("alice", http=http, db=tmp_path / "missing.db", base_url="")
+    assert factory.backend == "http"
+    factory.add("T-1", 120, category="Bills")
+    factory.add("T-2", 7)
+    assert http.gets == ["/transactions"]          # form read once, then cached
+    url, form = http.posts[0]
+    assert url == "/add"
+    assert form == {"notes": "T-1", "amount": "120", "payment_method": "cash",
+                    "category": "2", "date": "2025-05-01"}
+    assert http.posts[1][1]["category"] == "1"
+
+    assert factory.cleanup() == 1                  # only T-1 is listed on the page
+    assert http.gets[-1] == "/delete/7"
@@ -0,0 +1,98 @@
+"""
+Canvas checks computed inside the page.
+• canvas_digest(): FNV-1a over the raw RGBA pixels (exact, no PNG encoding,
+  only an 8-char hex string crosses the pipe)
+• canvas_phash(): 64-bit difference hash of a 9×8 grayscale downscale, for
+  "looks the same" checks that tolerate anti-aliasing; compare with hamming()
+  against PHASH_TOLERANCE (HEAL_PHASH_TOLERANCE, default 4 of 64 bits)
+• wait_for_redraw(): polls every animation frame until the canvas differs
+  from *previous* and then holds still for STABLE_FRAMES frames, instead of a
+  fixed sleep (also waits out Chart.js animations)
+Works for 2d and WebGL canvases (pixels are read through a 2d copy).
+"""
+
+import os
+from typing import Optional
+from playwright.sync_api import Page
+
+STABLE_FRAMES   = 3                       # identical frames in a row = redraw finished
+REDRAW_TIMEOUT  = 5_000                   # ms
+PHASH_TOLERANCE = int(os.getenv("HEAL_PHASH_TOLERANCE", "4"))   # differing bits still "same"
+
+# window.__canvasCheck(el, kind) → hex string; installed once per document
+_INSTALL_JS = """
+() => {
+  if (window.__canvasCheck) return;
+  const pixels = (el, w, h) => {
+    let ctx = (w === el.width && h === el.height) ? el.getContext('2d') : null;
+    if (!ctx) {                              // WebGL or downscale: copy through a 2d canvas
+      const c = document.createElement('canvas');
+      c.width = w; c.height = h;
+      ctx = c.getContext('2d');
+      ctx.drawImage(el, 0, 0, w, h);
+    }
+    return ctx.getImageData(0, 0, w, h).data;
+  };
+  const digest = (el) => {
+    const words = new Uint32Array(pixels(el, el.width, el.height).buffer);
+    let h = 0x811c9dc5;
+    for (let i = 0; i < words.length; i++) h = Math.imul(h ^ words[i], 0x01000193);
+    return (h >>> 0).toString(16).padStart(8, '0') + ':' + el.width + 'x' + el.height;
+  };
+  const phash = (el) => {
+    const d = pixels(el, 9, 8), gray = [];
+    for (let i = 0; i < d.length; i += 4) gray.push(d[i] * 0.299 + d[i + 1] * 0.587 + d[i + 2] * 0.114);
+    let bits = '';
+    for (let y = 0; y < 8; y++)
+      for (let x = 0; x < 8; x++) bits += gray[y * 9 + x] > gray[y * 9 + x + 1] ? '1' : '0';
+    return BigInt('0b' + bits).toString(16).padStart(16, '0');
+  };
+  window.__canvasCheck = (el, kind) => (kind === 'phash' ? phash(el) : digest(el));
+}
+"""
+
+_READ_JS = "([el, kind]) => window.__canvasCheck(el, kind)"
+
+# truthy (the new value) once the canvas changed and held still for `stable` frames
+_SETTLED_JS = """
+([el, kind, previous, stable]) => {
+  const value = window.__canvasCheck(el, kind);
+  const state = el.__redraw || (el.__redraw = {value: null, frames: 0});
+  if (value === state.value) state.frames++; else { state.value = value; state.frames = 1; }
+  if (value === previous || state.frames < stable) return false;
+  el.__redraw = null;
+  return value;
+}
+"""
+
+
+def _element(page: Page, selector: str):
+    page.evaluate(_INSTALL_JS)
+    return page.locator(selector).element_handle()
+
+
+def canvas_digest(page: Page, selector: str) -> str:
+    """Exact pixel digest of the canvas matched by *selector*."""
+    return page.evaluate(_READ_JS, [_element(page, selector), "digest"])
+
+
+def canvas_phash(page: Page, selector: str) -> str:
+    """64-bit perceptual (difference) hash, 16 hex chars."""
+    return page.evaluate(_READ_JS, [_element(page, selector), "phash"])
+
+
+def hamming(a: str, b: str) -> int:
+    """Differing bits between two canvas_phash() values (0 = looks identical)."""
+    return bin(int(a, 16) ^ int(b, 16)).count("1")
+
+
+def wait_for_redraw(page: Page, selector: str, previous: Optional[str] = None,
+                    kind: str = "digest", timeout: int = REDRAW_TIMEOUT) -> str:
+    """
+    Wait until the canvas differs from *previous* (any state when None) and
+    stays unchanged for STABLE_FRAMES animation frames; returns the new value.
+    """
+    el = _element(page, selector)
+    handle = page.wait_for_function(_SETTLED_JS, arg=[el, kind, previous, STABLE_FRAMES],
+                                    polling="raf", timeout=timeout)
+    return handle.json_value()